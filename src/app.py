@@ -10,19 +10,30 @@ stages of different beers, and upload new sales data respectively.
 """
 
 import logging
+import logging.handlers
 import os
 import sys
+import threading
 from datetime import datetime
-from typing import Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 
-import pandas
 from PyQt5 import QtCore, QtWidgets
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
 from PyQt5.QtWidgets import QMainWindow
 
-from src.inv_management import InventoryManagementDialog
-from src.process_monitoring import ProcessMonitoringDialog
+from src.instrumentation import (
+    log_latency_summary,
+    save_latency_summary,
+    time_operation,
+    timed,
+)
 from src.setup.brewhouse_setup import Ui_mwindow_brewhouse
-from src.upload_sales import UploadSalesDialog
+from src.structured_logging import start_queued_logging
+
+# pandas, the sales calculations, and the dialogs are imported when they are
+# first needed, so the main window is shown without waiting for them to load.
+if TYPE_CHECKING:
+    import pandas
 
 
 def main() -> None:
@@ -33,37 +44,138 @@ def main() -> None:
     os.environ["QT_SCALE_FACTOR"] = "1.5"
     app = QtWidgets.QApplication(sys.argv)
     app.setStyle("fusion")
-    setup_logging()
+    log_listener = setup_logging()
     mwindow_brewhouse = BrewhouseWindow()
     mwindow_brewhouse.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+
+    # Records how long the operations took while the program was open.
+    log_latency_summary()
+    try:
+        save_latency_summary()
+    except OSError:
+        logging.exception("Unable to save the latency summary.")
+    logging.debug("Barnaby's Brewhouse program closed.")
+    # Writes the log records still in the queue before exiting.
+    log_listener.stop()
+    sys.exit(exit_code)
 
 
-def setup_logging():
+def setup_logging() -> logging.handlers.QueueListener:
     """
     Sets up the logging system to automatically log actions to log file.
+
+    The log file is written by a background thread, so logging never waits
+    for the disk.
+
+    Returns:
+        log_listener (logging.handlers.QueueListener): Thread writing the log
+                                                       file, which is stopped
+                                                       when the program exits.
     """
     # No restoration from logging; data is always persisted in files anyway.
-    logging.basicConfig(
-        filename="resources/logs.txt",
-        level=logging.DEBUG,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-    )
+    log_listener = start_queued_logging()
     logging.debug("Barnaby's Brewhouse program started.")
 
+    return log_listener
+
 
-def read_sales_data() -> pandas.core.frame.DataFrame:
+def import_dialogs():
+    """Imports the dialog modules, so they open without delay when clicked."""
+    import src.inv_management  # noqa: F401
+    import src.process_monitoring  # noqa: F401
+    import src.upload_sales  # noqa: F401
+
+
+@timed
+def read_sales_data() -> "pandas.core.frame.DataFrame":
     """Reads the sales data and loads it to a variable.
 
+    The parsed sales data is cached, so the CSV file is only parsed again when
+    it has changed.
+
     Returns:
         data_frame (pandas.core.frame.DataFrame): Sales data of beers.
     """
-    data_frame = pandas.read_csv("resources/sales_data.csv")
-    print(str(data_frame) + "\n")
+    from src.sales_cache import read_cached_sales_data
+
+    data_frame = read_cached_sales_data()
+    logging.debug("Read %d sales from the sales data.", len(data_frame))
 
     return data_frame
 
 
+class SalesStatisticsSignals(QObject):
+    """Contains the signals sent by the worker loading the sales statistics."""
+
+    # Emits the aggregates of the sales data once they have been calculated.
+    finished = pyqtSignal(object)
+    # Emits an error message if the sales data could not be loaded.
+    failed = pyqtSignal(str)
+    # Emits the index of the sales which have been uploaded once it is loaded.
+    sale_keys_loaded = pyqtSignal(object)
+
+
+class SalesStatisticsWorker(QRunnable):
+    """Reads and aggregates the sales data on a background thread, so the main
+    window stays responsive however large the sales data is."""
+
+    def __init__(self, load_sale_keys: bool = False):
+        """Creates the worker.
+
+        Args:
+            load_sale_keys (bool): Whether to also load the index of the sales
+                                   which have been uploaded.
+        """
+        super().__init__()
+        self.signals = SalesStatisticsSignals()
+        self.cancelled = threading.Event()
+        self.load_sale_keys = load_sale_keys
+
+    def cancel(self):
+        """Stops the worker from sending its results."""
+        self.cancelled.set()
+
+    def run(self):
+        """Reads the sales data and calculates its aggregates."""
+        import sqlite3
+
+        from src.sales_analysis import load_sales_aggregates
+        from src.sales_database import SALES_DATABASE_PATH, load_database_aggregates
+
+        try:
+            with time_operation("load_sales_statistics"):
+                if os.path.exists(SALES_DATABASE_PATH):
+                    # Aggregates the sales in the database, if it has been
+                    # created.
+                    sales_aggregates = load_database_aggregates()
+                else:
+                    # Reads the sales data from the CSV file, in chunks if it
+                    # is large, and aggregates it to the monthly sales of each
+                    # beer.
+                    sales_aggregates = load_sales_aggregates()
+        except (OSError, ValueError, KeyError, sqlite3.Error) as error:
+            logging.exception("Unable to load the sales data.")
+            if not self.cancelled.is_set():
+                self.signals.failed.emit(str(error))
+            return
+
+        if not self.cancelled.is_set():
+            self.signals.finished.emit(sales_aggregates)
+
+        if self.load_sale_keys:
+            from src.sale_keys import SaleKeyIndex
+
+            try:
+                sale_key_index = SaleKeyIndex.load()
+            except (OSError, ValueError, KeyError):
+                logging.exception("Unable to load the sale key index.")
+                return
+
+            if not self.cancelled.is_set():
+                self.signals.sale_keys_loaded.emit(sale_key_index)
+
+
 class BrewhouseWindow(QMainWindow, Ui_mwindow_brewhouse):
     """Contains the main window for the Brewhouse application."""
 
@@ -72,68 +184,184 @@ class BrewhouseWindow(QMainWindow, Ui_mwindow_brewhouse):
         self.setupUi(self)
 
         # Connects 'Inventory Management' button to the inventory dialog.
-        self.btn_inv_management.clicked.connect(self.open_dialog_inv_management)
+        self.btn_inv_management.clicked.connect(
+            lambda: self.open_dialog_inv_management()
+        )
         # Connects 'Process Monitoring' button to the monitoring dialog.
-        self.btn_process_monitoring.clicked.connect(self.open_dialog_monitoring)
+        self.btn_process_monitoring.clicked.connect(
+            lambda: self.open_dialog_monitoring()
+        )
         # Connects 'Upload Sales Data' button to the upload sales dialog.
-        self.btn_upload_sales.clicked.connect(self.open_dialog_upload_sales)
+        self.btn_upload_sales.clicked.connect(lambda: self.open_dialog_upload_sales())
 
-        # Reads sales data from the CSV file.
-        data_frame = read_sales_data()
+        # Predicts future sales of a given beer in a given month.
+        self.btn_predict.clicked.connect(lambda: self.predict_sales())
+
+        # Loads the sales statistics in the background, and the dialogs once
+        # the window has been shown.
+        self.sales_aggregates = None
+        self.sale_key_index = None
+        self.sales_worker = None
+        self.load_sales_statistics()
+        QtCore.QTimer.singleShot(0, import_dialogs)
+
+    def load_sales_statistics(self):
+        """Starts reading the sales data on a background thread, and shows that
+        the sales statistics are loading in the UI."""
+        # Cancels any earlier worker, as its sales data may be out of date.
+        if self.sales_worker is not None:
+            self.sales_worker.cancel()
+
+        self.sales_aggregates = None
+        self.btn_predict.setEnabled(False)
+        for label in [
+            self.lbl_overall_sales,
+            self.lbl_red_helles_sales,
+            self.lbl_pilsner_sales,
+            self.lbl_dunkel_sales,
+            self.lbl_red_helles_ratio,
+            self.lbl_pilsner_ratio,
+            self.lbl_dunkel_ratio,
+            self.lbl_red_helles_growth,
+            self.lbl_pilsner_growth,
+            self.lbl_dunkel_growth,
+        ]:
+            label.setText("Loading...")
+
+        # Only loads the index of uploaded sales once, as the upload dialog
+        # keeps it up to date.
+        self.sales_worker = SalesStatisticsWorker(self.sale_key_index is None)
+        self.sales_worker.signals.finished.connect(self.show_sales_statistics)
+        self.sales_worker.signals.sale_keys_loaded.connect(self.set_sale_key_index)
+        self.sales_worker.signals.failed.connect(self.show_sales_error)
+        QThreadPool.globalInstance().start(self.sales_worker)
+
+    @timed
+    def show_sales_statistics(self, sales_aggregates):
+        """Shows the sales statistics calculated by the worker in the UI.
+
+        Args:
+            sales_aggregates (SalesAggregates): Aggregates of the sales data.
+        """
+        self.sales_worker = None
+        # Keeps the aggregates updated as sales are uploaded.
+        self.sales_aggregates = sales_aggregates
         # Calculates total sales and sales ratios of beer.
-        self.get_sales_ratio(data_frame)
+        self.get_sales_ratio()
         # Calculates average monthly growth rates in sales of beer.
-        (
-            beers,
-            red_helles_growth,
-            pilsner_growth,
-            dunkel_growth,
-        ) = self.get_avg_growth_rate(data_frame)
+        self.get_avg_growth_rate()
+        self.btn_predict.setEnabled(True)
 
-        # Predicts future sales of a given beer in a given month.
-        self.btn_predict.clicked.connect(
-            lambda: self.predict_sales(
-                data_frame, red_helles_growth, pilsner_growth, dunkel_growth
-            )
-        )
+    def set_sale_key_index(self, sale_key_index):
+        """Keeps the index of uploaded sales loaded by the worker, unless the
+        upload dialog already loaded it.
+
+        Args:
+            sale_key_index (SaleKeyIndex): Index of the sales which have been
+                                           uploaded.
+        """
+        if self.sale_key_index is None:
+            self.sale_key_index = sale_key_index
+
+    def show_sales_error(self, message: str):
+        """Shows that the sales data could not be loaded in the UI.
+
+        Args:
+            message (str): Description of the error.
+        """
+        self.sales_worker = None
+        self.lbl_overall_sales.setText("Unable to load sales data: " + message)
 
+    def closeEvent(self, event):
+        """Cancels loading the sales statistics when the window is closed.
+
+        Args:
+            event (QCloseEvent): The close event of the window.
+        """
+        if self.sales_worker is not None:
+            self.sales_worker.cancel()
+        super().closeEvent(event)
+
+    @timed
     def open_dialog_inv_management(self) -> None:
         """Opens the dialog for the user to manage inventory."""
+        from src.inv_management import InventoryManagementDialog
+
         self.Dialog = InventoryManagementDialog()
         self.Dialog.open()
 
+    @timed
     def open_dialog_monitoring(self) -> None:
         """Opens the dialog for the user to monitor brewing processes."""
+        from src.process_monitoring import ProcessMonitoringDialog
+
         self.Dialog = ProcessMonitoringDialog()
         self.Dialog.open()
 
+    @timed
     def open_dialog_upload_sales(self) -> None:
         """Opens the dialog for the user to upload new sales data."""
-        self.Dialog = UploadSalesDialog()
+        from src.upload_sales import UploadSalesDialog
+
+        self.Dialog = UploadSalesDialog(self.sale_key_index)
+        # Shares the index of uploaded sales with any later upload dialogs.
+        self.sale_key_index = self.Dialog.sale_key_index
+        # Updates the sales statistics whenever a new sale is uploaded.
+        self.Dialog.sale_uploaded.connect(self.add_uploaded_sale)
+        self.Dialog.sales_imported.connect(self.add_imported_sales)
         self.Dialog.open()
 
-    def get_sales_ratio(self, data_frame: pandas.core.frame.DataFrame):
-        """Calculates total sales and sales ratio for different beers.
+    @timed
+    def add_uploaded_sale(self, date: datetime, recipe: str, quantity: int):
+        """Adds an uploaded sale to the sales statistics shown in the UI.
 
         Args:
-            data_frame (pandas.core.frame.DataFrame): Sales data of beers.
+            date (datetime): Date the sale is required.
+            recipe (str): Beer recipe of the sale.
+            quantity (int): Quantity ordered in the sale.
         """
-        # Sums the total sales of all beers.
-        total_sales = int(data_frame["Quantity ordered"].sum())
+        # Reloads the statistics if the upload happened while they were loading,
+        # as the sale may not have been in the CSV file when it was read.
+        if self.sales_aggregates is None:
+            self.load_sales_statistics()
+            return
 
-        # Sums Red Helles sales and calculates their sales ratio.
-        red_helles = data_frame.query("Recipe == 'Organic Red Helles'")
-        red_helles_sales = int(red_helles["Quantity ordered"].sum())
-        red_helles_ratio = round((red_helles_sales / total_sales) * 100, 3)
+        self.sales_aggregates.add_sale(date, recipe, quantity)
+        self.get_sales_ratio()
+        self.get_avg_growth_rate()
 
-        # Sums Pilsner sales and calculates their sales ratio.
-        pilsner = data_frame.query("Recipe == 'Organic Pilsner'")
-        pilsner_sales = int(pilsner["Quantity ordered"].sum())
-        pilsner_ratio = round((pilsner_sales / total_sales) * 100, 3)
+    @timed
+    def add_imported_sales(self, sales: "pandas.core.frame.DataFrame"):
+        """Adds a batch of imported sales to the sales statistics in the UI.
 
-        # Sums Dunkel sales and calculates their sales ratio.
-        dunkel = data_frame.query("Recipe == 'Organic Dunkel'")
-        dunkel_sales = int(dunkel["Quantity ordered"].sum())
+        Args:
+            sales (pandas.core.frame.DataFrame): Imported sales, indexed by
+                                                 date.
+        """
+        # Reloads the statistics if the import happened while they were
+        # loading, as the sales may not have been in the CSV file when it was
+        # read.
+        if self.sales_aggregates is None:
+            self.load_sales_statistics()
+            return
+
+        self.sales_aggregates.add_sales(sales)
+        self.get_sales_ratio()
+        self.get_avg_growth_rate()
+
+    @timed
+    def get_sales_ratio(self):
+        """Calculates total sales and sales ratio for different beers."""
+        # Gets the total sales of each beer and of all beers.
+        beer_sales = self.sales_aggregates.beer_sales
+        total_sales = self.sales_aggregates.total_sales
+
+        # Gets the sales of each beer and calculates their sales ratio.
+        red_helles_sales = int(beer_sales["Organic Red Helles"])
+        red_helles_ratio = round((red_helles_sales / total_sales) * 100, 3)
+        pilsner_sales = int(beer_sales["Organic Pilsner"])
+        pilsner_ratio = round((pilsner_sales / total_sales) * 100, 3)
+        dunkel_sales = int(beer_sales["Organic Dunkel"])
         dunkel_ratio = round((dunkel_sales / total_sales) * 100, 3)
 
         # Displays the sales and sales ratios of beers in UI.
@@ -149,14 +377,10 @@ class BrewhouseWindow(QMainWindow, Ui_mwindow_brewhouse):
         self.lbl_pilsner_ratio.setText("Organic Pilsner: " + str(pilsner_ratio) + "%")
         self.lbl_dunkel_ratio.setText("Organic Dunkel: " + str(dunkel_ratio) + "%")
 
-    def get_avg_growth_rate(
-        self, data_frame: pandas.core.frame.DataFrame
-    ) -> Tuple[list, float, float, float]:
+    @timed
+    def get_avg_growth_rate(self) -> Tuple[list, float, float, float]:
         """Calculates the average monthly growth rate from sales data.
 
-        Args:
-            data_frame (pandas.core.frame.DataFrame): Sales data of beers.
-
         Returns:
             beers (list): A list of the beers.
             red_helles_growth (float): Average growth rate of sales for Red
@@ -164,63 +388,29 @@ class BrewhouseWindow(QMainWindow, Ui_mwindow_brewhouse):
             pilsner_growth (float): Average growth rate of sales for Pilsner.
             dunkel_growth (float): Average growth rate of sales for Dunkel.
         """
-        # Growth rates for Red Helles, Pilsner, and Dunkel.
-        red_helles_growth = float()
-        pilsner_growth = float()
-        dunkel_growth = float()
-
-        # Sets filters for each month.
-        months = [
-            "Nov-18",
-            "Dec-18",
-            "Jan-19",
-            "Feb-19",
-            "Mar-19",
-            "Apr-19",
-            "May-19",
-            "Jun-19",
-            "Jul-19",
-            "Aug-19",
-            "Sep-19",
-            "Oct-19",
-        ]
-        beers = ["Organic Red Helles", "Organic Pilsner", "Organic Dunkel"]
-
-        # Iterates through monthly sales of each type of beer.
-        for beer in beers:
-            month_filter_previous = data_frame["Date Required"].str.contains("Nov-18")
-            for month in months:
-                month_filter_current = data_frame["Date Required"].str.contains(month)
-                beer_filter = data_frame["Recipe"].isin([beer])
-
-                # Filters data to the sales in a month for that type of beer.
-                month_data_current = data_frame[month_filter_current & beer_filter]
-                month_data_previous = data_frame[month_filter_previous & beer_filter]
-                month_sales_current = int(month_data_current["Quantity ordered"].sum())
-                month_sales_previous = int(
-                    month_data_previous["Quantity ordered"].sum()
-                )
+        from src.recipes import BEERS
 
-                # Accumulates growth rate for each type of beer.
-                if beer == "Organic Red Helles" and month != "Nov-18":
-                    red_helles_growth += month_sales_current / month_sales_previous
-                elif beer == "Organic Pilsner" and month != "Nov-18":
-                    pilsner_growth += month_sales_current / month_sales_previous
-                elif beer == "Organic Dunkel" and month != "Nov-18":
-                    dunkel_growth += month_sales_current / month_sales_previous
-
-                # Updates previous month to enable monthly sales comparisons.
-                month_filter_previous = month_filter_current
-
-        # Calculates mean from cumulative growth rates.
-        red_helles_growth /= 11
-        pilsner_growth /= 11
-        dunkel_growth /= 11
+        # Gets the mean month-over-month growth rate of each beer.
+        growth_rates = self.sales_aggregates.growth_rates
+        red_helles_growth = float(growth_rates["Organic Red Helles"])
+        pilsner_growth = float(growth_rates["Organic Pilsner"])
+        dunkel_growth = float(growth_rates["Organic Dunkel"])
 
         red_helles_growth_pct = round((red_helles_growth - 1) * 100, 3)
         pilsner_growth_pct = round((pilsner_growth - 1) * 100, 3)
         dunkel_growth_pct = round((dunkel_growth - 1) * 100, 3)
 
+        # Shows the months the growth rates are over.
+        last_month = self.sales_aggregates.last_month
+        first_month = last_month - (self.sales_aggregates.growth_window - 1)
+        self.lbl_growth.setText(
+            "Average Monthly Growth Percentages ("
+            + first_month.strftime("%B %Y")
+            + " to "
+            + last_month.strftime("%B %Y")
+            + ")"
+        )
+
         # Displays percentage of sales provided by each beer in UI.
         self.lbl_red_helles_growth.setText(
             "Organic Red Helles: " + str(red_helles_growth_pct) + "%"
@@ -232,64 +422,46 @@ class BrewhouseWindow(QMainWindow, Ui_mwindow_brewhouse):
             "Organic Dunkel: " + str(dunkel_growth_pct) + "%"
         )
 
-        return beers, red_helles_growth, pilsner_growth, dunkel_growth
+        return BEERS, red_helles_growth, pilsner_growth, dunkel_growth
 
-    def predict_sales(
-        self,
-        data_frame: pandas.core.frame.DataFrame,
-        red_helles_growth: float,
-        pilsner_growth: float,
-        dunkel_growth: float,
-    ):
-        """Predicts future sales of Red Helles, Pilsner, and Dunkel.
+    @timed
+    def predict_sales(self):
+        """Predicts future sales of Red Helles, Pilsner, and Dunkel."""
+        import pandas
 
-        Args:
-            data_frame (pandas.core.frame.DataFrame): Sales data of beers.
-            red_helles_growth (float): Average growth rate of sales for Red
-                                       Helles.
-            pilsner_growth (float): Average growth rate of sales for Pilsner.
-            dunkel_growth (float): Average growth rate of sales for Dunkel.
+        # Waits for the sales statistics if they are still loading.
+        if self.sales_aggregates is None:
+            return
 
-        Returns:
-            prediction_sales (int): Predicted monthly sales of a given beer for
-                                    a given month.
-        """
+        # Gets the average growth rates of Red Helles, Pilsner, and Dunkel.
+        (
+            _,
+            red_helles_growth,
+            pilsner_growth,
+            dunkel_growth,
+        ) = self.get_avg_growth_rate()
 
         # Gets the date to predict the sales for.
         prediction_date = self.date_edit_predict.text()
 
         # Calculates number of months since the last month of sales data.
-        format_date = "%d/%m/%Y"
-        final_date = datetime.strptime("30/10/2019", format_date).date()
-        prediction_date = datetime.strptime(prediction_date, format_date).date()
-        month_difference = (prediction_date.year - final_date.year) * 12 + (
-            prediction_date.month - final_date.month
-        )
-
-        # Filters to last month's sales of Red Helles, Pilsner, and Dunkel.
-        last_month_filter = data_frame["Date Required"].str.contains("Oct-19")
-        red_helles_filter = data_frame["Recipe"].str.contains("Organic Red Helles")
-        pilsner_filter = data_frame["Recipe"].str.contains("Organic Pilsner")
-        dunkel_filter = data_frame["Recipe"].str.contains("Organic Dunkel")
+        prediction_date = datetime.strptime(prediction_date, "%d/%m/%Y")
+        prediction_month = pandas.Period(prediction_date, freq="M")
+        last_month = self.sales_aggregates.last_month
+        month_difference = prediction_month.ordinal - last_month.ordinal
 
         # Gets last month's sales of Red Helles, Pilsner, and Dunkel.
-        last_red_helles_data = data_frame[last_month_filter & red_helles_filter]
-        last_pilsner_data = data_frame[last_month_filter & pilsner_filter]
-        last_dunkel_data = data_frame[last_month_filter & dunkel_filter]
-        last_red_helles_sales = int(last_red_helles_data["Quantity ordered"].sum())
-        last_pilsner_sales = int(last_pilsner_data["Quantity ordered"].sum())
-        last_dunkel_sales = int(last_dunkel_data["Quantity ordered"].sum())
+        last_sales = self.sales_aggregates.get_month_sales(last_month)
+        last_red_helles_sales = int(last_sales["Organic Red Helles"])
+        last_pilsner_sales = int(last_sales["Organic Pilsner"])
+        last_dunkel_sales = int(last_sales["Organic Dunkel"])
 
         # Predicts beer sales for given month, rounded down to nearest integer.
-        predicted_red_helles_sales = int(
-            (last_red_helles_sales * (red_helles_growth ** month_difference))
-        )
-        predicted_pilsner_sales = int(
-            (last_pilsner_sales * (pilsner_growth ** month_difference))
-        )
-        predicted_dunkel_sales = int(
-            (last_dunkel_sales * (dunkel_growth ** month_difference))
-        )
+        predicted_sales = self.sales_aggregates.predict_sales([prediction_month])
+        predicted_sales = predicted_sales.loc[prediction_month]
+        predicted_red_helles_sales = int(predicted_sales["Organic Red Helles"])
+        predicted_pilsner_sales = int(predicted_sales["Organic Pilsner"])
+        predicted_dunkel_sales = int(predicted_sales["Organic Dunkel"])
 
         # Shows the calculations of sales predictions for the given date in UI.
         self.lbl_predictions.setText(
@@ -321,16 +493,22 @@ class BrewhouseWindow(QMainWindow, Ui_mwindow_brewhouse):
             + " L"
         )
 
-        # Recommends next beer to produce based on predicted demand.
+        # Recommends next beer to produce based on predicted demand, and plans
+        # the brews to have it bottled by the end of the month.
         self.production_advice(
-            predicted_red_helles_sales, predicted_pilsner_sales, predicted_dunkel_sales
+            predicted_red_helles_sales,
+            predicted_pilsner_sales,
+            predicted_dunkel_sales,
+            (prediction_month + 1).start_time.to_pydatetime(),
         )
 
+    @timed
     def production_advice(
         self,
         predicted_red_helles_sales: int,
         predicted_pilsner_sales: int,
         predicted_dunkel_sales: int,
+        plan_end: Optional[datetime] = None,
     ):
         """Recommends next beer to produce based on predicted demand.
 
@@ -341,37 +519,38 @@ class BrewhouseWindow(QMainWindow, Ui_mwindow_brewhouse):
                                            given month.
             predicted_dunkel_sales (int): Predicted sales of Dunkel for the
                                           given month.
+            plan_end (Optional[datetime]): Time the brews to cover the deficits
+                                           must be bottled by, or None to not
+                                           plan them.
         """
-        red_helles_production = int()
-        pilsner_production = int()
-        dunkel_production = int()
+        import pandas
+
+        from src.production import get_production_table
+        from src.production_plan import SHORTFALL_TANKS_FULL, read_production_plan
+        from src.recipes import BEERS
+
         recommendation = str()
 
-        # Reads the inventory data to access volumes of each beer.
-        (
-            inventory_list,
-            red_helles_volume,
-            pilsner_volume,
-            dunkel_volume,
-        ) = InventoryManagementDialog.read_inventory(self)
-        # Reads the processes data to access volumes of each beer being made.
-        process_list = ProcessMonitoringDialog.read_processes(self)
-
-        # Sums the volume of each beer currently in production processes.
-        for process in process_list:
-            if process["recipe"] == "Organic Red Helles":
-                red_helles_production = process["volume"]
-            elif process["recipe"] == "Organic Pilsner":
-                pilsner_production = process["volume"]
-            elif process["recipe"] == "Organic Dunkel":
-                dunkel_production = process["volume"]
-
-        # Calculates the deficit in volume of each beer.
-        red_helles_deficit = (
-            predicted_red_helles_sales - red_helles_volume - red_helles_production
+        # Compares the predicted sales with the volumes of each beer in the
+        # inventory and in production processes.
+        predicted_sales = pandas.Series(
+            [
+                predicted_red_helles_sales,
+                predicted_pilsner_sales,
+                predicted_dunkel_sales,
+            ],
+            index=BEERS,
         )
-        pilsner_deficit = predicted_pilsner_sales - pilsner_volume - pilsner_production
-        dunkel_deficit = predicted_dunkel_sales - dunkel_volume - dunkel_production
+        production_table, _ = get_production_table(predicted_sales)
+        red_helles_volume, pilsner_volume, dunkel_volume = production_table[
+            "inventory_volume"
+        ]
+        red_helles_production, pilsner_production, dunkel_production = production_table[
+            "production_volume"
+        ]
+        red_helles_deficit, pilsner_deficit, dunkel_deficit = production_table[
+            "deficit"
+        ]
 
         # Recommends producing the beer with the largest volume deficit.
         largest_deficit = max(red_helles_deficit, pilsner_deficit, dunkel_deficit)
@@ -420,8 +599,55 @@ class BrewhouseWindow(QMainWindow, Ui_mwindow_brewhouse):
                 "produce next, as it has the largest deficit."
             )
 
+        # Plans the brews which cover the deficits with the tanks available.
+        production_plan = ""
+        if plan_end is not None:
+            plan, shortfalls, shortfall_causes = read_production_plan(
+                production_table["deficit"].to_dict(), plan_end
+            )
+            production_plan = (
+                "\n\nProduction Plan (Bottled By "
+                + plan_end.strftime("%d/%m/%Y")
+                + "):"
+            )
+            for brew in plan:
+                production_plan += (
+                    "\n"
+                    + brew["brew_start"].strftime("%d/%m/%Y %H:%M")
+                    + ": Brew "
+                    + str(brew["volume"])
+                    + " L of "
+                    + brew["recipe"]
+                    + ", ferment in "
+                    + brew["fermenter"]
+                    + ", condition in "
+                    + brew["conditioner"]
+                    + " (Bottled: "
+                    + brew["ready"].strftime("%d/%m/%Y %H:%M")
+                    + ")"
+                )
+            if not plan:
+                production_plan += "\nNo brews are needed or can be ready in time."
+            for recipe, cause in shortfall_causes.items():
+                if cause == SHORTFALL_TANKS_FULL:
+                    reason = "the tanks are full until it is too late."
+                else:
+                    reason = (
+                        "a brew could not be bottled by "
+                        + plan_end.strftime("%d/%m/%Y")
+                        + " even in empty tanks."
+                    )
+                production_plan += (
+                    "\n"
+                    + recipe
+                    + " will still be "
+                    + str(shortfalls[recipe])
+                    + " L short, as "
+                    + reason
+                )
+
         # Updates the UI with the deficit calculations and the recommendation.
-        self.lbl_advice.setText(deficit_calculation + recommendation)
+        self.lbl_advice.setText(deficit_calculation + recommendation + production_plan)
 
 
 # Prevents the code from executing when the script is imported as a module.
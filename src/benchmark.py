@@ -0,0 +1,297 @@
+"""
+A benchmark of the hot paths of the program on synthetic data of any size:
+reading the sales data, the sales ratios, growth rates, sales predictions, and
+production advice of the main window, reading the tanks in process monitoring,
+and dispatching an order, and every order of a beer at once, in inventory
+management. The data is generated by src.synthetic_data, and each path is timed
+in a directory holding the generated resources, as the program reads its files
+from the resources directory.
+
+The timings of every run are appended to a history file, and compared with the
+last run on the same number of sales, so that a path which has become slower is
+caught before a release.
+
+Run with: python -m src.benchmark [--rows 1000 100000 1000000] [--check]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from statistics import median
+from time import perf_counter
+from typing import Callable, Iterator, List, Optional
+
+import pandas
+from PyQt5.QtCore import QLocale, QThreadPool
+from PyQt5.QtWidgets import QApplication
+
+from src.synthetic_data import generate_resources
+
+BENCHMARK_HISTORY_PATH = "benchmarks/history.jsonl"
+BENCHMARK_ROWS = [1000, 100000]
+# Slowdown (%) of the fastest time beyond which a path has regressed.
+REGRESSION_TOLERANCE = 25.0
+
+
+@contextmanager
+def working_directory(directory: str) -> Iterator[None]:
+    """Changes the working directory until the context exits.
+
+    Args:
+        directory (str): Directory to work in.
+    """
+    previous_directory = os.getcwd()
+    os.chdir(directory)
+    try:
+        yield
+    finally:
+        os.chdir(previous_directory)
+
+
+def time_path(
+    function: Callable[[], object],
+    repeats: int,
+    setup: Optional[Callable[[], object]] = None,
+) -> dict:
+    """Times a path, running its setup before each run without timing it.
+
+    Args:
+        function (Callable[[], object]): Path to time.
+        repeats (int): Number of times to run the path.
+        setup (Optional[Callable[[], object]]): Run before each run of the
+                                                path, such as to restore files
+                                                the path changes.
+
+    Returns:
+        timing (dict): Fastest and median time (ms) of the runs.
+    """
+    times = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+
+    return {
+        "min_ms": round(min(times) * 1000, 3),
+        "median_ms": round(median(times) * 1000, 3),
+    }
+
+
+def benchmark_paths(repeats: int) -> List[dict]:
+    """Times every hot path on the resources in the working directory.
+
+    Args:
+        repeats (int): Number of times each path is run.
+
+    Returns:
+        results (List[dict]): Name, fastest time (ms), and median time (ms) of
+                              each path.
+    """
+    from src.app import BrewhouseWindow, read_sales_data
+    from src.inv_management import InventoryManagementDialog
+    from src.process_monitoring import ProcessMonitoringDialog
+    from src.recipes import get_inventory_key
+    from src.sales_analysis import load_sales_aggregates
+    from src.sales_cache import SALES_CACHE_PATH
+
+    def remove_sales_cache():
+        if os.path.exists(SALES_CACHE_PATH):
+            os.remove(SALES_CACHE_PATH)
+
+    results = {
+        "read_sales_data_uncached": time_path(
+            read_sales_data, repeats, remove_sales_cache
+        ),
+        "read_sales_data": time_path(read_sales_data, repeats),
+    }
+
+    # Loads the sales statistics in the main window without the worker thread.
+    window = BrewhouseWindow()
+    window.sales_worker.cancel()
+    QThreadPool.globalInstance().waitForDone()
+    window.show_sales_statistics(load_sales_aggregates())
+    prediction_month = window.sales_aggregates.last_month + 3
+    window.date_edit_predict.setDate(prediction_month.start_time.date())
+    plan_end = (prediction_month + 1).start_time.to_pydatetime()
+
+    results["get_sales_ratio"] = time_path(window.get_sales_ratio, repeats)
+    results["get_avg_growth_rate"] = time_path(window.get_avg_growth_rate, repeats)
+    results["predict_sales"] = time_path(window.predict_sales, repeats)
+    results["production_advice"] = time_path(
+        lambda: window.production_advice(5000, 5000, 5000, plan_end), repeats
+    )
+
+    monitoring_dialog = ProcessMonitoringDialog()
+    results["read_tanks"] = time_path(monitoring_dialog.read_tanks, repeats)
+
+    # Dispatches the last order, and every order of a beer in one batch,
+    # restoring the orders and inventory each time. The inventory has enough
+    # beer for every order, so no dispatch is refused.
+    inventory_dialog = InventoryManagementDialog()
+    order_list = list(inventory_dialog.orders)
+    inventory_volumes = {key: 0 for key in inventory_dialog.inventory.volumes}
+    for order in order_list:
+        inventory_volumes[get_inventory_key(order["order_recipe"])] += order[
+            "order_volume"
+        ]
+    inventory_dialog.line_edit_dispatch_order_id.setText(order_list[-1]["order_id"])
+    inventory_dialog.combo_box_dispatch_recipe.setCurrentText(
+        order_list[-1]["order_recipe"]
+    )
+
+    def restore_orders():
+        with open(inventory_dialog.orders.orders_path, "w") as orders_file:
+            json.dump(order_list, orders_file, ensure_ascii=False, indent=4)
+        inventory_dialog.orders.load()
+        inventory_dialog.inventory.volumes = dict(inventory_volumes)
+        inventory_dialog.save_inventory()
+
+    results["dispatch_order"] = time_path(
+        inventory_dialog.dispatch_order, repeats, restore_orders
+    )
+    results["dispatch_recipe_orders"] = time_path(
+        inventory_dialog.dispatch_recipe_orders, repeats, restore_orders
+    )
+    restore_orders()
+
+    return [{"path": path, **timing} for path, timing in results.items()]
+
+
+def get_commit() -> Optional[str]:
+    """Gets the git commit being benchmarked.
+
+    Returns:
+        commit (Optional[str]): Short hash of the commit, or None if it is not
+                                known.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def read_history(history_path: str) -> List[dict]:
+    """Reads the results of the previous runs of the benchmark.
+
+    Args:
+        history_path (str): Path of the JSON lines history file.
+
+    Returns:
+        history (List[dict]): Results of the previous runs, oldest first.
+    """
+    if not os.path.exists(history_path):
+        return []
+
+    with open(history_path, "r") as history_file:
+        return [json.loads(line) for line in history_file if line.strip()]
+
+
+def compare_with_history(
+    results: List[dict], history: List[dict], tolerance: float = REGRESSION_TOLERANCE
+) -> pandas.core.frame.DataFrame:
+    """Compares the results with the last run of each path on the same rows.
+
+    Args:
+        results (List[dict]): Results of this run.
+        history (List[dict]): Results of the previous runs, oldest first.
+        tolerance (float): Slowdown (%) of the fastest time beyond which a path
+                           has regressed.
+
+    Returns:
+        comparison (pandas.core.frame.DataFrame): Results of this run, with the
+                                                  previous fastest time (ms),
+                                                  the change (%), and whether
+                                                  each path has regressed.
+    """
+    previous_times = {
+        (result["rows"], result["path"]): result["min_ms"] for result in history
+    }
+    comparison = pandas.DataFrame(results)
+    comparison["previous_min_ms"] = [
+        previous_times.get((result["rows"], result["path"]), float("nan"))
+        for result in results
+    ]
+    comparison["change_pct"] = (
+        (comparison["min_ms"] / comparison["previous_min_ms"] - 1) * 100
+    ).round(1)
+    comparison["regressed"] = comparison["change_pct"] > tolerance
+
+    return comparison
+
+
+def main() -> None:
+    """Benchmarks the hot paths, records the results, and reports regressions."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=BENCHMARK_ROWS)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument(
+        "--data-dir", help="directory to keep the generated data in, to reuse it"
+    )
+    parser.add_argument("--history", default=BENCHMARK_HISTORY_PATH)
+    parser.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument(
+        "--check", action="store_true", help="exit with an error on a regression"
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="do not add the results to history"
+    )
+    args = parser.parse_args()
+
+    # Runs without showing any windows, and reads dates as the program expects.
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841
+    QLocale.setDefault(QLocale(QLocale.English, QLocale.UnitedKingdom))
+
+    run_time = datetime.now().isoformat(timespec="seconds")
+    commit = get_commit()
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for rows in args.rows:
+            data_dir = os.path.join(args.data_dir or temp_dir, str(rows))
+            if not os.path.exists(os.path.join(data_dir, "resources")):
+                generate_resources(data_dir, rows)
+
+            with working_directory(data_dir):
+                for result in benchmark_paths(args.repeats):
+                    results.append(
+                        {"time": run_time, "commit": commit, "rows": rows, **result}
+                    )
+
+    comparison = compare_with_history(results, read_history(args.history))
+    print(
+        comparison.drop(columns=["time", "commit"]).to_string(index=False, na_rep="-")
+    )
+
+    if not args.no_save:
+        history_dir = os.path.dirname(args.history)
+        if history_dir:
+            os.makedirs(history_dir, exist_ok=True)
+        with open(args.history, "a") as history_file:
+            for result in results:
+                history_file.write(json.dumps(result) + "\n")
+
+    if args.check and comparison["regressed"].any():
+        print(
+            "Slower than the last run by more than "
+            + str(args.tolerance)
+            + "%: "
+            + ", ".join(comparison.loc[comparison["regressed"], "path"])
+        )
+        sys.exit(1)
+
+
+# Prevents the code from executing when the script is imported as a module.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,537 @@
+"""
+A command line interface to the sales and production calculations of Barnaby's
+Brewhouse, which runs without the user interface. It can print the sales
+statistics, sales predictions for any number of months and their uncertainty,
+production advice and plans, sales totals for date ranges, growth rates over
+trailing windows of months, and customer analytics as JSON or CSV, so they can
+be used by scheduled jobs. The sales can be read from the SQLite database
+instead of the CSV file with the --database option. PyQt5 is never imported.
+
+Run with: python -m src.cli {summary,predict,simulate,advice,plan,growth,
+                             totals,trailing,compare,customers,top-customers}
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+import pandas
+
+from src.customer_analysis import DORMANT_MONTHS, CustomerAnalytics
+from src.demand_simulation import SIMULATION_PATHS, simulate_sales
+from src.forecasting import FORECAST_MODELS, MeanGrowthModel, get_forecast_model
+from src.production import (
+    INVENTORY_PATH,
+    PROCESSES_PATH,
+    get_production_table,
+    read_inventory_volumes,
+    read_production_volumes,
+)
+from src.production_plan import TANKS_ORIGINAL_PATH, read_production_plan
+from src.recipes import BEERS
+from src.sales_analysis import (
+    SalesAggregates,
+    get_future_months,
+    load_sales_aggregates,
+)
+from src.sales_cache import SALES_CACHE_PATH, SALES_DATA_PATH, read_cached_sales_data
+from src.sales_database import (
+    connect_sales_database,
+    load_database_aggregates,
+    read_sales_data,
+    read_sales_totals,
+    sync_sales_database,
+)
+from src.sales_growth import DEFAULT_GROWTH_WINDOW, GROWTH_WINDOWS
+
+CUSTOMER_COMMANDS = ["customers", "top-customers"]
+
+
+def get_summary(sales_aggregates: SalesAggregates) -> pandas.core.frame.DataFrame:
+    """Gets the total sales, sales ratio, and growth rate of each beer.
+
+    Args:
+        sales_aggregates (SalesAggregates): Aggregates of the sales data.
+
+    Returns:
+        summary (pandas.core.frame.DataFrame): Total sales, sales ratio (%), and
+                                               average monthly growth rate (%)
+                                               of each beer.
+    """
+    beer_sales = sales_aggregates.beer_sales[BEERS]
+    total_sales = sales_aggregates.total_sales
+    growth_rates = sales_aggregates.growth_rates[BEERS]
+
+    return pandas.DataFrame(
+        {
+            "sales": beer_sales.astype("int64"),
+            "sales_ratio_pct": [
+                round((sales / total_sales) * 100, 3) for sales in beer_sales
+            ],
+            "growth_pct": [round((growth - 1) * 100, 3) for growth in growth_rates],
+        },
+        index=pandas.Index(BEERS, name="beer"),
+    )
+
+
+def get_prediction_months(
+    args: argparse.Namespace, sales_aggregates: SalesAggregates
+) -> pandas.PeriodIndex:
+    """Gets the months to predict from the command line arguments.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+        sales_aggregates (SalesAggregates): Aggregates of the sales data.
+
+    Returns:
+        months (pandas.PeriodIndex): Months to predict the sales for.
+    """
+    if args.month:
+        return pandas.PeriodIndex(args.month, freq="M")
+
+    return get_future_months(args.months, sales_aggregates.last_month)
+
+
+def get_growth_table(
+    sales_aggregates: SalesAggregates, windows: List[int]
+) -> pandas.core.frame.DataFrame:
+    """Gets the average monthly growth rate of each beer in each window.
+
+    Args:
+        sales_aggregates (SalesAggregates): Aggregates of the sales data.
+        windows (List[int]): Windows (months) to compare.
+
+    Returns:
+        growth_table (pandas.core.frame.DataFrame): Average monthly growth
+                                                    rate (%) of each beer
+                                                    (rows) in each window
+                                                    (columns).
+    """
+    growth_rates = sales_aggregates.growth.compare_windows(windows).loc[BEERS]
+    growth_table = ((growth_rates - 1) * 100).round(3)
+    growth_table.columns = [
+        "growth_pct_" + str(window) + "_months" for window in windows
+    ]
+
+    return growth_table.rename_axis("beer")
+
+
+def predict(
+    sales_aggregates: SalesAggregates,
+    months: pandas.PeriodIndex,
+    model_name: Optional[str] = None,
+) -> pandas.core.frame.DataFrame:
+    """Predicts the sales of each beer, optionally with a registered model.
+
+    Args:
+        sales_aggregates (SalesAggregates): Aggregates of the sales data.
+        months (pandas.PeriodIndex): Months to predict the sales for.
+        model_name (Optional[str]): Registered name of the forecasting model,
+                                    or None to predict like the main window.
+
+    Returns:
+        predicted_sales (pandas.core.frame.DataFrame): Predicted sales volume
+                                                       of each beer in each
+                                                       month.
+    """
+    if model_name is None:
+        predicted_sales = sales_aggregates.predict_sales(months)
+    else:
+        # Grows the sales over the same window as the main window's growth rates.
+        parameters = {}
+        if FORECAST_MODELS[model_name] is MeanGrowthModel:
+            parameters["growth_window"] = sales_aggregates.growth_window
+        model = get_forecast_model(model_name, **parameters)
+        # Fits the model to the complete months, like the main window.
+        model.fit(
+            sales_aggregates.monthly_sales.loc[: sales_aggregates.last_month, BEERS]
+        )
+        predicted_sales = model.predict(months).astype("int64")
+
+    return predicted_sales.rename_axis(index="month", columns=None)
+
+
+def get_totals_table(totals: dict) -> pandas.core.frame.DataFrame:
+    """Converts the total sales of each recipe to a table.
+
+    Args:
+        totals (dict): Total quantity ordered of each recipe.
+
+    Returns:
+        totals_table (pandas.core.frame.DataFrame): Total of each recipe.
+    """
+    return pandas.DataFrame(
+        {"total": pandas.Series(totals, dtype="int64")}
+    ).rename_axis("recipe")
+
+
+def write_table(
+    table: pandas.core.frame.DataFrame,
+    output_format: str,
+    extra: Optional[dict] = None,
+):
+    """Writes a table to standard output as JSON or CSV.
+
+    Args:
+        table (pandas.core.frame.DataFrame): Table to write.
+        output_format (str): Either 'json' or 'csv'.
+        extra (Optional[dict]): Extra fields to include in the JSON output.
+    """
+    if output_format == "csv":
+        table.to_csv(sys.stdout)
+        return
+
+    table = table.set_axis(table.index.astype(str)).reset_index()
+    output = {"rows": json.loads(table.to_json(orient="records"))}
+    output.update(extra or {})
+    json.dump(output, sys.stdout, indent=4)
+    sys.stdout.write("\n")
+
+
+def parse_growth_window(value: str) -> int:
+    """Parses the number of months in a growth window.
+
+    Args:
+        value (str): Number of months given on the command line.
+
+    Returns:
+        growth_window (int): Number of months in the window.
+    """
+    growth_window = int(value)
+    if growth_window < 2:
+        raise argparse.ArgumentTypeError(
+            "a growth window must have at least 2 months, not " + value
+        )
+
+    return growth_window
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """Creates the parser of the command line arguments.
+
+    Returns:
+        parser (argparse.ArgumentParser): Parser of every command.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Sales and production calculations for Barnaby's Brewhouse.",
+    )
+    parser.add_argument("--sales-data", default=SALES_DATA_PATH)
+    parser.add_argument("--sales-cache", default=SALES_CACHE_PATH)
+    parser.add_argument(
+        "--database", help="SQLite database of the sales (default: the CSV file)"
+    )
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    parser.add_argument(
+        "--growth-window",
+        type=parse_growth_window,
+        default=DEFAULT_GROWTH_WINDOW,
+        help="number of months the growth rates are over",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("summary", help="total sales, sales ratios, growth rates")
+
+    for command, help_text in [
+        ("predict", "predicted sales of each beer per month"),
+        ("advice", "deficit of each beer and the beer to produce next"),
+        ("plan", "brews and tanks which cover the deficits in time"),
+    ]:
+        command_parser = commands.add_parser(command, help=help_text)
+        command_parser.add_argument(
+            "--month",
+            action="append",
+            help="month to predict, such as 2020-03 (can be repeated)",
+        )
+        command_parser.add_argument(
+            "--months",
+            type=int,
+            default=1,
+            help="number of months after the sales data to predict",
+        )
+        command_parser.add_argument(
+            "--model",
+            choices=list(FORECAST_MODELS),
+            help="forecasting model (default: the main window's growth rates)",
+        )
+        if command in ["advice", "plan"]:
+            command_parser.add_argument("--inventory", default=INVENTORY_PATH)
+            command_parser.add_argument("--processes", default=PROCESSES_PATH)
+        if command == "plan":
+            command_parser.add_argument("--tanks", default=TANKS_ORIGINAL_PATH)
+            command_parser.add_argument(
+                "--start", help="time the plan starts (default: now)"
+            )
+
+    simulate_parser = commands.add_parser(
+        "simulate", help="percentiles of the demand and stock-out probability"
+    )
+    simulate_parser.add_argument("--month", action="append")
+    simulate_parser.add_argument("--months", type=int, default=1)
+    simulate_parser.add_argument("--paths", type=int, default=SIMULATION_PATHS)
+    simulate_parser.add_argument("--seed", type=int)
+    simulate_parser.add_argument("--inventory", default=INVENTORY_PATH)
+    simulate_parser.add_argument("--processes", default=PROCESSES_PATH)
+
+    growth_parser = commands.add_parser(
+        "growth", help="growth rate of each beer over trailing windows of months"
+    )
+    growth_parser.add_argument(
+        "--window",
+        type=parse_growth_window,
+        action="append",
+        help="number of months in a window (can be repeated, default: "
+        + ", ".join(str(window) for window in GROWTH_WINDOWS)
+        + ")",
+    )
+
+    totals_parser = commands.add_parser(
+        "totals", help="sales of each beer between two dates"
+    )
+    totals_parser.add_argument("--start", required=True, help="such as 2019-03-01")
+    totals_parser.add_argument("--end", required=True, help="included in the range")
+
+    trailing_parser = commands.add_parser(
+        "trailing", help="sales of each beer in the days up to a date"
+    )
+    trailing_parser.add_argument("--days", type=int, default=90)
+    trailing_parser.add_argument("--end", help="default: the last sale")
+
+    compare_parser = commands.add_parser(
+        "compare", help="sales of each beer in one period against another"
+    )
+    for argument in ["--start", "--end", "--previous-start", "--previous-end"]:
+        compare_parser.add_argument(argument, required=True)
+
+    customers_parser = commands.add_parser(
+        "customers", help="sales, growth, and activity of each customer"
+    )
+    customers_parser.add_argument(
+        "--inactive-months",
+        type=int,
+        help="only customers without an order for this many months "
+        + "(such as "
+        + str(DORMANT_MONTHS)
+        + ")",
+    )
+
+    top_customers_parser = commands.add_parser(
+        "top-customers", help="customers who ordered the most of a beer"
+    )
+    top_customers_parser.add_argument("--recipe", required=True)
+    top_customers_parser.add_argument("--count", type=int, default=10)
+
+    return parser
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parses the command line arguments.
+
+    Args:
+        argv (Optional[List[str]]): Command line arguments, or None to use the
+                                    arguments the program was run with.
+
+    Returns:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    return get_parser().parse_args(argv)
+
+
+def read_sales(args: argparse.Namespace) -> pandas.core.frame.DataFrame:
+    """Reads every sale from the CSV file, or from the database if given.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+
+    Returns:
+        data_frame (pandas.core.frame.DataFrame): Sales data of beers.
+    """
+    if args.database is None:
+        return read_cached_sales_data(args.sales_data, args.sales_cache)
+
+    connection = connect_sales_database(args.database)
+    try:
+        sync_sales_database(connection, args.sales_data)
+        return read_sales_data(connection)
+    finally:
+        connection.close()
+
+
+def run_database_totals(args: argparse.Namespace):
+    """Sums the sales of each beer between two dates in the database.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    connection = connect_sales_database(args.database)
+    try:
+        sync_sales_database(connection, args.sales_data)
+        totals = read_sales_totals(connection, args.start, args.end)
+    finally:
+        connection.close()
+
+    write_table(get_totals_table(totals), args.format)
+
+
+def run_customer_command(args: argparse.Namespace):
+    """Runs a command which analyses the sales of each customer.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
+    customer_analytics = CustomerAnalytics(read_sales(args))
+
+    if args.command == "customers":
+        if args.inactive_months is None:
+            customers = customer_analytics.get_customer_activity()
+        else:
+            customers = customer_analytics.get_inactive_customers(args.inactive_months)
+        growth = customer_analytics.get_month_over_month_growth()
+        customers = customers.join(growth["growth_pct"])
+        write_table(
+            customers, args.format, {"month": str(customer_analytics.last_month)}
+        )
+    elif args.command == "top-customers":
+        top_customers = customer_analytics.get_top_customers(args.recipe, args.count)
+        write_table(
+            top_customers.rename("sales").rename_axis("customer").to_frame(),
+            args.format,
+            {"recipe": args.recipe},
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Runs the command given on the command line.
+
+    Args:
+        argv (Optional[List[str]]): Command line arguments, or None to use the
+                                    arguments the program was run with.
+    """
+    parser = get_parser()
+    args = parser.parse_args(argv)
+
+    if args.command in CUSTOMER_COMMANDS:
+        run_customer_command(args)
+        return
+
+    # Sums the sales in SQLite, rather than loading every sale.
+    if args.command == "totals" and args.database is not None:
+        run_database_totals(args)
+        return
+
+    if args.database is None:
+        sales_aggregates = load_sales_aggregates(args.sales_data, args.sales_cache)
+    else:
+        sales_aggregates = load_database_aggregates(args.database, args.sales_data)
+    sales_aggregates.growth_window = args.growth_window
+    range_index = sales_aggregates.range_index
+
+    if args.command == "summary":
+        write_table(
+            get_summary(sales_aggregates),
+            args.format,
+            {"total_sales": sales_aggregates.total_sales},
+        )
+    elif args.command == "predict":
+        months = get_prediction_months(args, sales_aggregates)
+        write_table(predict(sales_aggregates, months, args.model), args.format)
+    elif args.command == "simulate":
+        months = get_prediction_months(args, sales_aggregates)
+        if months.min() <= sales_aggregates.last_month:
+            parser.error(
+                "simulate: --month must be after the last month of sales, "
+                + str(sales_aggregates.last_month)
+            )
+        # Compares the demand with the stock in the inventory and in production.
+        stock = read_inventory_volumes(args.inventory) + read_production_volumes(
+            args.processes
+        )
+        simulation = simulate_sales(
+            sales_aggregates.monthly_sales,
+            sales_aggregates.growth.get_growth_ratios(args.growth_window),
+            months,
+            stock,
+            args.paths,
+            args.seed,
+            sales_aggregates.last_month,
+        )
+        write_table(simulation.reset_index(level="beer"), args.format)
+    elif args.command == "advice":
+        # Gives advice for the last of the months predicted.
+        months = get_prediction_months(args, sales_aggregates)
+        predicted_sales = predict(sales_aggregates, months, args.model).iloc[-1]
+        production_table, recommendation = get_production_table(
+            predicted_sales, args.inventory, args.processes
+        )
+        production_table.index.name = "beer"
+        write_table(
+            production_table,
+            args.format,
+            {"month": str(months[-1]), "recommendation": recommendation},
+        )
+    elif args.command == "plan":
+        # Plans the brews to be bottled by the end of the last month predicted.
+        months = get_prediction_months(args, sales_aggregates)
+        predicted_sales = predict(sales_aggregates, months, args.model).iloc[-1]
+        production_table, _ = get_production_table(
+            predicted_sales, args.inventory, args.processes
+        )
+        plan_end = (months[-1] + 1).start_time.to_pydatetime()
+        start = None if args.start is None else pandas.Timestamp(args.start)
+        plan, shortfalls, shortfall_causes = read_production_plan(
+            production_table["deficit"].to_dict(),
+            plan_end,
+            args.tanks,
+            args.processes,
+            None if start is None else start.to_pydatetime(),
+        )
+        plan_table = pandas.DataFrame(
+            plan,
+            columns=[
+                "recipe",
+                "volume",
+                "fermenter",
+                "conditioner",
+                "brew_start",
+                "fermentation_start",
+                "conditioning_start",
+                "bottling_start",
+                "ready",
+            ],
+        ).rename_axis("brew")
+        for column in plan_table.columns[4:]:
+            plan_table[column] = plan_table[column].astype(str)
+        write_table(
+            plan_table,
+            args.format,
+            {
+                "end": str(plan_end),
+                "shortfalls": shortfalls,
+                "shortfall_causes": shortfall_causes,
+            },
+        )
+    elif args.command == "growth":
+        windows = args.window or GROWTH_WINDOWS
+        write_table(
+            get_growth_table(sales_aggregates, windows),
+            args.format,
+            {"last_month": str(sales_aggregates.last_month)},
+        )
+    elif args.command == "totals":
+        totals = range_index.get_totals(args.start, args.end)
+        write_table(get_totals_table(totals), args.format)
+    elif args.command == "trailing":
+        end = args.end or range_index.last_date
+        totals = range_index.get_trailing_totals(end, args.days)
+        write_table(get_totals_table(totals), args.format, {"end": str(end)})
+    elif args.command == "compare":
+        comparison = range_index.compare_periods(
+            args.start, args.end, args.previous_start, args.previous_end
+        )
+        write_table(comparison, args.format)
+
+
+# Prevents the code from executing when the script is imported as a module.
+if __name__ == "__main__":
+    main()
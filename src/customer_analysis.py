@@ -0,0 +1,167 @@
+"""
+Analytics on the customers of Barnaby's Brewhouse. The sales data is grouped by
+customer, month, and recipe in a single pass, and every statistic is derived
+from that grouped data rather than from the individual sales: the volume each
+customer ordered, their growth from one month to the next, the top customers of
+each recipe, and the customers who have stopped ordering.
+"""
+
+from typing import Optional
+
+import numpy
+import pandas
+
+# Months without an order after which a customer is dormant, or has churned.
+DORMANT_MONTHS = 3
+CHURNED_MONTHS = 6
+
+
+class CustomerAnalytics:
+    """Sales of each customer, grouped by month and by recipe."""
+
+    def __init__(self, data_frame: pandas.core.frame.DataFrame):
+        """Groups the sales data by customer, month, and recipe.
+
+        Args:
+            data_frame (pandas.core.frame.DataFrame): Sales data of beers,
+                                                      indexed by date.
+        """
+        months = data_frame.index.to_period("M").rename("Month")
+        # Only keeps the combinations which have sales, so the grouped data
+        # stays small however many customers and recipes there are.
+        grouped_sales = data_frame.groupby(
+            [data_frame["Customer"], months, data_frame["Recipe"]], observed=True
+        )["Quantity ordered"].sum()
+
+        # Customer x month matrix, with a column for every month in the data.
+        monthly_sales = grouped_sales.groupby(level=["Customer", "Month"]).sum()
+        monthly_sales = monthly_sales.unstack("Month", fill_value=0)
+        if len(monthly_sales.columns):
+            monthly_sales = monthly_sales.reindex(
+                columns=pandas.period_range(
+                    monthly_sales.columns.min(), monthly_sales.columns.max(), freq="M"
+                ),
+                fill_value=0,
+            )
+        self.monthly_sales = monthly_sales.astype("int64")
+        self.monthly_sales.index = self.monthly_sales.index.astype(str)
+
+        # Customer x recipe matrix.
+        recipe_sales = grouped_sales.groupby(level=["Customer", "Recipe"]).sum()
+        self.recipe_sales = recipe_sales.unstack("Recipe", fill_value=0).astype("int64")
+        self.recipe_sales.index = self.recipe_sales.index.astype(str)
+        self.recipe_sales.columns = self.recipe_sales.columns.astype(str)
+
+        self.customer_sales = self.monthly_sales.sum(axis=1)
+
+    @property
+    def last_month(self) -> pandas.Period:
+        """Gets the last month of the sales data.
+
+        Returns:
+            last_month (pandas.Period): Latest month with any sales.
+        """
+        return self.monthly_sales.columns[-1]
+
+    def get_month_over_month_growth(
+        self, month: Optional[pandas.Period] = None
+    ) -> pandas.core.frame.DataFrame:
+        """Gets the growth of each customer from the month before to a month.
+
+        Args:
+            month (Optional[pandas.Period]): Month to get the growth to, or None
+                                             for the last month of the data.
+
+        Returns:
+            growth (pandas.core.frame.DataFrame): Sales of each customer in the
+                                                  month and the month before,
+                                                  and the growth (%), which is
+                                                  empty if there were no sales
+                                                  the month before.
+        """
+        month = self.last_month if month is None else pandas.Period(month, freq="M")
+        sales = self.monthly_sales.get(
+            month, pandas.Series(0, self.monthly_sales.index)
+        )
+        previous_sales = self.monthly_sales.get(
+            month - 1, pandas.Series(0, self.monthly_sales.index)
+        )
+        growth = (sales / previous_sales.replace(0, numpy.nan) - 1) * 100
+
+        return pandas.DataFrame(
+            {
+                "sales": sales,
+                "previous_sales": previous_sales,
+                "growth_pct": growth.round(3),
+            }
+        ).rename_axis("customer")
+
+    def get_top_customers(self, recipe: str, count: int = 10) -> pandas.Series:
+        """Gets the customers who ordered the most of a recipe.
+
+        Args:
+            recipe (str): Beer recipe to rank the customers by.
+            count (int): Number of customers to get.
+
+        Returns:
+            top_customers (pandas.Series): Volume of the recipe ordered by each
+                                           of the top customers, largest first.
+        """
+        if recipe not in self.recipe_sales.columns:
+            return pandas.Series([], dtype="int64", name=recipe)
+
+        recipe_sales = self.recipe_sales[recipe]
+
+        return recipe_sales[recipe_sales > 0].nlargest(count)
+
+    def get_customer_activity(self) -> pandas.core.frame.DataFrame:
+        """Gets when each customer last ordered, and whether they are active.
+
+        Returns:
+            activity (pandas.core.frame.DataFrame): Total volume, last month
+                                                    with an order, months since
+                                                    that order, and status
+                                                    (active, dormant, or
+                                                    churned) of each customer.
+        """
+        ordered = self.monthly_sales.to_numpy() > 0
+        month_count = ordered.shape[1]
+        # Position of the last month with an order, found from the right.
+        months_since = numpy.argmax(ordered[:, ::-1], axis=1)
+        last_months = self.monthly_sales.columns[month_count - 1 - months_since]
+
+        status = numpy.select(
+            [months_since >= CHURNED_MONTHS, months_since >= DORMANT_MONTHS],
+            ["churned", "dormant"],
+            "active",
+        )
+
+        return pandas.DataFrame(
+            {
+                "sales": self.customer_sales,
+                "last_month": last_months.astype(str),
+                "months_since_order": months_since,
+                "status": status,
+            },
+            index=self.monthly_sales.index,
+        ).rename_axis("customer")
+
+    def get_inactive_customers(
+        self, months: int = DORMANT_MONTHS
+    ) -> pandas.core.frame.DataFrame:
+        """Gets the customers who have not ordered for a number of months.
+
+        Args:
+            months (int): Number of months without an order.
+
+        Returns:
+            inactive (pandas.core.frame.DataFrame): Activity of each customer
+                                                    without a recent order, the
+                                                    longest inactive first.
+        """
+        activity = self.get_customer_activity()
+        inactive = activity[activity["months_since_order"] >= months]
+
+        return inactive.sort_values(
+            ["months_since_order", "sales"], ascending=[False, False]
+        )
@@ -0,0 +1,165 @@
+"""
+A Monte Carlo simulation of the future demand for each beer, which shows how
+uncertain the sales predictions are. Each simulated path of demand starts from
+the last monthly sales, and grows every month by a ratio drawn at random from
+the historical month-over-month growth ratios of the beer. Every path of every
+beer is simulated at once with NumPy arrays, so that many thousands of paths
+take well under a second. The paths give percentile bands of the demand in each
+month, and the probability that the demand so far will exceed the stock.
+"""
+
+from typing import Optional, Sequence
+
+import numpy
+import pandas
+
+SIMULATION_PATHS = 100000
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def simulate_demand(
+    last_sales: pandas.Series,
+    growth_ratios: pandas.core.frame.DataFrame,
+    month_count: int,
+    paths: int = SIMULATION_PATHS,
+    seed: Optional[int] = None,
+) -> numpy.ndarray:
+    """Simulates paths of the monthly demand for each beer.
+
+    Args:
+        last_sales (pandas.Series): Last monthly sales of each beer.
+        growth_ratios (pandas.core.frame.DataFrame): Historical month-over-month
+                                                     growth ratios of each beer.
+        month_count (int): Number of months to simulate.
+        paths (int): Number of paths to simulate for each beer.
+        seed (Optional[int]): Seed of the random numbers, or None for a
+                              different simulation each time.
+
+    Returns:
+        demand (numpy.ndarray): Simulated demand of each beer, in each path,
+                                in each month after the last month.
+    """
+    rng = numpy.random.default_rng(seed)
+    beers = growth_ratios.columns
+    demand = numpy.empty((len(beers), paths, month_count))
+
+    for position, beer in enumerate(beers):
+        # Ignores months which followed a month without sales.
+        ratios = growth_ratios[beer].to_numpy(dtype="float64")
+        ratios = ratios[numpy.isfinite(ratios)]
+        if len(ratios) == 0:
+            ratios = numpy.ones(1)
+
+        draws = rng.integers(0, len(ratios), size=(paths, month_count))
+        numpy.cumprod(ratios[draws], axis=1, out=demand[position])
+        demand[position] *= float(last_sales[beer])
+
+    return demand
+
+
+def get_percentile_bands(
+    demand: numpy.ndarray,
+    beers: Sequence[str],
+    months: Sequence[pandas.Period],
+    percentiles: Sequence[int] = PERCENTILES,
+) -> pandas.core.frame.DataFrame:
+    """Gets percentiles of the simulated demand of each beer in each month.
+
+    Args:
+        demand (numpy.ndarray): Simulated demand of each beer, in each path,
+                                in each month.
+        beers (Sequence[str]): Beers the demand was simulated for.
+        months (Sequence[pandas.Period]): Months the demand was simulated for.
+        percentiles (Sequence[int]): Percentiles to get, such as 5 and 95.
+
+    Returns:
+        bands (pandas.core.frame.DataFrame): Percentiles of the demand, indexed
+                                             by month and beer.
+    """
+    # Has the shape (percentiles, beers, months).
+    values = numpy.percentile(demand, percentiles, axis=1)
+    index = pandas.MultiIndex.from_product([months, beers], names=["month", "beer"])
+    columns = ["p" + str(percentile) for percentile in percentiles]
+
+    return pandas.DataFrame(
+        values.transpose(2, 1, 0).reshape(len(months) * len(beers), len(percentiles)),
+        index=index,
+        columns=columns,
+    ).round(1)
+
+
+def get_stock_out_probability(
+    demand: numpy.ndarray, stock: pandas.Series, beers: Sequence[str]
+) -> numpy.ndarray:
+    """Calculates the probability that the demand so far exceeds the stock.
+
+    Args:
+        demand (numpy.ndarray): Simulated demand of each beer, in each path,
+                                in each month.
+        stock (pandas.Series): Volume (L) of each beer in stock.
+        beers (Sequence[str]): Beers the demand was simulated for.
+
+    Returns:
+        stock_out_probability (numpy.ndarray): Probability of a stock-out of
+                                               each beer by each month.
+    """
+    cumulative_demand = numpy.cumsum(demand, axis=2)
+    stock_volumes = stock[list(beers)].to_numpy(dtype="float64")
+
+    return (cumulative_demand > stock_volumes[:, None, None]).mean(axis=1)
+
+
+def simulate_sales(
+    monthly_sales: pandas.core.frame.DataFrame,
+    growth_ratios: pandas.core.frame.DataFrame,
+    months: Sequence[pandas.Period],
+    stock: pandas.Series,
+    paths: int = SIMULATION_PATHS,
+    seed: Optional[int] = None,
+    last_month: Optional[pandas.Period] = None,
+) -> pandas.core.frame.DataFrame:
+    """Simulates the demand for each beer in the given months.
+
+    Args:
+        monthly_sales (pandas.core.frame.DataFrame): Monthly sales of each
+                                                     beer.
+        growth_ratios (pandas.core.frame.DataFrame): Historical month-over-month
+                                                     growth ratios of each beer.
+        months (Sequence[pandas.Period]): Months after the last month to
+                                          simulate the demand for.
+        stock (pandas.Series): Volume (L) of each beer in stock.
+        paths (int): Number of paths to simulate for each beer.
+        seed (Optional[int]): Seed of the random numbers, or None for a
+                              different simulation each time.
+        last_month (Optional[pandas.Period]): Last month of the sales data, or
+                                              None for the last month of the
+                                              monthly sales.
+
+    Returns:
+        simulation (pandas.core.frame.DataFrame): Percentiles of the demand
+                                                  of each beer in each month,
+                                                  and the probability of a
+                                                  stock-out by that month.
+    """
+    beers = list(growth_ratios.columns)
+    if last_month is None:
+        last_month = monthly_sales.index[-1]
+    months = pandas.PeriodIndex(months, freq="M")
+    horizons = months.asi8 - last_month.ordinal
+    if len(horizons) and horizons.min() < 1:
+        raise ValueError("Months to simulate must be after " + str(last_month) + ".")
+
+    last_sales = monthly_sales.loc[last_month, beers]
+    demand = simulate_demand(
+        last_sales, growth_ratios, int(horizons.max(initial=0)), paths, seed
+    )
+    stock_out_probability = get_stock_out_probability(demand, stock, beers)
+
+    # Keeps only the months which were asked for.
+    demand = demand[:, :, horizons - 1]
+    simulation = get_percentile_bands(demand, beers, months)
+    simulation["stock_out_probability"] = (
+        stock_out_probability[:, horizons - 1].T.reshape(-1).round(4)
+    )
+
+    return simulation
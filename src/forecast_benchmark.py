@@ -0,0 +1,107 @@
+"""
+A benchmark of the forecasting models on the sales data of Barnaby's Brewhouse.
+Each model is fitted to the monthly sales with the last few months held out,
+and the time taken to fit and predict, and the error of the predictions for the
+held out months, are reported for each model.
+
+Run with: python -m src.forecast_benchmark
+"""
+
+import argparse
+from timeit import repeat
+from typing import List
+
+import numpy
+import pandas
+
+from src.forecasting import FORECAST_MODELS
+from src.sales_analysis import load_monthly_sales
+
+
+def get_forecast_error(
+    actual_sales: pandas.core.frame.DataFrame,
+    predicted_sales: pandas.core.frame.DataFrame,
+) -> float:
+    """Calculates the weighted absolute percentage error of a forecast.
+
+    Args:
+        actual_sales (pandas.core.frame.DataFrame): Actual monthly sales.
+        predicted_sales (pandas.core.frame.DataFrame): Predicted monthly sales.
+
+    Returns:
+        error (float): Total absolute error as a percentage of total sales.
+    """
+    actual = actual_sales.to_numpy(dtype="float64")
+    predicted = predicted_sales.to_numpy(dtype="float64")
+
+    return float(numpy.abs(predicted - actual).sum() / actual.sum() * 100)
+
+
+def benchmark_models(
+    monthly_sales: pandas.core.frame.DataFrame,
+    holdout_months: int = 3,
+    horizon: int = 36,
+    repeats: int = 5,
+) -> List[dict]:
+    """Measures the speed and accuracy of every registered forecasting model.
+
+    Args:
+        monthly_sales (pandas.core.frame.DataFrame): Monthly sales of each
+                                                     beer.
+        holdout_months (int): Number of final months held out to measure the
+                              accuracy of the forecasts.
+        horizon (int): Number of months predicted when timing predictions.
+        repeats (int): Number of times each timing is repeated, keeping the
+                       fastest.
+
+    Returns:
+        results (List[dict]): Name, fit time (ms), predict time (ms), and error
+                              (%) of each model.
+    """
+    training_sales = monthly_sales.iloc[:-holdout_months]
+    actual_sales = monthly_sales.iloc[-holdout_months:]
+    horizon_months = pandas.period_range(
+        training_sales.index[-1] + 1, periods=horizon, freq="M"
+    )
+    results = []
+
+    for name, model_class in FORECAST_MODELS.items():
+        model = model_class().fit(training_sales)
+        error = get_forecast_error(actual_sales, model.predict(actual_sales.index))
+
+        # Times the fastest fit and prediction over all the repeats.
+        fit_time = min(
+            repeat(lambda: model_class().fit(training_sales), number=1, repeat=repeats)
+        )
+        predict_time = min(
+            repeat(lambda: model.predict(horizon_months), number=1, repeat=repeats)
+        )
+
+        results.append(
+            {
+                "model": name,
+                "fit_ms": round(fit_time * 1000, 3),
+                "predict_ms": round(predict_time * 1000, 3),
+                "error_pct": round(error, 3),
+            }
+        )
+
+    return results
+
+
+def main() -> None:
+    """Benchmarks the forecasting models and prints the results."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--holdout", type=int, default=3)
+    parser.add_argument("--horizon", type=int, default=36)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    monthly_sales = load_monthly_sales()
+    results = benchmark_models(monthly_sales, args.holdout, args.horizon, args.repeats)
+    print(pandas.DataFrame(results).to_string(index=False))
+
+
+# Prevents the code from executing when the script is imported as a module.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""
+Models to forecast the monthly sales of each beer. Every model has the same
+interface: it is fitted to the monthly sales of all beers at once, and then
+predicts the sales of all beers for any given months. The models are registered
+by name, so the model used for forecasts can be chosen and compared.
+"""
+
+from typing import Dict, Sequence, Type
+
+import numpy
+import pandas
+
+from src.sales_growth import DEFAULT_GROWTH_WINDOW, get_ratio
+
+
+class ForecastModel:
+    """Base class for models forecasting the monthly sales of each beer."""
+
+    def fit(self, monthly_sales: pandas.core.frame.DataFrame) -> "ForecastModel":
+        """Fits the model to the monthly sales of every beer.
+
+        Args:
+            monthly_sales (pandas.core.frame.DataFrame): Monthly sales of each
+                                                         beer.
+
+        Returns:
+            model (ForecastModel): The fitted model.
+        """
+        self.beers = monthly_sales.columns
+        self.last_month = monthly_sales.index[-1]
+        self.fit_sales(monthly_sales.to_numpy(dtype="float64"))
+
+        return self
+
+    def predict(self, months: Sequence[pandas.Period]) -> pandas.core.frame.DataFrame:
+        """Predicts the sales of every beer for every given month.
+
+        Args:
+            months (Sequence[pandas.Period]): Months to predict the sales for.
+
+        Returns:
+            predicted_sales (pandas.core.frame.DataFrame): Predicted sales
+                                                           volume of each beer
+                                                           (columns) in each
+                                                           month (rows).
+        """
+        months = pandas.PeriodIndex(months, freq="M")
+        horizons = months.asi8 - self.last_month.ordinal
+        predictions = self.predict_sales(horizons)
+
+        return pandas.DataFrame(
+            numpy.clip(predictions, 0, None), index=months, columns=self.beers
+        )
+
+    def fit_sales(self, sales: numpy.ndarray):
+        """Fits the model to an array of monthly sales.
+
+        Args:
+            sales (numpy.ndarray): Sales of each beer (columns) in each month
+                                   (rows).
+        """
+        raise NotImplementedError
+
+    def predict_sales(self, horizons: numpy.ndarray) -> numpy.ndarray:
+        """Predicts the sales for the given numbers of months ahead.
+
+        Args:
+            horizons (numpy.ndarray): Number of months after the last month to
+                                      predict the sales for.
+
+        Returns:
+            predictions (numpy.ndarray): Predicted sales of each beer (columns)
+                                         for each horizon (rows).
+        """
+        raise NotImplementedError
+
+
+class MeanGrowthModel(ForecastModel):
+    """Grows the last month's sales by the mean month-over-month growth rate
+    over a trailing window of months, like the predictions in the main
+    window."""
+
+    def __init__(self, growth_window: int = DEFAULT_GROWTH_WINDOW):
+        """Sets the growth window of the model.
+
+        Args:
+            growth_window (int): Number of months the growth rates are over.
+        """
+        self.growth_window = growth_window
+
+    def fit_sales(self, sales: numpy.ndarray):
+        """Calculates the mean growth rate over the window and the last sales
+        of each beer."""
+        window_sales = sales[-self.growth_window :]
+        ratios = get_ratio(window_sales[:-1], window_sales[1:])
+
+        # Ignores months which followed a month without sales.
+        finite = numpy.isfinite(ratios)
+        ratio_counts = finite.sum(axis=0)
+        self.growth_rates = numpy.full(sales.shape[1], numpy.nan)
+        numpy.divide(
+            numpy.where(finite, ratios, 0).sum(axis=0),
+            ratio_counts,
+            out=self.growth_rates,
+            where=ratio_counts > 0,
+        )
+        self.last_sales = sales[-1]
+
+    def predict_sales(self, horizons: numpy.ndarray) -> numpy.ndarray:
+        """Grows the last sales by the growth rate for each month ahead."""
+        return self.last_sales * self.growth_rates ** horizons[:, numpy.newaxis]
+
+
+class LogLinearModel(ForecastModel):
+    """Fits a straight line to the logarithm of the monthly sales, which is a
+    constant growth rate estimated from every month rather than the last."""
+
+    def fit_sales(self, sales: numpy.ndarray):
+        """Fits the slope and intercept of the log sales of each beer."""
+        # Solves the least squares line for every beer at once.
+        months = numpy.arange(len(sales)) - (len(sales) - 1)
+        log_sales = numpy.log1p(sales)
+        month_mean = months.mean()
+        log_mean = log_sales.mean(axis=0)
+        month_deviation = months - month_mean
+        self.slopes = (month_deviation @ (log_sales - log_mean)) / max(
+            float(month_deviation @ month_deviation), 1.0
+        )
+        self.intercepts = log_mean - self.slopes * month_mean
+
+    def predict_sales(self, horizons: numpy.ndarray) -> numpy.ndarray:
+        """Extends the line of the log sales of each beer."""
+        return numpy.expm1(self.intercepts + self.slopes * horizons[:, numpy.newaxis])
+
+
+class HoltWintersModel(ForecastModel):
+    """Additive Holt-Winters exponential smoothing with a yearly season. Falls
+    back to Holt's linear trend method without a season when there is less
+    than two years of sales."""
+
+    def __init__(
+        self,
+        alpha: float = 0.5,
+        beta: float = 0.1,
+        gamma: float = 0.1,
+        season_length: int = 12,
+    ):
+        """Sets the smoothing factors of the model.
+
+        Args:
+            alpha (float): Smoothing factor of the level.
+            beta (float): Smoothing factor of the trend.
+            gamma (float): Smoothing factor of the season.
+            season_length (int): Number of months in a season.
+        """
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.season_length = season_length
+
+    def fit_sales(self, sales: numpy.ndarray):
+        """Smooths the level, trend, and season of the sales of each beer."""
+        months = len(sales)
+        season_length = self.season_length
+
+        # Initialises the level, trend, and season of every beer.
+        seasonal = months >= 2 * season_length
+        if seasonal:
+            first_season = sales[:season_length].mean(axis=0)
+            second_season = sales[season_length : 2 * season_length].mean(axis=0)
+            level = first_season
+            trend = (second_season - first_season) / season_length
+            season = sales[:season_length] - first_season
+        else:
+            season_length = 1
+            level = sales[0]
+            trend = sales[1] - sales[0] if months > 1 else numpy.zeros_like(level)
+            season = numpy.zeros((1, sales.shape[1]))
+
+        # Smooths each month in turn, updating every beer at once.
+        for month in range(months):
+            month_season = season[month % season_length]
+            new_level = self.alpha * (sales[month] - month_season) + (
+                1 - self.alpha
+            ) * (level + trend)
+            trend = self.beta * (new_level - level) + (1 - self.beta) * trend
+            # Holt's method keeps the season at zero.
+            if seasonal:
+                season[month % season_length] = (
+                    self.gamma * (sales[month] - new_level)
+                    + (1 - self.gamma) * month_season
+                )
+            level = new_level
+
+        self.level = level
+        self.trend = trend
+        self.season = season
+        self.months = months
+
+    def predict_sales(self, horizons: numpy.ndarray) -> numpy.ndarray:
+        """Adds the trend and season for each month ahead to the level."""
+        season_index = (self.months + horizons - 1) % len(self.season)
+        return (
+            self.level
+            + self.trend * horizons[:, numpy.newaxis]
+            + self.season[season_index]
+        )
+
+
+class SeasonalNaiveModel(ForecastModel):
+    """Repeats the sales of the same month in the last year. Repeats the last
+    month's sales when there is less than a year of sales."""
+
+    def __init__(self, season_length: int = 12):
+        """Sets the season length of the model.
+
+        Args:
+            season_length (int): Number of months in a season.
+        """
+        self.season_length = season_length
+
+    def fit_sales(self, sales: numpy.ndarray):
+        """Stores the last season of sales of each beer."""
+        if len(sales) < self.season_length:
+            self.last_season = sales[-1:]
+        else:
+            self.last_season = sales[-self.season_length :]
+
+    def predict_sales(self, horizons: numpy.ndarray) -> numpy.ndarray:
+        """Repeats the sales of the matching month of the last season."""
+        return self.last_season[(horizons - 1) % len(self.last_season)]
+
+
+# Models which can be chosen to forecast sales, by name.
+FORECAST_MODELS: Dict[str, Type[ForecastModel]] = {
+    "mean_growth": MeanGrowthModel,
+    "log_linear": LogLinearModel,
+    "holt_winters": HoltWintersModel,
+    "seasonal_naive": SeasonalNaiveModel,
+}
+
+
+def get_forecast_model(name: str, **parameters) -> ForecastModel:
+    """Creates a forecasting model from its registered name.
+
+    Args:
+        name (str): Registered name of the model.
+        **parameters: Parameters of the model, such as the growth_window of
+                      the mean growth model.
+
+    Returns:
+        model (ForecastModel): An unfitted model.
+    """
+    try:
+        model_class = FORECAST_MODELS[name]
+    except KeyError:
+        raise ValueError(
+            "Unknown forecasting model '"
+            + name
+            + "'. Choose from: "
+            + ", ".join(FORECAST_MODELS)
+        ) from None
+
+    return model_class(**parameters)
@@ -0,0 +1,206 @@
+"""
+Timing of the button handlers and data functions of the program, to find which
+clicks are slow on the machines it is used on. Each timed operation is logged
+with how long it took, and its latency is added to a histogram kept in memory,
+so the 50th, 95th, and 99th percentile latencies of every operation can be
+summarised without storing every timing. The histograms have buckets which grow
+by a fixed ratio, so their percentiles are within a few percent of the exact
+latencies, however long the program runs.
+
+Functions are timed with the @timed decorator, and blocks of code with the
+time_operation context manager. The summary is logged and saved when the
+program exits.
+"""
+
+import functools
+import json
+import logging
+import math
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional
+
+LATENCY_SUMMARY_PATH = "resources/latency_summary.json"
+# Latencies are counted in buckets from 1 microsecond, each 2^(1/8) (about 9%)
+# longer than the last, up to about 17 minutes.
+FIRST_BUCKET_SECONDS = 1e-6
+BUCKETS_PER_DOUBLING = 8
+BUCKET_COUNT = 30 * BUCKETS_PER_DOUBLING
+SUMMARY_PERCENTILES = [50, 95, 99]
+
+
+class LatencyHistogram:
+    """Counts of the latencies of an operation in buckets of increasing size."""
+
+    def __init__(self):
+        """Creates an empty histogram."""
+        self.bucket_counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, seconds: float):
+        """Adds a latency to the histogram.
+
+        Args:
+            seconds (float): Time the operation took.
+        """
+        if seconds <= FIRST_BUCKET_SECONDS:
+            bucket = 0
+        else:
+            bucket = min(
+                int(math.log2(seconds / FIRST_BUCKET_SECONDS) * BUCKETS_PER_DOUBLING),
+                BUCKET_COUNT - 1,
+            )
+        self.bucket_counts[bucket] += 1
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def get_percentile(self, percentile: float) -> float:
+        """Estimates a percentile of the latencies.
+
+        Args:
+            percentile (float): Percentile to estimate, such as 95.
+
+        Returns:
+            latency (float): Upper bound (seconds) of the bucket holding the
+                             percentile, or zero if nothing has been timed.
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = math.ceil(self.count * percentile / 100)
+        cumulative_count = 0
+        for bucket, bucket_count in enumerate(self.bucket_counts):
+            cumulative_count += bucket_count
+            if cumulative_count >= rank:
+                upper_bound = FIRST_BUCKET_SECONDS * 2 ** (
+                    (bucket + 1) / BUCKETS_PER_DOUBLING
+                )
+                return min(upper_bound, self.max_seconds)
+
+        return self.max_seconds
+
+
+# Histogram of each operation, which may be timed on any thread.
+LATENCIES: Dict[str, LatencyHistogram] = {}
+LATENCIES_LOCK = threading.Lock()
+
+
+def record_latency(operation: str, seconds: float):
+    """Logs how long an operation took and adds it to its histogram.
+
+    Args:
+        operation (str): Name of the operation.
+        seconds (float): Time the operation took.
+    """
+    with LATENCIES_LOCK:
+        LATENCIES.setdefault(operation, LatencyHistogram()).add(seconds)
+
+    duration_ms = round(seconds * 1000, 3)
+    logging.debug(
+        "%s took %.3f ms.",
+        operation,
+        duration_ms,
+        extra={"operation": operation, "duration_ms": duration_ms},
+    )
+
+
+@contextmanager
+def time_operation(operation: str) -> Iterator[None]:
+    """Times the code in the context as an operation.
+
+    The time is recorded even if the code raises an exception.
+
+    Args:
+        operation (str): Name of the operation.
+    """
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record_latency(operation, perf_counter() - start)
+
+
+def timed(function: Optional[Callable] = None, operation: Optional[str] = None):
+    """Decorates a function to time every call to it.
+
+    Methods connected directly to a Qt signal must be connected with a lambda
+    once decorated, as Qt passes the arguments of the signal to the decorated
+    method.
+
+    Args:
+        function (Optional[Callable]): Function to time.
+        operation (Optional[str]): Name of the operation, or None for the
+                                   qualified name of the function.
+
+    Returns:
+        timed_function (Callable): The function, timed whenever it is called.
+    """
+
+    def decorate(function: Callable) -> Callable:
+        name = operation or function.__qualname__
+
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            with time_operation(name):
+                return function(*args, **kwargs)
+
+        return timed_function
+
+    if function is None:
+        return decorate
+
+    return decorate(function)
+
+
+def get_latency_summary() -> List[dict]:
+    """Summarises the latencies of every operation which has been timed.
+
+    Returns:
+        summary (List[dict]): Name, count, percentiles (ms), maximum (ms), and
+                              total time (ms) of each operation, slowest total
+                              first.
+    """
+    with LATENCIES_LOCK:
+        histograms = list(LATENCIES.items())
+
+    summary = []
+    for operation, histogram in histograms:
+        operation_summary = {"operation": operation, "count": histogram.count}
+        for percentile in SUMMARY_PERCENTILES:
+            operation_summary["p" + str(percentile) + "_ms"] = round(
+                histogram.get_percentile(percentile) * 1000, 3
+            )
+        operation_summary["max_ms"] = round(histogram.max_seconds * 1000, 3)
+        operation_summary["total_ms"] = round(histogram.total_seconds * 1000, 3)
+        summary.append(operation_summary)
+
+    return sorted(summary, key=lambda row: row["total_ms"], reverse=True)
+
+
+def log_latency_summary():
+    """Logs the latency percentiles of every operation which has been timed."""
+    for row in get_latency_summary():
+        logging.info(
+            "Latency of %s: %d calls, p50 %.3f ms, p95 %.3f ms, p99 %.3f ms, "
+            "max %.3f ms.",
+            row["operation"],
+            row["count"],
+            row["p50_ms"],
+            row["p95_ms"],
+            row["p99_ms"],
+            row["max_ms"],
+        )
+
+
+def save_latency_summary(summary_path: str = LATENCY_SUMMARY_PATH):
+    """Saves the latency percentiles of every operation to a JSON file.
+
+    Args:
+        summary_path (str): Path of the JSON file.
+    """
+    with open(summary_path, "w") as summary_file:
+        json.dump(get_latency_summary(), summary_file, ensure_ascii=False, indent=4)
@@ -4,12 +4,15 @@ add or remove volumes of each type of beer, and calculating the overall volume
 and number of bottles of each beer.
 """
 
-import json
-from typing import Tuple
+import logging
 
 from PyQt5.QtGui import QIntValidator
 from PyQt5.QtWidgets import QDialog
 
+from src.instrumentation import timed
+from src.inventory import get_inventory_store
+from src.order_book import dispatch_orders, get_order_book
+from src.recipes import BEERS, get_inventory_key
 from src.setup.inv_management_setup import Ui_dialog_inv_management
 
 
@@ -25,206 +28,134 @@ class InventoryManagementDialog(QDialog, Ui_dialog_inv_management):
         self.line_edit_update_inv_volume.setValidator(self.only_int)
         self.line_edit_add_order_volume.setValidator(self.only_int)
 
-        # Reads the inventory and gets volume for each beer.
-        (
-            inventory_list,
-            _,
-            _,
-            _,
-        ) = self.read_inventory()
-        # Reads the customer order list and adds to UI..
-        order_list = self.read_orders()
+        # Shares the inventory with the other dialogs, which read it once.
+        self.inventory = get_inventory_store()
+        # Reads the customer orders once and adds them to the UI.
+        self.orders = get_order_book()
+        self.update_orders()
 
         # Connects 'Add to Inventory' button to add inventory volume.
-        self.btn_add_inv.clicked.connect(lambda: self.add_inventory(inventory_list))
+        self.btn_add_inv.clicked.connect(lambda: self.add_inventory())
         # Connects 'Remove from Inventory' button to remove inventory volume.
-        self.btn_remove_inv.clicked.connect(
-            lambda: self.remove_inventory(inventory_list)
-        )
+        self.btn_remove_inv.clicked.connect(lambda: self.remove_inventory())
         # Connects 'Add Order' button to add customer order.
-        self.btn_add_order.clicked.connect(lambda: self.add_order(order_list))
-        # Connects 'Dispatch Order' button to dispatch customer order.
-        self.btn_dispatch_order.clicked.connect(
-            lambda: self.dispatch_order(inventory_list, order_list)
+        self.btn_add_order.clicked.connect(lambda: self.add_order())
+        # Connects 'Dispatch Order' button to dispatch customer orders.
+        self.btn_dispatch_order.clicked.connect(lambda: self.dispatch_order())
+        # Connects 'Dispatch All Orders of Recipe' button to dispatch orders.
+        self.btn_dispatch_recipe_orders.clicked.connect(
+            lambda: self.dispatch_recipe_orders()
         )
 
         # Updates the volumes in the inventory in the UI.
         self.update_inventory()
 
-    def save_inventory(self, inventory_list: list):
-        """Saves the new inventory to the JSON file.
-
-        Args:
-            inventory_list (list): List storing the volume for each beer.
-        """
-        with open("resources/inventory.json", "w") as inventory_file:
-            json.dump(inventory_list, inventory_file, ensure_ascii=False, indent=4)
-
-    def read_inventory(self) -> Tuple[list, int, int, int]:
-        """Reads the JSON file for inventory and gets volume for each beer.
+    @timed
+    def save_inventory(self):
+        """Saves the inventory to the JSON file."""
+        self.inventory.save()
 
-        Returns:
-            inventory_list (list): List storing the volume for each beer.
-            red_helles_volume (int): Volume (L) of Red Helles.
-            pilsner_volume (int): Volume (L) of Pilsner.
-            dunkel_volume (int): Volume (L) of Dunkel.
-        """
-        with open("resources/inventory.json", "r") as inventory_file:
-            try:
-                inventory_list = json.load(inventory_file)
-                for inventory in inventory_list:
-                    if inventory["recipe"] == "red_helles":
-                        red_helles_volume = int(inventory["volume"])
-                    elif inventory["recipe"] == "pilsner":
-                        pilsner_volume = int(inventory["volume"])
-                    elif inventory["recipe"] == "dunkel":
-                        dunkel_volume = int(inventory["volume"])
-            except ValueError:
-                print("Empty JSON file.")
-
-        return inventory_list, red_helles_volume, pilsner_volume, dunkel_volume
-
-    def save_orders(self, order_list: list):
-        """Saves order list to JSON file.
-
-        Args:
-            order_list (list): A list of the customer orders.
-        """
-        with open("resources/customer_orders.json", "w") as orders_file:
-            json.dump(order_list, orders_file, ensure_ascii=False, indent=4)
+    @timed
+    def save_orders(self):
+        """Saves the customer orders to the JSON file."""
+        self.orders.save()
 
+    @timed
     def update_inventory(self):
         """Updates the volumes in the inventory in the UI."""
-        (
-            _,
-            red_helles_volume,
-            pilsner_volume,
-            dunkel_volume,
-        ) = self.read_inventory()
-
-        # Shows the volume and number of bottles of Red Helles.
-        red_helles_quantity = int(red_helles_volume / 0.5)
-        self.lbl_red_helles_inv.setText(
-            "Organic Red Helles: "
-            + str(red_helles_volume)
-            + " L / "
-            + str(red_helles_quantity)
-            + " bottle(s)"
-        )
-
-        # Shows the volume and number of bottles of Pilsner.
-        pilsner_quantity = int(pilsner_volume / 0.5)
-        self.lbl_pilsner_inv.setText(
-            "Organic Pilsner: "
-            + str(pilsner_volume)
-            + " L / "
-            + str(pilsner_quantity)
-            + " bottle(s)"
-        )
-
-        # Shows the volume and number of bottles of Dunkel.
-        dunkel_quantity = int(dunkel_volume / 0.5)
-        self.lbl_dunkel_inv.setText(
-            "Organic Dunkel: "
-            + str(dunkel_volume)
-            + " L / "
-            + str(dunkel_quantity)
-            + " bottle(s)"
-        )
-
-    def add_inventory(self, inventory_list: list):
-        """Adds the given volume to the given beer in the inventory.
+        inventory_labels = [
+            self.lbl_red_helles_inv,
+            self.lbl_pilsner_inv,
+            self.lbl_dunkel_inv,
+        ]
+
+        # Shows the volume and number of bottles of each beer.
+        for beer, inventory_label in zip(BEERS, inventory_labels):
+            key = get_inventory_key(beer)
+            inventory_label.setText(
+                beer
+                + ": "
+                + str(self.inventory.get_volume(key))
+                + " L / "
+                + str(self.inventory.get_bottles(key))
+                + " bottle(s)"
+            )
 
-        Args:
-            inventory_list (list): List storing the volume for each beer.
-        """
+    @timed
+    def add_inventory(self):
+        """Adds the given volume to the given beer in the inventory."""
         # Gets the beer and volume inputs.
-        add_beer_input = self.combo_box_update_inv_recipe.currentText()
-        if add_beer_input == "Organic Red Helles":
-            add_beer = "red_helles"
-        elif add_beer_input == "Organic Pilsner":
-            add_beer = "pilsner"
-        elif add_beer_input == "Organic Dunkel":
-            add_beer = "dunkel"
+        add_beer = get_inventory_key(self.combo_box_update_inv_recipe.currentText())
         add_volume = self.line_edit_update_inv_volume.text()
 
         # Validates against null input.
         if add_volume != "":
             # Adds inputted volume to the selected beer.
-            for inventory in inventory_list:
-                if inventory["recipe"] == add_beer:
-                    inventory["volume"] += int(add_volume)
+            self.inventory.add_volume(add_beer, int(add_volume))
+            logging.info(
+                "Added %s L of %s to the inventory.",
+                add_volume,
+                add_beer,
+                extra={
+                    "operation": "add_inventory",
+                    "recipe": add_beer,
+                    "volume": int(add_volume),
+                },
+            )
 
             # Saves the new inventory to the JSON file.
-            self.save_inventory(inventory_list)
+            self.save_inventory()
             # Updates the volumes in the inventory in the UI.
             self.update_inventory()
 
-    def remove_inventory(self, inventory_list: list):
-        """Removes the given volume to the given beer in the inventory.
-
-        Args:
-            inventory_list (list): List storing the volume for each beer.
-        """
+    @timed
+    def remove_inventory(self):
+        """Removes the given volume to the given beer in the inventory."""
         # Gets the beer and volume inputs.
-        remove_beer_input = self.combo_box_update_inv_recipe.currentText()
-        if remove_beer_input == "Organic Red Helles":
-            remove_beer = "red_helles"
-        elif remove_beer_input == "Organic Pilsner":
-            remove_beer = "pilsner"
-        elif remove_beer_input == "Organic Dunkel":
-            remove_beer = "dunkel"
+        remove_beer = get_inventory_key(self.combo_box_update_inv_recipe.currentText())
         remove_volume = self.line_edit_update_inv_volume.text()
 
         # Validates against null input.
         if remove_volume != "":
             # Removes inputted volume to the selected beer.
-            for inventory in inventory_list:
-                if inventory["recipe"] == remove_beer:
-                    inventory["volume"] -= int(remove_volume)
+            self.inventory.add_volume(remove_beer, -int(remove_volume))
+            logging.info(
+                "Removed %s L of %s from the inventory.",
+                remove_volume,
+                remove_beer,
+                extra={
+                    "operation": "remove_inventory",
+                    "recipe": remove_beer,
+                    "volume": int(remove_volume),
+                },
+            )
 
             # Saves the new inventory to the JSON file.
-            self.save_inventory(inventory_list)
+            self.save_inventory()
             # Updates the volumes in the inventory in the UI.
             self.update_inventory()
 
-    def read_orders(self) -> list:
-        """Reads the customer orders from the JSON file and adds to UI.
-
-        Returns:
-            order_list (list): A list of the customer orders.
-        """
-        display_orders = ""
-
-        with open("resources/customer_orders.json", "r") as orders_file:
-            try:
-                order_list = json.load(orders_file)
-            except ValueError:
-                print("Empty JSON file")
-
-        # Iterates through the orders and adds their details to an order list.
-        for order in order_list:
-            display_orders += (
-                "Order ID: "
-                + order["order_id"]
-                + ", Beer Recipe: "
-                + order["order_recipe"]
-                + ", Order Volume: "
-                + str(order["order_volume"])
-                + " L \n"
-            )
+    @timed
+    def update_orders(self):
+        """Updates the customer orders displayed in the UI."""
+        display_orders = "".join(
+            "Order ID: "
+            + order["order_id"]
+            + ", Beer Recipe: "
+            + order["order_recipe"]
+            + ", Order Volume: "
+            + str(order["order_volume"])
+            + " L \n"
+            for order in self.orders
+        )
 
         # Displays list of orders in UI.
         self.lbl_orders.setText(display_orders.rstrip())
 
-        return order_list
-
-    def add_order(self, order_list: list):
-        """Adds customer order to the list.
-
-        Args:
-            order_list (list): A list of the customer orders.
-        """
+    @timed
+    def add_order(self):
+        """Adds customer order to the list."""
+        order_volume = ""
 
         # Gets the inputs for the new customer order.
         try:
@@ -236,81 +167,112 @@ class InventoryManagementDialog(QDialog, Ui_dialog_inv_management):
 
         # Validates against null inputs.
         if order_id != "" and str(order_volume) != "":
-            # Appends order to order list.
-            order = {
-                "order_id": order_id,
-                "order_recipe": order_recipe,
-                "order_volume": order_volume,
-            }
-            order_list.append(order)
+            # Validates against orders which have already been added.
+            if order_id in self.orders:
+                self.lbl_order_message.setText(
+                    "An order with this ID has already been added."
+                )
+                return
+
+            # Adds order to the customer orders.
+            self.orders.add(
+                {
+                    "order_id": order_id,
+                    "order_recipe": order_recipe,
+                    "order_volume": order_volume,
+                }
+            )
+            logging.info(
+                "Added order %s of %d L of %s.",
+                order_id,
+                order_volume,
+                order_recipe,
+                extra={
+                    "operation": "add_order",
+                    "recipe": order_recipe,
+                    "volume": order_volume,
+                },
+            )
 
-            # Saves order list to JSON file.
-            self.save_orders(order_list)
+            # Saves the customer orders to the JSON file.
+            self.save_orders()
 
             # Displays message to confirm their new order was added.
             self.lbl_order_message.setText("Order added successfully.")
 
             # Updates orders list in UI.
-            self.read_orders()
+            self.update_orders()
         else:
             # Displays message to notify their new order was unsuccessful.
             self.lbl_order_message.setText(
                 "This is not a valid order to add. " "Please add input in all fields."
             )
 
-    def dispatch_order(self, inventory_list: list, order_list: list):
-        """Dispatches customer order from the list.
-
-        Args:
-            inventory_list (list): List storing the volume for each beer.
-            order_list (list): A list of the customer orders.
-        """
-
-        try:
-            dispatch_order_id = self.line_edit_dispatch_order_id.text()
-        except (ValueError, TypeError):
-            pass
+    @timed
+    def dispatch_order(self):
+        """Dispatches the customer orders with the inputted IDs."""
+        dispatch_order_ids = [
+            order_id.strip()
+            for order_id in self.line_edit_dispatch_order_id.text().split(",")
+            if order_id.strip() != ""
+        ]
 
         # Validates against null input.
-        if dispatch_order_id != "":
-            # Checks for the order in the order list.
-            for order in order_list:
-                if dispatch_order_id == order["order_id"]:
-                    for inventory in inventory_list:
-                        # Subtracts volume of beer from order from inventory.
-                        if (
-                            (
-                                order["order_recipe"] == "Organic Red Helles"
-                                and inventory["recipe"] == "red_helles"
-                            )
-                            or (
-                                order["order_recipe"] == "Organic Pilsner"
-                                and inventory["recipe"] == "pilsner"
-                            )
-                            or (
-                                order["order_recipe"] == "Organic Dunkel"
-                                and inventory["recipe"] == "dunkel"
-                            )
-                        ):
-                            inventory["volume"] -= order["order_volume"]
-
-                    # Removes order from the order list.
-                    order_list.remove(order)
-
-                    # Saves order list to JSON file.
-                    self.save_orders(order_list)
-                    # Displays message to say dispatch was successful.
-                    self.lbl_order_message.setText("Order dispatched " "successfully.")
-                    # Updates orders list in UI.
-                    self.read_orders()
-                    # Saves the new inventory to the JSON file.
-                    self.save_inventory(inventory_list)
-                    # Updates the volumes in the inventory in the UI.
-                    self.update_inventory()
-        else:
+        if not dispatch_order_ids:
             # Displays message to say dispatch was unsuccessful.
             self.lbl_order_message.setText(
                 "This is not a valid order to "
                 "dispatch. Please input the order "
                 "ID."
             )
+            return
+
+        self.dispatch_order_ids(dispatch_order_ids)
+
+    @timed
+    def dispatch_recipe_orders(self):
+        """Dispatches every customer order of the selected beer."""
+        dispatch_recipe = self.combo_box_dispatch_recipe.currentText()
+        dispatch_order_ids = [
+            order["order_id"]
+            for order in self.orders.get_recipe_orders(dispatch_recipe)
+        ]
+
+        # Validates against a beer without any orders.
+        if not dispatch_order_ids:
+            self.lbl_order_message.setText(
+                "There are no orders of " + dispatch_recipe + " to dispatch."
+            )
+            return
+
+        self.dispatch_order_ids(dispatch_order_ids)
+
+    def dispatch_order_ids(self, order_ids: list):
+        """Dispatches customer orders together, or none of them if any fails.
+
+        Args:
+            order_ids (list): IDs of the orders to dispatch.
+        """
+        try:
+            dispatched_orders = dispatch_orders(self.orders, self.inventory, order_ids)
+        except ValueError as error:
+            # Displays message to say dispatch was unsuccessful.
+            self.lbl_order_message.setText("No orders were dispatched. " + str(error))
+            return
+
+        # Saves the new inventory before the customer orders, so a failure in
+        # between leaves orders which are still open rather than orders which
+        # were dispatched without their beer being taken from the inventory.
+        self.save_inventory()
+        self.save_orders()
+        # Displays message to say dispatch was successful.
+        if len(dispatched_orders) == 1:
+            self.lbl_order_message.setText("Order dispatched successfully.")
+        else:
+            self.lbl_order_message.setText(
+                str(len(dispatched_orders)) + " orders dispatched successfully."
+            )
+        # Updates orders list in UI.
+        self.update_orders()
+        # Updates the volumes in the inventory in the UI.
+        self.update_inventory()
@@ -0,0 +1,120 @@
+"""
+The inventory of Barnaby's Brewhouse, holding the volume of each beer keyed by
+its recipe. The inventory file is read once, and the same store is shared by
+inventory management, process monitoring, and the production advice, so the
+volume of a beer is looked up directly instead of reading the file and
+searching it on every refresh. Changes are written back to the file when they
+are saved.
+"""
+
+import json
+import os
+from typing import Dict, List
+
+from src.recipes import BEERS, INVENTORY_KEYS
+
+INVENTORY_PATH = "resources/inventory.json"
+# Volume (L) of each bottle of beer.
+BOTTLE_VOLUME = 0.5
+
+
+class InventoryStore:
+    """Volume of each beer in the inventory, keyed by its inventory key."""
+
+    def __init__(self, inventory_path: str = INVENTORY_PATH):
+        """Reads the inventory from its JSON file.
+
+        Args:
+            inventory_path (str): Path of the inventory JSON file.
+        """
+        self.inventory_path = inventory_path
+        self.volumes: Dict[str, int] = {}
+        self.load()
+
+    def load(self):
+        """Reads the volume of each beer from the JSON file."""
+        with open(self.inventory_path, "r") as inventory_file:
+            try:
+                inventory_list = json.load(inventory_file)
+            except ValueError:
+                print("Empty JSON file.")
+                inventory_list = []
+
+        self.volumes = {
+            inventory["recipe"]: int(inventory["volume"])
+            for inventory in inventory_list
+        }
+        # Beers missing from the file have none in stock.
+        for beer in BEERS:
+            self.volumes.setdefault(INVENTORY_KEYS[beer], 0)
+
+    def save(self):
+        """Saves the volume of each beer to the JSON file."""
+        inventory_list = [
+            {"recipe": key, "volume": volume} for key, volume in self.volumes.items()
+        ]
+        # Writes to a temporary file first so a partial file is never left.
+        temp_path = self.inventory_path + ".tmp"
+        with open(temp_path, "w") as inventory_file:
+            json.dump(inventory_list, inventory_file, ensure_ascii=False, indent=4)
+        os.replace(temp_path, self.inventory_path)
+
+    def get_volume(self, key: str) -> int:
+        """Gets the volume of a beer in the inventory.
+
+        Args:
+            key (str): Inventory key of the beer, such as 'pilsner'.
+
+        Returns:
+            volume (int): Volume (L) of the beer.
+        """
+        return self.volumes.get(key, 0)
+
+    def get_bottles(self, key: str) -> int:
+        """Gets the number of bottles of a beer in the inventory.
+
+        Args:
+            key (str): Inventory key of the beer, such as 'pilsner'.
+
+        Returns:
+            bottles (int): Number of full bottles of the beer.
+        """
+        return int(self.get_volume(key) / BOTTLE_VOLUME)
+
+    def add_volume(self, key: str, volume: int):
+        """Adds a volume of a beer to the inventory, without saving it.
+
+        Args:
+            key (str): Inventory key of the beer, such as 'pilsner'.
+            volume (int): Volume (L) to add, or a negative volume to remove.
+        """
+        self.volumes[key] = self.get_volume(key) + volume
+
+    def get_beer_volumes(self) -> List[int]:
+        """Gets the volume of each beer, in the order the beers are shown.
+
+        Returns:
+            volumes (List[int]): Volume (L) of each beer in BEERS.
+        """
+        return [self.get_volume(INVENTORY_KEYS[beer]) for beer in BEERS]
+
+
+# Store of each inventory file (by absolute path), shared by every module which
+# reads it.
+INVENTORY_STORES: Dict[str, InventoryStore] = {}
+
+
+def get_inventory_store(inventory_path: str = INVENTORY_PATH) -> InventoryStore:
+    """Gets the shared store of an inventory file, reading it the first time.
+
+    Args:
+        inventory_path (str): Path of the inventory JSON file.
+
+    Returns:
+        inventory_store (InventoryStore): Store of the inventory file.
+    """
+    absolute_path = os.path.abspath(inventory_path)
+    if absolute_path not in INVENTORY_STORES:
+        INVENTORY_STORES[absolute_path] = InventoryStore(absolute_path)
+
+    return INVENTORY_STORES[absolute_path]
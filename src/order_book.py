@@ -0,0 +1,217 @@
+"""
+The customer orders of Barnaby's Brewhouse, indexed by their order ID and by
+their beer recipe. The orders file is read once, and an order is found, added,
+or removed directly by its ID instead of searching the list of orders, so
+dispatching an order stays quick however many orders are open. Changes are
+written back to the file when they are saved.
+
+Dispatched orders are removed from the book, so every order in it is open.
+Several orders are dispatched at once by taking all of their beer from the
+inventory in memory, so the orders and inventory are each saved once however
+many orders are dispatched.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from src.inventory import InventoryStore
+from src.recipes import RECIPE_NAMES, get_inventory_key
+
+ORDERS_PATH = "resources/customer_orders.json"
+
+
+class OrderBook:
+    """Open customer orders by order ID, with the IDs of each recipe's orders."""
+
+    def __init__(self, orders_path: str = ORDERS_PATH):
+        """Reads the customer orders from their JSON file.
+
+        Args:
+            orders_path (str): Path of the customer orders JSON file.
+        """
+        self.orders_path = orders_path
+        self.orders: Dict[str, dict] = {}
+        # IDs of the orders of each recipe, in the order they were added.
+        self.recipe_order_ids: Dict[str, Dict[str, None]] = {}
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self.orders
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.orders.values())
+
+    def load(self):
+        """Reads the customer orders from the JSON file."""
+        with open(self.orders_path, "r") as orders_file:
+            try:
+                order_list = json.load(orders_file)
+            except ValueError:
+                print("Empty JSON file.")
+                order_list = []
+
+        self.orders = {}
+        self.recipe_order_ids = {}
+        for order in order_list:
+            if order["order_id"] in self.orders:
+                logging.warning(
+                    "Ignored a second order with the ID %s.", order["order_id"]
+                )
+                continue
+            self.add(order)
+
+    def save(self):
+        """Saves the customer orders to the JSON file."""
+        # Writes to a temporary file first so a partial file is never left.
+        temp_path = self.orders_path + ".tmp"
+        with open(temp_path, "w") as orders_file:
+            json.dump(
+                list(self.orders.values()), orders_file, ensure_ascii=False, indent=4
+            )
+        os.replace(temp_path, self.orders_path)
+
+    def get(self, order_id: str) -> Optional[dict]:
+        """Gets an order by its ID.
+
+        Args:
+            order_id (str): ID of the order.
+
+        Returns:
+            order (Optional[dict]): The order, or None if there is no order
+                                    with the ID.
+        """
+        return self.orders.get(order_id)
+
+    def get_recipe_orders(self, recipe: str) -> List[dict]:
+        """Gets the orders of a beer recipe.
+
+        Args:
+            recipe (str): Name of the beer recipe, such as 'Organic Pilsner'.
+
+        Returns:
+            orders (List[dict]): Orders of the recipe, oldest first.
+        """
+        return [
+            self.orders[order_id] for order_id in self.recipe_order_ids.get(recipe, {})
+        ]
+
+    def add(self, order: dict):
+        """Adds an order to the book, without saving it.
+
+        Args:
+            order (dict): Order with an order ID, recipe, and volume.
+        """
+        if order["order_id"] in self.orders:
+            raise ValueError(
+                "An order with the ID " + order["order_id"] + " already exists."
+            )
+
+        self.orders[order["order_id"]] = order
+        self.recipe_order_ids.setdefault(order["order_recipe"], {})[
+            order["order_id"]
+        ] = None
+
+    def remove(self, order_id: str) -> dict:
+        """Removes an order from the book, without saving it.
+
+        Args:
+            order_id (str): ID of the order.
+
+        Returns:
+            order (dict): The removed order.
+        """
+        order = self.orders.pop(order_id)
+        del self.recipe_order_ids[order["order_recipe"]][order_id]
+
+        return order
+
+
+# Book of each orders file (by absolute path), shared by every module which
+# reads it.
+ORDER_BOOKS: Dict[str, OrderBook] = {}
+
+
+def get_order_book(orders_path: str = ORDERS_PATH) -> OrderBook:
+    """Gets the shared book of an orders file, reading it the first time.
+
+    Args:
+        orders_path (str): Path of the customer orders JSON file.
+
+    Returns:
+        order_book (OrderBook): Book of the orders file.
+    """
+    absolute_path = os.path.abspath(orders_path)
+    if absolute_path not in ORDER_BOOKS:
+        ORDER_BOOKS[absolute_path] = OrderBook(absolute_path)
+
+    return ORDER_BOOKS[absolute_path]
+
+
+def dispatch_orders(
+    order_book: OrderBook, inventory: InventoryStore, order_ids: Sequence[str]
+) -> List[dict]:
+    """Dispatches orders, removing them and taking their beer from the inventory.
+
+    Every order is checked before any is dispatched, so either all of the
+    orders are dispatched or none of them are. Neither the orders nor the
+    inventory are saved.
+
+    Args:
+        order_book (OrderBook): Open customer orders.
+        inventory (InventoryStore): Inventory the beer is taken from.
+        order_ids (Sequence[str]): IDs of the orders to dispatch.
+
+    Returns:
+        dispatched_orders (List[dict]): The dispatched orders.
+
+    Raises:
+        ValueError: If there is no order with one of the IDs, or the inventory
+                    does not have enough of a beer for the orders.
+    """
+    order_ids = list(dict.fromkeys(order_ids))
+    missing_ids = [order_id for order_id in order_ids if order_id not in order_book]
+    if missing_ids:
+        raise ValueError(
+            "There is no order with the ID " + ", ".join(missing_ids) + "."
+        )
+
+    # Sums the volume of each beer in the orders, and checks it is in stock.
+    orders = [order_book.get(order_id) for order_id in order_ids]
+    order_volumes: Dict[str, int] = {}
+    for order in orders:
+        key = get_inventory_key(order["order_recipe"])
+        order_volumes[key] = order_volumes.get(key, 0) + order["order_volume"]
+    for key, volume in order_volumes.items():
+        if volume > inventory.get_volume(key):
+            raise ValueError(
+                "There is not enough "
+                + RECIPE_NAMES[key]
+                + " in the inventory for these orders: "
+                + str(volume)
+                + " L ordered, "
+                + str(inventory.get_volume(key))
+                + " L in stock."
+            )
+
+    for order in orders:
+        order_book.remove(order["order_id"])
+        logging.info(
+            "Dispatched order %s of %d L of %s.",
+            order["order_id"],
+            order["order_volume"],
+            order["order_recipe"],
+            extra={
+                "operation": "dispatch_order",
+                "recipe": order["order_recipe"],
+                "volume": order["order_volume"],
+            },
+        )
+    for key, volume in order_volumes.items():
+        inventory.add_volume(key, -volume)
+
+    return orders
@@ -5,13 +5,22 @@ and abort existing processes.
 """
 
 import json
+import logging
 from datetime import datetime
 from time import localtime, strftime, time
 
 from PyQt5.QtGui import QIntValidator
 from PyQt5.QtWidgets import QDialog
 
-from src.inv_management import InventoryManagementDialog
+from src.instrumentation import timed
+from src.inventory import get_inventory_store
+from src.production_plan import (
+    CONDITIONING_DURATION,
+    FERMENTATION_DURATION,
+    HOT_BREW_DURATION,
+    get_bottling_duration,
+)
+from src.recipes import BEERS, get_inventory_key
 from src.setup.process_monitoring_setup import Ui_dialog_monitoring
 
 
@@ -26,6 +35,28 @@ def remove_used_processes(process_list: list):
             process_list.remove(existing_process)
 
 
+def log_process(operation: str, action: str, process: dict):
+    """Logs an action on a process with its recipe and volume.
+
+    Args:
+        operation (str): Name of the operation, such as 'start_fermentation'.
+        action (str): Description of the action, such as 'Started fermentation'.
+        process (dict): Process the action was taken on.
+    """
+    logging.info(
+        "%s of %d L of %s.",
+        action,
+        process["volume"],
+        process["recipe"],
+        extra={
+            "operation": operation,
+            "recipe": process["recipe"],
+            "volume": process["volume"],
+        },
+    )
+
+
+@timed
 def save_tanks(tank_list: list):
     """Saves the updated tank list to the JSON file.
 
@@ -36,6 +67,7 @@ def save_tanks(tank_list: list):
         json.dump(tank_list, tanks_file, ensure_ascii=False, indent=4)
 
 
+@timed
 def save_processes(process_list: list):
     """Saves the updated process list to the JSON file.
 
@@ -95,6 +127,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
         # Updates the process list in the UI.
         self.update_processes()
 
+    @timed
     def read_processes(self) -> list:
         """Reads the JSON file for the list of ongoing processes.
 
@@ -109,6 +142,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
 
         return process_list
 
+    @timed
     def read_tanks(self) -> list:
         """Reads the JSON file for the list showing tank availability.
 
@@ -142,19 +176,10 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
         # Gives advice on beer to brew if there's an empty tank.
         if any_empty_tank is True:
             # Finds the least stocked beer in inventory.
-            (
-                _,
-                red_helles_volume,
-                pilsner_volume,
-                dunkel_volume,
-            ) = InventoryManagementDialog.read_inventory(self)
-            smallest_volume = min(red_helles_volume, pilsner_volume, dunkel_volume)
-            if smallest_volume == red_helles_volume:
-                recommend_brew = "Organic Red Helles"
-            elif smallest_volume == pilsner_volume:
-                recommend_brew = "Organic Pilsner"
-            elif smallest_volume == dunkel_volume:
-                recommend_brew = "Organic Dunkel"
+            inventory = get_inventory_store()
+            recommend_brew = min(
+                BEERS, key=lambda beer: inventory.get_volume(get_inventory_key(beer))
+            )
 
             # Recommends the beer with the lowest stock.
             message = (
@@ -167,6 +192,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
 
         return tank_list
 
+    @timed
     def update_tanks(self):
         """Updates the tank availability displayed in the UI."""
         display_tanks = ""
@@ -187,6 +213,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
         # Displays list of tank availability in UI.
         self.lbl_tanks.setText(display_tanks.rstrip())
 
+    @timed
     def update_processes(self):
         """Updates the process list in the UI."""
         display_processes = ""
@@ -211,20 +238,17 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
         # Displays list of process details in UI.
         self.lbl_processes.setText(display_processes.rstrip())
 
+    @timed
     def send_bottles_to_inventory(self, process_list: list):
         """Removes finished bottling from process list and adds to inventory.
 
         Args:
             process_list (list): A list of ongoing processes.
         """
-        (
-            inventory_list,
-            _,
-            _,
-            _,
-        ) = InventoryManagementDialog.read_inventory(self)
-
-        for existing_process in process_list:
+        inventory = get_inventory_store()
+
+        # Goes through a copy, as finished processes are removed from the list.
+        for existing_process in list(process_list):
             if (
                 existing_process["process"] == "Bottling"
                 and datetime.strptime(
@@ -233,24 +257,17 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
                 <= datetime.now()
             ):
                 # Adds the bottled volume of relevant beer to the inventory.
-                for inventory in inventory_list:
-                    if (
-                        existing_process["recipe"] == "Organic Red Helles"
-                        and inventory["recipe"] == "red_helles"
-                    ):
-                        inventory["volume"] += existing_process["volume"]
-                    elif (
-                        existing_process["recipe"] == "Organic Pilsner"
-                        and inventory["recipe"] == "pilsner"
-                    ):
-                        inventory["volume"] += existing_process["volume"]
-                    elif (
-                        existing_process["recipe"] == "Organic Dunkel"
-                        and inventory["recipe"] == "pilsner"
-                    ):
-                        inventory["volume"] += existing_process["volume"]
+                inventory.add_volume(
+                    get_inventory_key(existing_process["recipe"]),
+                    existing_process["volume"],
+                )
                 # Removes finished bottling process from process list.
                 process_list.remove(existing_process)
+                log_process(
+                    "send_bottles_to_inventory",
+                    "Sent bottles to the inventory",
+                    existing_process,
+                )
 
                 # Displays confirmation message of successful action.
                 self.lbl_process_message.setText(
@@ -258,12 +275,13 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
                 )
 
         # Saves the newly updated inventory.
-        InventoryManagementDialog.save_inventory(inventory_list)
+        inventory.save()
         # Saves the updated process list to the JSON file.
         save_processes(process_list)
         # Updates the process list in the UI.
         self.update_processes()
 
+    @timed
     def start_hot_brew(self, process_list: list):
         """Starts a hot brew for the given recipe and volume.
 
@@ -282,7 +300,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
         # Validates against null input.
         if str(new_volume) != "":
             # Sets the completion date to three hours later.
-            epoch_time = time() + 10800
+            epoch_time = time() + HOT_BREW_DURATION.total_seconds()
             completion_date = strftime("%d/%m/%Y %H:%M:%S", localtime(epoch_time))
 
             # Creates the process dictionary.
@@ -296,6 +314,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
 
             # Appends the process to the process list.
             process_list.append(dict(process))
+            log_process("start_hot_brew", "Started hot brew", process)
 
             # Displays confirmation message of successful action.
             self.lbl_process_message.setText("Hot brew successfully started.")
@@ -305,6 +324,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
             # Updates the process list in the UI.
             self.update_processes()
 
+    @timed
     def start_fermentation(self, tank_list: list, process_list: list):
         """Starts fermentation for the given recipe, tank, and volume.
 
@@ -325,7 +345,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
         # Validates against null input.
         if str(new_volume) != "":
             # Sets the completion date to four weeks later.
-            epoch_time = time() + 2419200
+            epoch_time = time() + FERMENTATION_DURATION.total_seconds()
             completion_date = strftime("%d/%m/%Y %H:%M:%S", localtime(epoch_time))
 
             # Creates the process dictionary.
@@ -364,6 +384,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
 
                     # Removes volume from the prerequisite process.
                     existing_process["volume"] -= new_volume
+                    log_process("start_fermentation", "Started fermentation", process)
 
                     # Displays confirmation message of successful action.
                     self.lbl_process_message.setText(
@@ -382,6 +403,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
             # Updates the process list in the UI.
             self.update_processes()
 
+    @timed
     def start_conditioning(self, tank_list: list, process_list: list):
         """Starts conditioning for the given recipe, tank, and volume.
 
@@ -402,7 +424,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
         # Validates against null input.
         if str(new_volume) != "":
             # Sets the completion date to two weeks later.
-            epoch_time = time() + 1209600
+            epoch_time = time() + CONDITIONING_DURATION.total_seconds()
             completion_date = strftime("%d/%m/%Y %H:%M:%S", localtime(epoch_time))
 
             # Creates the process dictionary.
@@ -444,6 +466,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
 
                     # Removes volume from the prerequisite process.
                     existing_process["volume"] -= new_volume
+                    log_process("start_conditioning", "Started conditioning", process)
 
                     # Displays confirmation message of successful action.
                     self.lbl_process_message.setText(
@@ -462,6 +485,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
             # Updates the process list in the UI.
             self.update_processes()
 
+    @timed
     def start_bottling(self, tank_list: list, process_list: list):
         """Starts bottling for the given recipe and volume.
 
@@ -481,7 +505,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
         # Validates against null input.
         if str(new_volume) != "":
             # Sets the completion date to 10 minutes per bottle later.
-            epoch_time = time() + ((new_volume / 0.5) * 600)
+            epoch_time = time() + get_bottling_duration(new_volume).total_seconds()
             completion_date = strftime("%d/%m/%Y %H:%M:%S", localtime(epoch_time))
 
             # Creates the process dictionary.
@@ -514,6 +538,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
 
                     # Removes volume from the prerequisite process.
                     existing_process["volume"] -= new_volume
+                    log_process("start_bottling", "Started bottling", process)
 
                     # Displays confirmation message of successful action.
                     self.lbl_process_message.setText(
@@ -532,6 +557,7 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
             # Updates the process list in the UI.
             self.update_processes()
 
+    @timed
     def abort_process(self, tank_list: list, process_list: list):
         """Aborts the given process and removes it from the process list.
 
@@ -569,6 +595,9 @@ class ProcessMonitoringDialog(QDialog, Ui_dialog_monitoring):
 
                     # Removes selected process to abort.
                     process_list.remove(existing_process)
+                    log_process(
+                        "abort_process", "Aborted " + abort_process, existing_process
+                    )
 
                     # Displays confirmation message of successful action.
                     self.lbl_process_message.setText("Process " "successfully aborted.")
@@ -0,0 +1,116 @@
+"""
+Calculations on the production of beer in Barnaby's Brewhouse. The volume of
+each beer in the inventory and in ongoing production processes is compared with
+the predicted demand, to recommend which beer should be produced next. None of
+these calculations depend on the user interface, so they can also be run
+without it.
+"""
+
+import json
+from typing import Tuple
+
+import pandas
+
+from src.inventory import INVENTORY_PATH, get_inventory_store
+from src.recipes import BEERS
+
+PROCESSES_PATH = "resources/ongoing_processes.json"
+
+
+def read_inventory_volumes(inventory_path: str = INVENTORY_PATH) -> pandas.Series:
+    """Reads the volume of each beer in the inventory.
+
+    Args:
+        inventory_path (str): Path of the inventory JSON file.
+
+    Returns:
+        inventory_volumes (pandas.Series): Volume (L) of each beer.
+    """
+    return pandas.Series(
+        get_inventory_store(inventory_path).get_beer_volumes(), index=BEERS
+    )
+
+
+def read_production_volumes(processes_path: str = PROCESSES_PATH) -> pandas.Series:
+    """Reads the volume of each beer in ongoing production processes.
+
+    Args:
+        processes_path (str): Path of the ongoing processes JSON file.
+
+    Returns:
+        production_volumes (pandas.Series): Volume (L) of each beer being
+                                            produced.
+    """
+    with open(processes_path, "r") as process_file:
+        process_list = json.load(process_file)
+
+    # Sums the volume of each beer currently in production processes.
+    production_volumes = pandas.Series(0, index=BEERS)
+    for process in process_list:
+        if process["recipe"] in production_volumes.index:
+            production_volumes[process["recipe"]] += int(process["volume"])
+
+    return production_volumes
+
+
+def get_production_advice(
+    predicted_sales: pandas.Series,
+    inventory_volumes: pandas.Series,
+    production_volumes: pandas.Series,
+) -> Tuple[pandas.Series, str]:
+    """Recommends the next beer to produce based on predicted demand.
+
+    Args:
+        predicted_sales (pandas.Series): Predicted sales of each beer.
+        inventory_volumes (pandas.Series): Volume (L) of each beer in the
+                                           inventory.
+        production_volumes (pandas.Series): Volume (L) of each beer being
+                                            produced.
+
+    Returns:
+        deficits (pandas.Series): Deficit in volume (L) of each beer.
+        recommendation (str): The beer with the largest deficit.
+    """
+    # Calculates the deficit in volume of each beer.
+    deficits = (
+        predicted_sales[BEERS] - inventory_volumes[BEERS] - production_volumes[BEERS]
+    ).astype("int64")
+
+    # Recommends producing the beer with the largest volume deficit.
+    return deficits, str(deficits.idxmax())
+
+
+def get_production_table(
+    predicted_sales: pandas.Series,
+    inventory_path: str = INVENTORY_PATH,
+    processes_path: str = PROCESSES_PATH,
+) -> Tuple[pandas.core.frame.DataFrame, str]:
+    """Calculates the deficit of each beer from the inventory and processes.
+
+    Args:
+        predicted_sales (pandas.Series): Predicted sales of each beer.
+        inventory_path (str): Path of the inventory JSON file.
+        processes_path (str): Path of the ongoing processes JSON file.
+
+    Returns:
+        production_table (pandas.core.frame.DataFrame): Predicted sales,
+                                                        inventory volume,
+                                                        production volume, and
+                                                        deficit of each beer.
+        recommendation (str): The beer with the largest deficit.
+    """
+    inventory_volumes = read_inventory_volumes(inventory_path)
+    production_volumes = read_production_volumes(processes_path)
+    deficits, recommendation = get_production_advice(
+        predicted_sales, inventory_volumes, production_volumes
+    )
+    production_table = pandas.DataFrame(
+        {
+            "predicted_sales": predicted_sales[BEERS].astype("int64"),
+            "inventory_volume": inventory_volumes,
+            "production_volume": production_volumes,
+            "deficit": deficits,
+        }
+    )
+
+    return production_table, recommendation
@@ -0,0 +1,321 @@
+"""
+Plans the brews which Barnaby's Brewhouse should start to cover the deficit of
+each beer. Every brew goes through a hot brew, fermentation in a fermenter
+tank, conditioning in a conditioner tank, and bottling, so the number of brews
+which can be ready in time is limited by the tanks. The planner allocates the
+tanks greedily: it brews the beer with the largest remaining deficit in the
+pair of tanks which can hold the largest brew that is bottled in time, until
+either every deficit is covered or no more brews can be bottled before the end
+of the plan. The cause of each deficit which is left is reported: either the
+tanks are full, or a brew could not be bottled before the end of the plan even
+in empty tanks.
+"""
+
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+TANKS_ORIGINAL_PATH = "resources/tanks_original.json"
+PROCESSES_PATH = "resources/ongoing_processes.json"
+COMPLETION_FORMAT = "%d/%m/%Y %H:%M:%S"
+
+# Durations of the stages of producing beer.
+HOT_BREW_DURATION = timedelta(hours=3)
+FERMENTATION_DURATION = timedelta(weeks=4)
+CONDITIONING_DURATION = timedelta(weeks=2)
+# Bottling takes 10 minutes for each bottle of 0.5 L.
+BOTTLE_VOLUME = 0.5
+BOTTLING_DURATION_PER_BOTTLE = timedelta(minutes=10)
+# Causes of a deficit which the plan does not cover.
+SHORTFALL_TANKS_FULL = "tanks_full"
+SHORTFALL_TOO_LATE = "too_late"
+
+
+def get_bottling_duration(volume: int) -> timedelta:
+    """Calculates how long it takes to bottle a volume of beer.
+
+    Args:
+        volume (int): Volume (L) of beer to bottle.
+
+    Returns:
+        bottling_duration (timedelta): Time taken to bottle the beer.
+    """
+    return BOTTLING_DURATION_PER_BOTTLE * (volume / BOTTLE_VOLUME)
+
+
+def read_tank_capacities(
+    tanks_path: str = TANKS_ORIGINAL_PATH,
+) -> Dict[str, Tuple[int, str]]:
+    """Reads the full volume and capability of each tank.
+
+    Args:
+        tanks_path (str): Path of the JSON file of empty tanks.
+
+    Returns:
+        tank_capacities (Dict[str, Tuple[int, str]]): Volume (L) and capability
+                                                      of each tank.
+    """
+    with open(tanks_path, "r") as tanks_file:
+        tank_list = json.load(tanks_file)
+
+    return {
+        tank["tank"]: (int(tank["volume"]), tank["capability"]) for tank in tank_list
+    }
+
+
+def get_tank_free_times(
+    tank_capacities: Dict[str, Tuple[int, str]],
+    process_list: list,
+    start: datetime,
+) -> Dict[str, datetime]:
+    """Calculates when each tank will be free of the ongoing processes.
+
+    A tank which is fermenting beer is assumed to also condition it if it is
+    able to, as the beer will need conditioning once it has fermented.
+
+    Args:
+        tank_capacities (Dict[str, Tuple[int, str]]): Volume (L) and capability
+                                                      of each tank.
+        process_list (list): A list of ongoing processes.
+        start (datetime): Time the plan starts.
+
+    Returns:
+        tank_free_times (Dict[str, datetime]): Time each tank will be free.
+    """
+    tank_free_times = {tank: start for tank in tank_capacities}
+
+    for process in process_list:
+        if process["tank"] not in tank_free_times:
+            continue
+
+        free_time = datetime.strptime(process["completion"], COMPLETION_FORMAT)
+        _, capability = tank_capacities[process["tank"]]
+        if process["process"] == "Fermentation" and "Conditioner" in capability:
+            free_time += CONDITIONING_DURATION
+        tank_free_times[process["tank"]] = max(
+            tank_free_times[process["tank"]], free_time
+        )
+
+    return tank_free_times
+
+
+def schedule_brew(
+    recipe: str,
+    volume: int,
+    fermenter: str,
+    conditioner: str,
+    tank_free_times: Dict[str, datetime],
+    hot_brew_free_time: datetime,
+    bottling_free_time: datetime,
+) -> dict:
+    """Schedules each stage of a brew as early as the tanks allow.
+
+    The hot brew and bottling equipment are used by one brew at a time, and a
+    brew waits in its fermenter until its conditioner is free.
+
+    Args:
+        recipe (str): Beer recipe to brew.
+        volume (int): Volume (L) to brew.
+        fermenter (str): Tank to ferment the beer in.
+        conditioner (str): Tank to condition the beer in, which may be the
+                           fermenter.
+        tank_free_times (Dict[str, datetime]): Time each tank will be free.
+        hot_brew_free_time (datetime): Time the hot brew equipment is free.
+        bottling_free_time (datetime): Time the bottling equipment is free.
+
+    Returns:
+        brew (dict): Recipe, volume, tanks, and start time of each stage of the
+                     brew, and the time it will be bottled.
+    """
+    brew_start = max(hot_brew_free_time, tank_free_times[fermenter] - HOT_BREW_DURATION)
+    fermentation_start = brew_start + HOT_BREW_DURATION
+    fermentation_end = fermentation_start + FERMENTATION_DURATION
+    if conditioner == fermenter:
+        conditioning_start = fermentation_end
+    else:
+        conditioning_start = max(fermentation_end, tank_free_times[conditioner])
+    bottling_start = max(conditioning_start + CONDITIONING_DURATION, bottling_free_time)
+
+    return {
+        "recipe": recipe,
+        "volume": volume,
+        "fermenter": fermenter,
+        "conditioner": conditioner,
+        "brew_start": brew_start,
+        "fermentation_start": fermentation_start,
+        "conditioning_start": conditioning_start,
+        "bottling_start": bottling_start,
+        "ready": bottling_start + get_bottling_duration(volume),
+    }
+
+
+def get_shortfall_cause(
+    recipe: str,
+    shortfall: int,
+    end: datetime,
+    tank_capacities: Dict[str, Tuple[int, str]],
+    start: datetime,
+) -> str:
+    """Finds why the plan does not cover the deficit of a beer.
+
+    Args:
+        recipe (str): Beer recipe which is short.
+        shortfall (int): Deficit in volume (L) of the beer which the plan does
+                         not cover.
+        end (datetime): Time the brews must be bottled by.
+        tank_capacities (Dict[str, Tuple[int, str]]): Volume (L) and capability
+                                                      of each tank.
+        start (datetime): Time the plan starts.
+
+    Returns:
+        cause (str): SHORTFALL_TANKS_FULL if a brew of the beer in empty tanks
+                     would be bottled in time, or SHORTFALL_TOO_LATE if it would
+                     not.
+    """
+    empty_tank_times = {tank: start for tank in tank_capacities}
+    for fermenter, (fermenter_volume, fermenter_capability) in tank_capacities.items():
+        if "Fermenter" not in fermenter_capability:
+            continue
+        for conditioner, (conditioner_volume, capability) in tank_capacities.items():
+            if "Conditioner" not in capability:
+                continue
+            brew = schedule_brew(
+                recipe,
+                min(shortfall, fermenter_volume, conditioner_volume),
+                fermenter,
+                conditioner,
+                empty_tank_times,
+                start,
+                start,
+            )
+            if brew["ready"] <= end:
+                return SHORTFALL_TANKS_FULL
+
+    return SHORTFALL_TOO_LATE
+
+
+def plan_production(
+    deficits: Dict[str, int],
+    end: datetime,
+    tank_capacities: Dict[str, Tuple[int, str]],
+    process_list: list,
+    start: Optional[datetime] = None,
+) -> Tuple[List[dict], Dict[str, int], Dict[str, str]]:
+    """Plans the brews which cover as much of the deficits as possible.
+
+    Args:
+        deficits (Dict[str, int]): Deficit in volume (L) of each beer.
+        end (datetime): Time the brews must be bottled by.
+        tank_capacities (Dict[str, Tuple[int, str]]): Volume (L) and capability
+                                                      of each tank.
+        process_list (list): A list of ongoing processes.
+        start (Optional[datetime]): Time the plan starts, or None for now.
+
+    Returns:
+        plan (List[dict]): Brews to start, in the order they start.
+        shortfalls (Dict[str, int]): Deficit in volume (L) of each beer which
+                                     the plan does not cover.
+        shortfall_causes (Dict[str, str]): Cause of each beer's deficit which
+                                           the plan does not cover.
+    """
+    start = datetime.now() if start is None else start
+    tank_free_times = get_tank_free_times(tank_capacities, process_list, start)
+    hot_brew_free_time = start
+    bottling_free_time = start
+    shortfalls = {recipe: max(int(deficit), 0) for recipe, deficit in deficits.items()}
+
+    fermenters = [
+        tank
+        for tank, (_, capability) in tank_capacities.items()
+        if "Fermenter" in capability
+    ]
+    conditioners = [
+        tank
+        for tank, (_, capability) in tank_capacities.items()
+        if "Conditioner" in capability
+    ]
+
+    plan = []
+    while shortfalls and max(shortfalls.values()) > 0:
+        # Brews the beer with the largest deficit which is left.
+        recipe = max(shortfalls, key=shortfalls.get)
+
+        # Finds the pair of tanks for the largest brew which is bottled before
+        # the end of the plan, preferring the brew which is bottled soonest.
+        best_brew = None
+        for fermenter in fermenters:
+            for conditioner in conditioners:
+                volume = min(
+                    shortfalls[recipe],
+                    tank_capacities[fermenter][0],
+                    tank_capacities[conditioner][0],
+                )
+                brew = schedule_brew(
+                    recipe,
+                    volume,
+                    fermenter,
+                    conditioner,
+                    tank_free_times,
+                    hot_brew_free_time,
+                    bottling_free_time,
+                )
+                if brew["ready"] <= end and (
+                    best_brew is None
+                    or (-volume, brew["ready"])
+                    < (-best_brew["volume"], best_brew["ready"])
+                ):
+                    best_brew = brew
+
+        # Stops once no more brews can be bottled before the end of the plan.
+        if best_brew is None:
+            break
+
+        plan.append(best_brew)
+        shortfalls[recipe] -= best_brew["volume"]
+        hot_brew_free_time = best_brew["fermentation_start"]
+        bottling_free_time = best_brew["ready"]
+        if best_brew["conditioner"] == best_brew["fermenter"]:
+            tank_free_times[best_brew["fermenter"]] = best_brew["bottling_start"]
+        else:
+            tank_free_times[best_brew["fermenter"]] = best_brew["conditioning_start"]
+            tank_free_times[best_brew["conditioner"]] = best_brew["bottling_start"]
+
+    plan.sort(key=lambda brew: brew["brew_start"])
+    shortfall_causes = {
+        recipe: get_shortfall_cause(recipe, shortfall, end, tank_capacities, start)
+        for recipe, shortfall in shortfalls.items()
+        if shortfall > 0
+    }
+
+    return plan, shortfalls, shortfall_causes
+
+
+def read_production_plan(
+    deficits: Dict[str, int],
+    end: datetime,
+    tanks_path: str = TANKS_ORIGINAL_PATH,
+    processes_path: str = PROCESSES_PATH,
+    start: Optional[datetime] = None,
+) -> Tuple[List[dict], Dict[str, int], Dict[str, str]]:
+    """Plans the brews with the tanks and ongoing processes in the JSON files.
+
+    Args:
+        deficits (Dict[str, int]): Deficit in volume (L) of each beer.
+        end (datetime): Time the brews must be bottled by.
+        tanks_path (str): Path of the JSON file of empty tanks.
+        processes_path (str): Path of the ongoing processes JSON file.
+        start (Optional[datetime]): Time the plan starts, or None for now.
+
+    Returns:
+        plan (List[dict]): Brews to start, in the order they start.
+        shortfalls (Dict[str, int]): Deficit in volume (L) of each beer which
+                                     the plan does not cover.
+        shortfall_causes (Dict[str, str]): Cause of each beer's deficit which
+                                           the plan does not cover.
+    """
+    with open(processes_path, "r") as process_file:
+        process_list = json.load(process_file)
+
+    return plan_production(
+        deficits, end, read_tank_capacities(tanks_path), process_list, start
+    )
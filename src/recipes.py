@@ -0,0 +1,34 @@
+"""
+The beer recipes of Barnaby's Brewhouse. Each recipe has the name shown to the
+user and used in the sales data, orders, and processes, and the key it is
+stored under in the inventory. Every module maps between the two with this
+registry, so a recipe only has to be added in one place.
+"""
+
+from typing import Dict, List
+
+# Key of each beer in the inventory, in the order the beers are shown.
+INVENTORY_KEYS: Dict[str, str] = {
+    "Organic Red Helles": "red_helles",
+    "Organic Pilsner": "pilsner",
+    "Organic Dunkel": "dunkel",
+}
+BEERS: List[str] = list(INVENTORY_KEYS)
+# Name of the beer stored under each key in the inventory.
+RECIPE_NAMES: Dict[str, str] = {key: beer for beer, key in INVENTORY_KEYS.items()}
+
+
+def get_inventory_key(beer: str) -> str:
+    """Gets the key a beer is stored under in the inventory.
+
+    Args:
+        beer (str): Name of the beer recipe, such as 'Organic Pilsner'.
+
+    Returns:
+        inventory_key (str): Key of the beer in the inventory, such as
+                             'pilsner'.
+    """
+    try:
+        return INVENTORY_KEYS[beer]
+    except KeyError:
+        raise ValueError("Unknown beer recipe: " + beer) from None
@@ -0,0 +1,215 @@
+"""
+An index of the invoice number, gyle number, and recipe of every sale in the
+sales data, so that a sale which has already been uploaded can be rejected
+without searching the sales data. The index is saved in a file next to the
+sales data CSV file, with the size of the CSV file it covers. As sales are only
+ever appended to the CSV file, only the sales appended since the index was
+saved have to be read when it is loaded again.
+"""
+
+import io
+import logging
+import os
+import threading
+import zipfile
+from typing import Iterable, Optional, Tuple
+
+import numpy
+import pandas
+
+from src.sales_cache import SALES_COLUMNS, SALES_DATA_PATH, SALES_DTYPES
+
+SALE_KEYS_PATH = "resources/sales_data_keys.npz"
+# Increases whenever the layout of the index file changes.
+SALE_KEYS_VERSION = 1
+KEY_COLUMNS = ["Invoice Number", "Gyle Number", "Recipe"]
+# Lets one thread at a time write the index file, as the worker loading the
+# sales statistics and the upload dialog may both save it.
+SAVE_LOCK = threading.Lock()
+
+SaleKey = Tuple[int, int, str]
+
+
+def read_key_columns(
+    csv_path: str, offset: int = 0, end: Optional[int] = None
+) -> pandas.core.frame.DataFrame:
+    """Reads the invoice number, gyle number, and recipe of the sales in the
+    sales data CSV file.
+
+    Args:
+        csv_path (str): Path of the sales data CSV file.
+        offset (int): Position in the file to read from, which must be the
+                      start of a line after the header.
+        end (Optional[int]): Position in the file to read up to, or None to
+                             read to the end of the file.
+
+    Returns:
+        key_columns (pandas.core.frame.DataFrame): Key of each sale.
+    """
+    dtype = {column: SALES_DTYPES[column] for column in KEY_COLUMNS}
+    if offset == 0:
+        return pandas.read_csv(csv_path, usecols=KEY_COLUMNS, dtype=dtype)
+
+    with open(csv_path, "rb") as sales_file:
+        sales_file.seek(offset)
+        appended = sales_file.read(-1 if end is None else end - offset)
+
+    return pandas.read_csv(
+        io.BytesIO(appended),
+        header=None,
+        names=SALES_COLUMNS,
+        usecols=KEY_COLUMNS,
+        dtype=dtype,
+    )
+
+
+def get_sale_keys(data_frame: pandas.core.frame.DataFrame) -> Iterable[SaleKey]:
+    """Gets the key of each sale.
+
+    Args:
+        data_frame (pandas.core.frame.DataFrame): Sales with an invoice number,
+                                                  gyle number, and recipe.
+
+    Returns:
+        sale_keys (Iterable[SaleKey]): Invoice number, gyle number, and recipe
+                                       of each sale, in order.
+    """
+    return zip(
+        data_frame["Invoice Number"].astype("int64").tolist(),
+        data_frame["Gyle Number"].astype("int64").tolist(),
+        data_frame["Recipe"].astype(str).tolist(),
+    )
+
+
+class SaleKeyIndex:
+    """Hash set of the invoice number, gyle number, and recipe of every sale."""
+
+    def __init__(self, sale_keys: Iterable[SaleKey] = (), csv_size: int = 0):
+        """Builds the index from the keys of the sales.
+
+        Args:
+            sale_keys (Iterable[SaleKey]): Key of each sale.
+            csv_size (int): Size (bytes) of the CSV file the keys were read
+                            from.
+        """
+        self.sale_keys = set(sale_keys)
+        self.csv_size = csv_size
+
+    def __contains__(self, sale_key: SaleKey) -> bool:
+        return sale_key in self.sale_keys
+
+    def __len__(self) -> int:
+        return len(self.sale_keys)
+
+    def add(self, sale_key: SaleKey):
+        """Adds the key of an uploaded sale.
+
+        Args:
+            sale_key (SaleKey): Invoice number, gyle number, and recipe.
+        """
+        self.sale_keys.add(sale_key)
+
+    def add_sales(self, data_frame: pandas.core.frame.DataFrame):
+        """Adds the keys of a batch of uploaded sales.
+
+        Args:
+            data_frame (pandas.core.frame.DataFrame): Uploaded sales.
+        """
+        self.sale_keys.update(get_sale_keys(data_frame))
+
+    def find_duplicates(self, data_frame: pandas.core.frame.DataFrame) -> numpy.ndarray:
+        """Finds the sales in a batch which have already been uploaded, or
+        which appear earlier in the batch.
+
+        Args:
+            data_frame (pandas.core.frame.DataFrame): Batch of sales.
+
+        Returns:
+            duplicates (numpy.ndarray): Whether each sale is a duplicate.
+        """
+        seen = set()
+        duplicates = numpy.zeros(len(data_frame), dtype=bool)
+        for position, sale_key in enumerate(get_sale_keys(data_frame)):
+            duplicates[position] = sale_key in self.sale_keys or sale_key in seen
+            seen.add(sale_key)
+
+        return duplicates
+
+    def save(self, index_path: str = SALE_KEYS_PATH):
+        """Saves the index, with the size of the CSV file its keys were read
+        from.
+
+        Args:
+            index_path (str): Path of the index file.
+        """
+        invoices, gyles, recipes = (
+            zip(*self.sale_keys) if self.sale_keys else ((), (), ())
+        )
+        recipe_codes, recipe_names = pandas.factorize(pandas.Series(recipes, dtype=str))
+
+        # Writes to a temporary file first so a partial index is never read.
+        temp_path = index_path + ".tmp"
+        with SAVE_LOCK:
+            with open(temp_path, "wb") as index_file:
+                numpy.savez(
+                    index_file,
+                    version=numpy.array(SALE_KEYS_VERSION),
+                    csv_size=numpy.array(self.csv_size),
+                    invoice=numpy.array(invoices, dtype="int64"),
+                    gyle=numpy.array(gyles, dtype="int64"),
+                    recipe_codes=recipe_codes.astype("int16"),
+                    recipe_names=numpy.asarray(recipe_names, dtype=str),
+                )
+            os.replace(temp_path, index_path)
+
+    @classmethod
+    def load(
+        cls, csv_path: str = SALES_DATA_PATH, index_path: str = SALE_KEYS_PATH
+    ) -> "SaleKeyIndex":
+        """Loads the index, adding any sales appended to the CSV file since it
+        was saved, or rebuilds it from the CSV file if it cannot be used.
+
+        Args:
+            csv_path (str): Path of the sales data CSV file.
+            index_path (str): Path of the index file.
+
+        Returns:
+            sale_key_index (SaleKeyIndex): Index of every sale in the CSV file.
+        """
+        # Records the size before reading, so a sale appended while the keys
+        # are read is read again next time rather than being missed.
+        csv_size = os.stat(csv_path).st_size
+        sale_key_index = None
+
+        try:
+            with numpy.load(index_path) as index_file:
+                if int(index_file["version"]) == SALE_KEYS_VERSION:
+                    sale_key_index = cls(
+                        zip(
+                            index_file["invoice"].tolist(),
+                            index_file["gyle"].tolist(),
+                            index_file["recipe_names"][
+                                index_file["recipe_codes"]
+                            ].tolist(),
+                        ),
+                        int(index_file["csv_size"]),
+                    )
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            pass
+
+        if sale_key_index is None or sale_key_index.csv_size > csv_size:
+            # Rebuilds the index, as it is missing or the CSV file was replaced.
+            logging.debug("Rebuilding the sale key index from %s.", csv_path)
+            sale_key_index = cls(get_sale_keys(read_key_columns(csv_path)))
+        elif sale_key_index.csv_size == csv_size:
+            return sale_key_index
+        else:
+            # Adds the sales appended to the CSV file since the index was saved.
+            sale_key_index.add_sales(
+                read_key_columns(csv_path, sale_key_index.csv_size, csv_size)
+            )
+
+        sale_key_index.csv_size = csv_size
+        sale_key_index.save(index_path)
+
+        return sale_key_index
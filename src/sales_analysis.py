@@ -0,0 +1,519 @@
+"""
+Calculations on the sales data of Barnaby's Brewhouse. The sales data is
+aggregated into a table of the monthly sales volume of each beer in a single
+grouped pass, and the total sales, sales ratios, average monthly growth rates,
+and sales predictions are all calculated from that table. The predictions and
+the growth rates are based on the last complete month with sales, and the
+growth rates are over a trailing window of months ending with that month, so a
+month which has only had some of its sales uploaded is not used until it is
+complete. Large sales data files are aggregated in chunks, so they never have
+to be held in memory at once. The table, totals, and growth rates are kept up
+to date as new sales are uploaded, without reading the sales data again.
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Iterable, Optional, Sequence
+
+import numpy
+import pandas
+
+from src.recipes import BEERS
+from src.sales_cache import (
+    SALES_CACHE_PATH,
+    SALES_DATA_PATH,
+    read_cached_sales_data,
+    read_sales_chunks,
+)
+from src.sales_growth import DEFAULT_GROWTH_WINDOW, RollingGrowthRates
+from src.sales_index import SalesRangeIndex, SalesRangeIndexBuilder
+
+# Sales data files larger than this (bytes) are aggregated in chunks.
+STREAMING_THRESHOLD = 64 * 1024 * 1024
+
+
+def get_monthly_sales(
+    data_frame: pandas.core.frame.DataFrame,
+) -> pandas.core.frame.DataFrame:
+    """Aggregates the sales data to the monthly sales of each beer.
+
+    Args:
+        data_frame (pandas.core.frame.DataFrame): Sales data of beers.
+
+    Returns:
+        monthly_sales (pandas.core.frame.DataFrame): Sales volume of each beer
+                                                     (columns) in each month
+                                                     (rows).
+    """
+    return fill_monthly_sales(sum_monthly_sales(data_frame))
+
+
+def sum_monthly_sales(
+    data_frame: pandas.core.frame.DataFrame,
+) -> pandas.core.frame.DataFrame:
+    """Sums the quantity ordered for each month and beer in one grouped pass.
+
+    Args:
+        data_frame (pandas.core.frame.DataFrame): Sales data of beers.
+
+    Returns:
+        monthly_sales (pandas.core.frame.DataFrame): Sales volume of each beer
+                                                     in each month with sales.
+    """
+    # Gets the month of each sale, such as 2018-11-02 -> 2018-11.
+    months = data_frame.index.to_period("M")
+
+    monthly_sales = (
+        data_frame.groupby([months, data_frame["Recipe"]], observed=True)[
+            "Quantity ordered"
+        ]
+        .sum()
+        .unstack(fill_value=0)
+    )
+    monthly_sales.columns = monthly_sales.columns.astype(str)
+
+    return monthly_sales
+
+
+def fill_monthly_sales(
+    monthly_sales: pandas.core.frame.DataFrame,
+) -> pandas.core.frame.DataFrame:
+    """Includes every beer and month, even if there were no sales for them.
+
+    Args:
+        monthly_sales (pandas.core.frame.DataFrame): Sales volume of each beer
+                                                     in each month with sales.
+
+    Returns:
+        monthly_sales (pandas.core.frame.DataFrame): Sales volume of each beer
+                                                     (columns) in each month
+                                                     (rows).
+    """
+    columns = BEERS + [beer for beer in monthly_sales.columns if beer not in BEERS]
+    if monthly_sales.empty:
+        index = pandas.PeriodIndex([], freq="M")
+    else:
+        index = pandas.period_range(
+            monthly_sales.index.min(), monthly_sales.index.max(), freq="M"
+        )
+    monthly_sales = monthly_sales.reindex(index=index, columns=columns, fill_value=0)
+
+    # Fills the cells which were missing from both tables summed into this one.
+    return monthly_sales.fillna(0).astype("int64")
+
+
+def stream_monthly_sales(
+    chunks: Iterable[pandas.core.frame.DataFrame],
+) -> pandas.core.frame.DataFrame:
+    """Aggregates chunks of the sales data to the monthly sales of each beer.
+
+    Only one chunk and the running table of monthly sales are held in memory at
+    a time, so memory use does not grow with the size of the sales data.
+
+    Args:
+        chunks (Iterable[pandas.core.frame.DataFrame]): Chunks of sales data.
+
+    Returns:
+        monthly_sales (pandas.core.frame.DataFrame): Sales volume of each beer
+                                                     (columns) in each month
+                                                     (rows).
+    """
+    monthly_sales = pandas.DataFrame()
+    for chunk in chunks:
+        monthly_sales = monthly_sales.add(sum_monthly_sales(chunk), fill_value=0)
+
+    return fill_monthly_sales(monthly_sales)
+
+
+def load_monthly_sales(
+    csv_path: str = SALES_DATA_PATH,
+    cache_path: str = SALES_CACHE_PATH,
+    streaming_threshold: int = STREAMING_THRESHOLD,
+) -> pandas.core.frame.DataFrame:
+    """Reads the sales data and aggregates it to the monthly sales of each beer.
+
+    Sales data files larger than the threshold are read in chunks, and smaller
+    files are read whole from the cache.
+
+    Args:
+        csv_path (str): Path of the sales data CSV file.
+        cache_path (str): Path of the cache file.
+        streaming_threshold (int): Size (bytes) above which the sales data is
+                                   read in chunks.
+
+    Returns:
+        monthly_sales (pandas.core.frame.DataFrame): Sales volume of each beer
+                                                     (columns) in each month
+                                                     (rows).
+    """
+    if os.path.getsize(csv_path) > streaming_threshold:
+        logging.debug("Reading the sales data from %s in chunks.", csv_path)
+        return stream_monthly_sales(read_sales_chunks(csv_path))
+
+    return get_monthly_sales(read_cached_sales_data(csv_path, cache_path))
+
+
+def load_sales_aggregates(
+    csv_path: str = SALES_DATA_PATH,
+    cache_path: str = SALES_CACHE_PATH,
+    streaming_threshold: int = STREAMING_THRESHOLD,
+) -> "SalesAggregates":
+    """Reads the sales data once to build its aggregates and date range index.
+
+    Sales data files larger than the threshold are read in chunks, and each
+    chunk is passed to both the monthly sales table and the range index, and
+    smaller files are read whole from the cache.
+
+    Args:
+        csv_path (str): Path of the sales data CSV file.
+        cache_path (str): Path of the cache file.
+        streaming_threshold (int): Size (bytes) above which the sales data is
+                                   read in chunks.
+
+    Returns:
+        sales_aggregates (SalesAggregates): Aggregates of the sales data.
+    """
+    if os.path.getsize(csv_path) > streaming_threshold:
+        logging.debug("Reading the sales data from %s in chunks.", csv_path)
+        index_builder = SalesRangeIndexBuilder()
+        chunks = index_builder.add_chunks(read_sales_chunks(csv_path))
+        monthly_sales = stream_monthly_sales(chunks)
+        return SalesAggregates(monthly_sales, index_builder.build())
+
+    data_frame = read_cached_sales_data(csv_path, cache_path)
+    return SalesAggregates(
+        get_monthly_sales(data_frame), SalesRangeIndex.from_data_frame(data_frame)
+    )
+
+
+def get_total_sales(monthly_sales: pandas.core.frame.DataFrame) -> pandas.Series:
+    """Calculates the total sales of each beer.
+
+    Args:
+        monthly_sales (pandas.core.frame.DataFrame): Monthly sales of each
+                                                     beer.
+
+    Returns:
+        total_sales (pandas.Series): Total sales volume of each beer.
+    """
+    return monthly_sales.sum()
+
+
+def get_growth_ratios(
+    monthly_sales: pandas.core.frame.DataFrame, window: int = DEFAULT_GROWTH_WINDOW
+) -> pandas.core.frame.DataFrame:
+    """Calculates the month-over-month growth ratios of each beer.
+
+    Args:
+        monthly_sales (pandas.core.frame.DataFrame): Monthly sales of each
+                                                     beer.
+        window (int): Number of months to use, ending with the last month.
+
+    Returns:
+        growth_ratios (pandas.core.frame.DataFrame): Ratio of each month's
+                                                     sales to the previous
+                                                     month's sales for each
+                                                     beer.
+    """
+    return RollingGrowthRates(monthly_sales[BEERS], [window]).get_growth_ratios(window)
+
+
+def get_growth_rates(
+    monthly_sales: pandas.core.frame.DataFrame, window: int = DEFAULT_GROWTH_WINDOW
+) -> pandas.Series:
+    """Calculates the average month-over-month growth rate of each beer.
+
+    Args:
+        monthly_sales (pandas.core.frame.DataFrame): Monthly sales of each
+                                                     beer.
+        window (int): Number of months to use, ending with the last month.
+
+    Returns:
+        growth_rates (pandas.Series): Mean ratio of each month's sales to the
+                                      previous month's sales for each beer.
+    """
+    return RollingGrowthRates(monthly_sales[BEERS], [window]).get_growth_rates(window)
+
+
+def get_month_sales(
+    monthly_sales: pandas.core.frame.DataFrame, month: pandas.Period
+) -> pandas.Series:
+    """Gets the sales of each beer in the given month.
+
+    Args:
+        monthly_sales (pandas.core.frame.DataFrame): Monthly sales of each
+                                                     beer.
+        month (pandas.Period): Month to get the sales for.
+
+    Returns:
+        month_sales (pandas.Series): Sales volume of each beer in the month,
+                                     which is zero if there were no sales.
+    """
+    if month in monthly_sales.index:
+        return monthly_sales.loc[month]
+
+    return pandas.Series(0, index=monthly_sales.columns)
+
+
+def get_current_month() -> pandas.Period:
+    """Gets the current month, whose sales are still in progress.
+
+    Returns:
+        current_month (pandas.Period): Month of today's date.
+    """
+    return pandas.Period(datetime.now(), freq="M")
+
+
+def get_future_months(
+    month_count: int, last_month: pandas.Period
+) -> pandas.PeriodIndex:
+    """Gets the given number of months following the last month of sales.
+
+    Args:
+        month_count (int): Number of months to get.
+        last_month (pandas.Period): Last month of the sales data.
+
+    Returns:
+        future_months (pandas.PeriodIndex): Months following the last month.
+    """
+    return pandas.period_range(last_month + 1, periods=month_count, freq="M")
+
+
+def predict_monthly_sales(
+    last_sales: pandas.Series,
+    growth_rates: pandas.Series,
+    months: Sequence[pandas.Period],
+    last_month: pandas.Period,
+) -> pandas.core.frame.DataFrame:
+    """Predicts the sales of every beer for every given month in one call.
+
+    The prediction for each beer is the last monthly sales multiplied by the
+    average growth rate raised to the number of months since the last month,
+    rounded down to the nearest integer.
+
+    Args:
+        last_sales (pandas.Series): Sales of each beer in the last month.
+        growth_rates (pandas.Series): Average growth rate of each beer.
+        months (Sequence[pandas.Period]): Months to predict the sales for.
+        last_month (pandas.Period): Last month of the sales data.
+
+    Returns:
+        predicted_sales (pandas.core.frame.DataFrame): Predicted sales volume
+                                                       of each beer (columns)
+                                                       in each month (rows).
+    """
+    months = pandas.PeriodIndex(months, freq="M")
+    beers = growth_rates.index
+    month_differences = months.asi8 - last_month.ordinal
+
+    # Broadcasts the months (rows) against the beers (columns).
+    predictions = last_sales[beers].to_numpy(dtype="float64") * (
+        growth_rates.to_numpy(dtype="float64") ** month_differences[:, numpy.newaxis]
+    )
+
+    return pandas.DataFrame(
+        numpy.trunc(predictions).astype("int64"), index=months, columns=beers
+    )
+
+
+class SalesAggregates:
+    """Running aggregates of the sales data, which are kept up to date as new
+    sales are uploaded without reading the sales data again."""
+
+    def __init__(
+        self,
+        monthly_sales: pandas.core.frame.DataFrame,
+        range_index: Optional[SalesRangeIndex] = None,
+        growth_window: int = DEFAULT_GROWTH_WINDOW,
+    ):
+        """Calculates the aggregates from the monthly sales of each beer.
+
+        Args:
+            monthly_sales (pandas.core.frame.DataFrame): Monthly sales of each
+                                                         beer.
+            range_index (Optional[SalesRangeIndex]): Index of the sales for
+                                                     date range queries.
+            growth_window (int): Number of months the growth rates are over.
+        """
+        self.range_index = range_index
+        self.monthly_sales = monthly_sales.copy()
+        self.beer_sales = get_total_sales(self.monthly_sales)
+        self.total_sales = int(self.beer_sales.sum())
+        # The months of the sales data are complete, apart from the current
+        # month, which is still in progress.
+        self.complete_month: Optional[pandas.Period] = None
+        if len(self.monthly_sales):
+            self.complete_month = min(
+                self.monthly_sales.index.max(), get_current_month() - 1
+            )
+        # The growth ratios only go up to the last complete month with sales.
+        self.growth = RollingGrowthRates(
+            self.monthly_sales.loc[: self.last_month, BEERS]
+            if self.last_month is not None
+            else self.monthly_sales[BEERS].iloc[:0]
+        )
+        self.growth_window = growth_window
+
+    @property
+    def last_month(self) -> Optional[pandas.Period]:
+        """Gets the last complete month with sales, which predictions are based
+        on.
+
+        Returns:
+            last_month (Optional[pandas.Period]): Last complete month with any
+                                                  sales, or None if no month is
+                                                  complete.
+        """
+        if self.complete_month is None:
+            return None
+
+        complete_sales = self.monthly_sales.loc[: self.complete_month, BEERS]
+        months_with_sales = complete_sales.index[complete_sales.sum(axis=1) > 0]
+        if len(months_with_sales) == 0:
+            return None
+
+        return months_with_sales.max()
+
+    def complete_months(self, month: pandas.Period):
+        """Marks the months before the month of a new sale as complete.
+
+        A month with new sales stays in progress until there are sales in a
+        later month, so a partial month is not taken as the month's sales and
+        months without sales yet are not taken as months without any sales.
+        The growth ratios are then moved on to the last complete month with
+        sales.
+
+        Args:
+            month (pandas.Period): Month of the new sales.
+        """
+        complete_month = min(month, get_current_month()) - 1
+        if self.complete_month is None or complete_month > self.complete_month:
+            self.complete_month = complete_month
+
+        last_month = self.last_month
+        if last_month is None:
+            return
+        growth_month = (
+            last_month if self.growth.last_month is None else self.growth.last_month + 1
+        )
+        while growth_month <= last_month:
+            self.growth.add_month_sales(
+                growth_month, self.get_month_sales(growth_month)[BEERS]
+            )
+            growth_month += 1
+
+    @property
+    def growth_rates(self) -> pandas.Series:
+        """Gets the average growth rate of each beer over the growth window.
+
+        Returns:
+            growth_rates (pandas.Series): Mean ratio of each month's sales to
+                                          the previous month's sales for each
+                                          beer.
+        """
+        return self.growth.get_growth_rates(self.growth_window)
+
+    def add_sale(self, date: datetime, recipe: str, quantity: int):
+        """Adds a new sale to the aggregates.
+
+        Only the cells affected by the sale are updated, and the growth rates
+        are updated from the ratios to and from the month of the sale.
+
+        Args:
+            date (datetime): Date the sale is required.
+            recipe (str): Beer recipe of the sale.
+            quantity (int): Quantity ordered in the sale.
+        """
+        month = pandas.Period(date, freq="M")
+
+        # Adds rows for new months and a column for a new beer if needed.
+        if month not in self.monthly_sales.index:
+            index = pandas.period_range(
+                min(month, self.monthly_sales.index.min()),
+                max(month, self.monthly_sales.index.max()),
+                freq="M",
+            )
+            self.monthly_sales = self.monthly_sales.reindex(index, fill_value=0)
+        if recipe not in self.monthly_sales.columns:
+            self.monthly_sales[recipe] = 0
+            self.beer_sales[recipe] = 0
+
+        # Updates the monthly sales and the total sales.
+        self.monthly_sales.at[month, recipe] += quantity
+        self.beer_sales[recipe] += quantity
+        self.total_sales += quantity
+
+        # Adds the sale to the date range index.
+        if self.range_index is not None:
+            self.range_index.add_sale(date, recipe, quantity)
+
+        # Updates the growth rates with a sale in a complete month, or moves
+        # them on to the months the sale completes.
+        if self.growth.last_month is not None and month <= self.growth.last_month:
+            self.growth.add_sale(month, recipe, quantity)
+        self.complete_months(month)
+
+    def add_sales(self, data_frame: pandas.core.frame.DataFrame):
+        """Adds a batch of new sales to the aggregates.
+
+        The batch is summed by month and recipe first, so the aggregates are
+        only updated once for the whole batch.
+
+        Args:
+            data_frame (pandas.core.frame.DataFrame): New sales, indexed by
+                                                      date.
+        """
+        if data_frame.empty:
+            return
+
+        batch_monthly_sales = sum_monthly_sales(data_frame)
+        self.monthly_sales = fill_monthly_sales(
+            self.monthly_sales.add(batch_monthly_sales, fill_value=0)
+        )
+        self.beer_sales = get_total_sales(self.monthly_sales)
+        self.total_sales = int(self.beer_sales.sum())
+        for month, month_sales in batch_monthly_sales.iterrows():
+            if self.growth.last_month is not None and month <= self.growth.last_month:
+                self.growth.add_month_sales(month, month_sales)
+        self.complete_months(batch_monthly_sales.index.max())
+
+        # Adds the sales to the date range index.
+        if self.range_index is not None:
+            for date, recipe, quantity in zip(
+                data_frame.index,
+                data_frame["Recipe"].astype(str),
+                data_frame["Quantity ordered"].astype("int64"),
+            ):
+                self.range_index.add_sale(date, recipe, int(quantity))
+
+    def get_month_sales(self, month: pandas.Period) -> pandas.Series:
+        """Gets the sales of each beer in the given month.
+
+        Args:
+            month (pandas.Period): Month to get the sales for.
+
+        Returns:
+            month_sales (pandas.Series): Sales volume of each beer in the month.
+        """
+        return get_month_sales(self.monthly_sales, month)
+
+    def predict_sales(
+        self, months: Sequence[pandas.Period]
+    ) -> pandas.core.frame.DataFrame:
+        """Predicts the sales of every beer for every given month.
+
+        Args:
+            months (Sequence[pandas.Period]): Months to predict the sales for.
+
+        Returns:
+            predicted_sales (pandas.core.frame.DataFrame): Predicted sales
+                                                           volume of each beer
+                                                           in each month.
+        """
+        return predict_monthly_sales(
+            self.get_month_sales(self.last_month),
+            self.growth_rates,
+            months,
+            self.last_month,
+        )
@@ -0,0 +1,267 @@
+"""
+A binary columnar cache of the sales data CSV file, so that the sales data does
+not have to be parsed from text every time the program starts. The cache stores
+the parsed dates, the recipes and customers as category codes, and the integer
+columns as NumPy arrays in a sidecar file, with the sales sorted by date. It is
+keyed by the size, modification time, and content hash of the CSV file, and is
+only rebuilt when the CSV file has actually changed.
+
+The sales data is held compactly in memory: the recipes and customers are
+stored as small integer codes into a list of their names, and the integer
+columns as 32-bit integers.
+"""
+
+import hashlib
+import logging
+import os
+import zipfile
+from typing import Iterator, Optional, Sequence
+
+import numpy
+import pandas
+
+SALES_DATA_PATH = "resources/sales_data.csv"
+SALES_CACHE_PATH = "resources/sales_data.npz"
+# Number of rows read at a time when reading the sales data in chunks.
+CHUNK_SIZE = 100000
+# Increases whenever the layout of the cache changes, so old caches are rebuilt.
+CACHE_VERSION = 3
+# Columns of the sales data CSV file, in order.
+SALES_COLUMNS = [
+    "Invoice Number",
+    "Customer",
+    "Date Required",
+    "Recipe",
+    "Gyle Number",
+    "Quantity ordered",
+]
+# Columns read when aggregating the sales data in chunks.
+CHUNK_COLUMNS = ["Date Required", "Recipe", "Quantity ordered"]
+# Types of the columns of the sales data, which keep each sale small in memory.
+SALES_DTYPES = {
+    "Invoice Number": "int32",
+    "Customer": "category",
+    "Recipe": "category",
+    "Gyle Number": "int32",
+    "Quantity ordered": "int32",
+}
+
+
+def get_file_hash(file_path: str) -> str:
+    """Calculates the SHA-256 hash of the contents of a file.
+
+    Args:
+        file_path (str): Path of the file to hash.
+
+    Returns:
+        file_hash (str): Hexadecimal digest of the file contents.
+    """
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as hashed_file:
+        for chunk in iter(lambda: hashed_file.read(1 << 20), b""):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+
+def index_by_date(
+    data_frame: pandas.core.frame.DataFrame,
+) -> pandas.core.frame.DataFrame:
+    """Parses the dates the sales are required, and indexes the sales by them.
+
+    Args:
+        data_frame (pandas.core.frame.DataFrame): Sales data with dates such as
+                                                  '02-Nov-18'.
+
+    Returns:
+        data_frame (pandas.core.frame.DataFrame): Sales data indexed by date.
+    """
+    data_frame["Date Required"] = pandas.to_datetime(
+        data_frame["Date Required"], format="%d-%b-%y"
+    )
+
+    return data_frame.set_index("Date Required")
+
+
+def parse_sales_csv(csv_path: str = SALES_DATA_PATH) -> pandas.core.frame.DataFrame:
+    """Parses the sales data CSV file into typed columns.
+
+    Args:
+        csv_path (str): Path of the sales data CSV file.
+
+    Returns:
+        data_frame (pandas.core.frame.DataFrame): Sales data of beers, sorted
+                                                  and indexed by date.
+    """
+    data_frame = index_by_date(pandas.read_csv(csv_path, dtype=SALES_DTYPES))
+
+    # Keeps sales on the same date in the order they are in the file.
+    return data_frame.sort_index(kind="mergesort")
+
+
+def read_sales_chunks(
+    csv_path: str = SALES_DATA_PATH,
+    chunk_size: int = CHUNK_SIZE,
+    columns: Sequence[str] = CHUNK_COLUMNS,
+    offset: int = 0,
+) -> Iterator[pandas.core.frame.DataFrame]:
+    """Reads the sales data CSV file in chunks of rows, parsing each in turn.
+
+    Only the columns needed to aggregate the sales are read by default.
+
+    Args:
+        csv_path (str): Path of the sales data CSV file.
+        chunk_size (int): Number of rows in each chunk.
+        columns (Sequence[str]): Columns to read, which include the dates.
+        offset (int): Position in the file to start reading from, which must
+                      be the start of a line after the header, or zero to read
+                      the whole file.
+
+    Yields:
+        chunk (pandas.core.frame.DataFrame): Columns of a chunk of sales,
+                                             indexed by date.
+    """
+    dtype = {
+        column: SALES_DTYPES[column] for column in columns if column in SALES_DTYPES
+    }
+
+    with open(csv_path, "rb") as sales_file:
+        # Reads the rows after the offset, which have no header row.
+        header_options = {}
+        if offset > 0:
+            sales_file.seek(offset)
+            header_options = {"header": None, "names": SALES_COLUMNS}
+
+        with pandas.read_csv(
+            sales_file,
+            usecols=list(columns),
+            dtype=dtype,
+            chunksize=chunk_size,
+            **header_options,
+        ) as reader:
+            for chunk in reader:
+                yield index_by_date(chunk)
+
+
+def save_sales_cache(
+    data_frame: pandas.core.frame.DataFrame,
+    csv_stat: os.stat_result,
+    csv_hash: str,
+    cache_path: str = SALES_CACHE_PATH,
+):
+    """Saves the parsed sales data to the cache file.
+
+    Args:
+        data_frame (pandas.core.frame.DataFrame): Sales data of beers.
+        csv_stat (os.stat_result): Status of the CSV file the data was parsed
+                                   from.
+        csv_hash (str): Content hash of the CSV file the data was parsed from.
+        cache_path (str): Path of the cache file.
+    """
+    customers = data_frame["Customer"].cat
+    recipes = data_frame["Recipe"].cat
+
+    # Writes to a temporary file first so a partial cache is never read.
+    temp_path = cache_path + ".tmp"
+    with open(temp_path, "wb") as cache_file:
+        numpy.savez(
+            cache_file,
+            version=numpy.array(CACHE_VERSION),
+            csv_size=numpy.array(csv_stat.st_size),
+            csv_mtime=numpy.array(csv_stat.st_mtime_ns),
+            csv_hash=numpy.array(csv_hash),
+            invoice=data_frame["Invoice Number"].to_numpy(dtype="int32"),
+            customer_codes=customers.codes.to_numpy(),
+            customer_categories=customers.categories.to_numpy(dtype=str),
+            date=data_frame.index.to_numpy(dtype="datetime64[D]"),
+            recipe_codes=recipes.codes.to_numpy(),
+            recipe_categories=recipes.categories.to_numpy(dtype=str),
+            gyle=data_frame["Gyle Number"].to_numpy(dtype="int32"),
+            quantity=data_frame["Quantity ordered"].to_numpy(dtype="int32"),
+        )
+    os.replace(temp_path, cache_path)
+
+
+def load_sales_cache(cache_path: str = SALES_CACHE_PATH) -> Optional[dict]:
+    """Loads the arrays stored in the cache file.
+
+    Args:
+        cache_path (str): Path of the cache file.
+
+    Returns:
+        cache (Optional[dict]): Arrays stored in the cache, or None if there is
+                                no readable cache of the current version.
+    """
+    try:
+        with numpy.load(cache_path) as cache_file:
+            cache = {name: cache_file[name] for name in cache_file.files}
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return None
+
+    if "version" not in cache or int(cache["version"]) != CACHE_VERSION:
+        return None
+
+    return cache
+
+
+def cache_to_data_frame(cache: dict) -> pandas.core.frame.DataFrame:
+    """Rebuilds the sales data from the arrays stored in the cache.
+
+    Args:
+        cache (dict): Arrays stored in the cache.
+
+    Returns:
+        data_frame (pandas.core.frame.DataFrame): Sales data of beers.
+    """
+    return pandas.DataFrame(
+        {
+            "Invoice Number": cache["invoice"],
+            "Customer": pandas.Categorical.from_codes(
+                cache["customer_codes"], cache["customer_categories"]
+            ),
+            "Recipe": pandas.Categorical.from_codes(
+                cache["recipe_codes"], cache["recipe_categories"]
+            ),
+            "Gyle Number": cache["gyle"],
+            "Quantity ordered": cache["quantity"],
+        },
+        index=pandas.DatetimeIndex(cache["date"], name="Date Required"),
+    )
+
+
+def read_cached_sales_data(
+    csv_path: str = SALES_DATA_PATH, cache_path: str = SALES_CACHE_PATH
+) -> pandas.core.frame.DataFrame:
+    """Reads the sales data from the cache, rebuilding it if the CSV changed.
+
+    Args:
+        csv_path (str): Path of the sales data CSV file.
+        cache_path (str): Path of the cache file.
+
+    Returns:
+        data_frame (pandas.core.frame.DataFrame): Sales data of beers.
+    """
+    csv_stat = os.stat(csv_path)
+    cache = load_sales_cache(cache_path)
+
+    if cache is not None and int(cache["csv_size"]) == csv_stat.st_size:
+        # Uses the cache without hashing if the CSV file is untouched.
+        if int(cache["csv_mtime"]) == csv_stat.st_mtime_ns:
+            return cache_to_data_frame(cache)
+
+        # Uses the cache if the CSV file was touched but its contents are the
+        # same, and records the new modification time.
+        csv_hash = get_file_hash(csv_path)
+        if str(cache["csv_hash"]) == csv_hash:
+            data_frame = cache_to_data_frame(cache)
+            save_sales_cache(data_frame, csv_stat, csv_hash, cache_path)
+            return data_frame
+    else:
+        csv_hash = get_file_hash(csv_path)
+
+    # Parses the CSV file and rebuilds the cache, as the CSV file has changed.
+    logging.debug("Rebuilding the sales data cache from %s.", csv_path)
+    data_frame = parse_sales_csv(csv_path)
+    save_sales_cache(data_frame, csv_stat, csv_hash, cache_path)
+
+    return data_frame
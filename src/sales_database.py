@@ -0,0 +1,328 @@
+"""
+An optional SQLite database of the sales data, which is kept in step with the
+sales data CSV file. The sales are indexed by date, recipe, and customer, and
+the aggregations are calculated by SQLite, so that starting the program and
+querying the sales do not have to parse the whole CSV file. The total sales of
+each recipe on each day are kept in their own table as sales are added, so the
+aggregations only read a row for each day and recipe rather than every sale.
+The database uses write-ahead logging, so it can be read while sales are being
+added.
+
+As sales are only ever appended to the CSV file, the database records how much
+of the CSV file it holds, and only copies the sales appended since then.
+
+Create the database with: python -m src.sales_database
+"""
+
+import argparse
+import os
+import sqlite3
+from typing import Dict, Iterable
+
+import pandas
+
+from src.sales_analysis import SalesAggregates, fill_monthly_sales
+from src.sales_cache import (
+    SALES_COLUMNS,
+    SALES_DATA_PATH,
+    SALES_DTYPES,
+    read_sales_chunks,
+)
+from src.sales_index import DateLike, SalesRangeIndexBuilder, to_day
+
+SALES_DATABASE_PATH = "resources/sales_data.db"
+# Number of rows read from the database at a time.
+FETCH_SIZE = 100000
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sales (
+    id INTEGER PRIMARY KEY,
+    invoice INTEGER NOT NULL,
+    customer TEXT NOT NULL,
+    date_required TEXT NOT NULL,
+    recipe TEXT NOT NULL,
+    gyle INTEGER NOT NULL,
+    quantity INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS daily_sales (
+    date_required TEXT NOT NULL,
+    recipe TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    PRIMARY KEY (date_required, recipe)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS csv_sync (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    csv_size INTEGER NOT NULL
+);
+"""
+INDEXES = """
+CREATE INDEX IF NOT EXISTS sales_date ON sales (date_required, recipe, quantity);
+CREATE INDEX IF NOT EXISTS sales_recipe ON sales (recipe, date_required);
+CREATE INDEX IF NOT EXISTS sales_customer ON sales (customer, date_required);
+"""
+
+
+def connect_sales_database(
+    database_path: str = SALES_DATABASE_PATH,
+) -> sqlite3.Connection:
+    """Connects to the sales database, creating its tables if needed.
+
+    Args:
+        database_path (str): Path of the SQLite database file.
+
+    Returns:
+        connection (sqlite3.Connection): Connection to the database.
+    """
+    connection = sqlite3.connect(database_path)
+    # Lets the database be read while sales are being added.
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA + INDEXES)
+
+    return connection
+
+
+def get_sale_rows(data_frame: pandas.core.frame.DataFrame) -> Iterable[tuple]:
+    """Converts sales to rows of the sales table.
+
+    Args:
+        data_frame (pandas.core.frame.DataFrame): Sales data of beers, indexed
+                                                  by date.
+
+    Returns:
+        rows (Iterable[tuple]): Invoice number, customer, ISO date, recipe,
+                                gyle number, and quantity of each sale.
+    """
+    return zip(
+        data_frame["Invoice Number"].astype("int64").tolist(),
+        data_frame["Customer"].astype(str).tolist(),
+        data_frame.index.strftime("%Y-%m-%d").tolist(),
+        data_frame["Recipe"].astype(str).tolist(),
+        data_frame["Gyle Number"].astype("int64").tolist(),
+        data_frame["Quantity ordered"].astype("int64").tolist(),
+    )
+
+
+def add_daily_sales(
+    connection: sqlite3.Connection, data_frame: pandas.core.frame.DataFrame
+):
+    """Adds sales to the total sales of each recipe on each day.
+
+    Args:
+        connection (sqlite3.Connection): Connection to the database.
+        data_frame (pandas.core.frame.DataFrame): Sales data of beers, indexed
+                                                  by date.
+    """
+    daily_sales = data_frame.groupby(
+        [data_frame.index.strftime("%Y-%m-%d"), data_frame["Recipe"].astype(str)]
+    )["Quantity ordered"].sum()
+
+    connection.executemany(
+        "INSERT INTO daily_sales (date_required, recipe, quantity) "
+        "VALUES (?, ?, ?) ON CONFLICT (date_required, recipe) "
+        "DO UPDATE SET quantity = quantity + excluded.quantity",
+        [
+            (date, recipe, int(quantity))
+            for (date, recipe), quantity in daily_sales.items()
+        ],
+    )
+
+
+def sync_sales_database(
+    connection: sqlite3.Connection, csv_path: str = SALES_DATA_PATH
+) -> int:
+    """Copies the sales appended to the CSV file since the last sync.
+
+    The whole CSV file is copied again if it is smaller than when it was last
+    synced, as it must have been replaced.
+
+    Args:
+        connection (sqlite3.Connection): Connection to the database.
+        csv_path (str): Path of the sales data CSV file.
+
+    Returns:
+        sale_count (int): Number of sales copied.
+    """
+    csv_size = os.stat(csv_path).st_size
+    row = connection.execute("SELECT csv_size FROM csv_sync").fetchone()
+    synced_size = 0 if row is None else row[0]
+    if synced_size == csv_size:
+        return 0
+
+    sale_count = 0
+    # Copies the sales in a single transaction, so a partial copy is never read.
+    with connection:
+        if synced_size > csv_size:
+            synced_size = 0
+        if synced_size == 0:
+            # Copies every sale before indexing them, which is much faster than
+            # updating the indexes for each sale.
+            connection.execute("DELETE FROM sales")
+            connection.execute("DELETE FROM daily_sales")
+            for index in ["sales_date", "sales_recipe", "sales_customer"]:
+                connection.execute("DROP INDEX IF EXISTS " + index)
+
+        for chunk in read_sales_chunks(
+            csv_path, columns=SALES_COLUMNS, offset=synced_size
+        ):
+            connection.executemany(
+                "INSERT INTO sales (invoice, customer, date_required, recipe, "
+                "gyle, quantity) VALUES (?, ?, ?, ?, ?, ?)",
+                get_sale_rows(chunk),
+            )
+            add_daily_sales(connection, chunk)
+            sale_count += len(chunk)
+
+        for index in INDEXES.strip().splitlines():
+            connection.execute(index)
+        connection.execute(
+            "INSERT OR REPLACE INTO csv_sync (id, csv_size) VALUES (1, ?)",
+            (csv_size,),
+        )
+
+    return sale_count
+
+
+def read_monthly_sales(connection: sqlite3.Connection) -> pandas.core.frame.DataFrame:
+    """Sums the sales of each beer in each month in the database.
+
+    Args:
+        connection (sqlite3.Connection): Connection to the database.
+
+    Returns:
+        monthly_sales (pandas.core.frame.DataFrame): Monthly sales of each
+                                                     beer.
+    """
+    rows = pandas.read_sql_query(
+        "SELECT substr(date_required, 1, 7) AS month, recipe, "
+        "SUM(quantity) AS quantity FROM daily_sales GROUP BY month, recipe",
+        connection,
+    )
+    monthly_sales = rows.pivot(index="month", columns="recipe", values="quantity")
+    monthly_sales.index = pandas.PeriodIndex(monthly_sales.index, freq="M")
+
+    return fill_monthly_sales(monthly_sales.fillna(0).rename_axis(columns="Recipe"))
+
+
+def read_sales_totals(
+    connection: sqlite3.Connection, start: DateLike, end: DateLike
+) -> Dict[str, int]:
+    """Sums the sales of each recipe between two dates in the database.
+
+    Args:
+        connection (sqlite3.Connection): Connection to the database.
+        start (DateLike): First date of the range.
+        end (DateLike): Last date of the range, which is included.
+
+    Returns:
+        totals (Dict[str, int]): Total quantity ordered of each recipe.
+    """
+    recipes = connection.execute("SELECT DISTINCT recipe FROM daily_sales")
+    totals = {recipe: 0 for (recipe,) in recipes.fetchall()}
+    totals.update(
+        connection.execute(
+            "SELECT recipe, SUM(quantity) FROM daily_sales "
+            "WHERE date_required BETWEEN ? AND ? GROUP BY recipe",
+            (str(to_day(start)), str(to_day(end))),
+        ).fetchall()
+    )
+
+    return totals
+
+
+def read_sales_data(connection: sqlite3.Connection) -> pandas.core.frame.DataFrame:
+    """Reads every sale in the database.
+
+    Args:
+        connection (sqlite3.Connection): Connection to the database.
+
+    Returns:
+        data_frame (pandas.core.frame.DataFrame): Sales data of beers, sorted
+                                                  and indexed by date.
+    """
+    data_frame = pandas.read_sql_query(
+        "SELECT invoice, customer, date_required, recipe, gyle, quantity "
+        "FROM sales ORDER BY date_required, id",
+        connection,
+    )
+    data_frame.columns = SALES_COLUMNS
+    data_frame["Date Required"] = pandas.to_datetime(
+        data_frame["Date Required"], format="%Y-%m-%d"
+    )
+
+    return data_frame.set_index("Date Required").astype(SALES_DTYPES)
+
+
+def load_database_aggregates(
+    database_path: str = SALES_DATABASE_PATH, csv_path: str = SALES_DATA_PATH
+) -> SalesAggregates:
+    """Syncs the database with the CSV file, and aggregates its sales.
+
+    The monthly sales are summed by SQLite, and the date range index is built
+    from the total sales of each recipe on each day, rather than every sale.
+
+    Args:
+        database_path (str): Path of the SQLite database file.
+        csv_path (str): Path of the sales data CSV file.
+
+    Returns:
+        sales_aggregates (SalesAggregates): Aggregates of the sales data.
+    """
+    connection = connect_sales_database(database_path)
+    try:
+        sync_sales_database(connection, csv_path)
+        monthly_sales = read_monthly_sales(connection)
+
+        builder = SalesRangeIndexBuilder()
+        for chunk in pandas.read_sql_query(
+            "SELECT date_required, recipe AS Recipe, "
+            'quantity AS "Quantity ordered" FROM daily_sales',
+            connection,
+            chunksize=FETCH_SIZE,
+        ):
+            chunk.index = pandas.to_datetime(
+                chunk.pop("date_required"), format="%Y-%m-%d"
+            )
+            builder.add_chunk(chunk)
+    finally:
+        connection.close()
+
+    return SalesAggregates(monthly_sales, builder.build())
+
+
+def main() -> None:
+    """Creates or updates the sales database from the sales data CSV file."""
+    parser = argparse.ArgumentParser(
+        description="Creates or updates the SQLite database of the sales data."
+    )
+    parser.add_argument("--sales-data", default=SALES_DATA_PATH)
+    parser.add_argument("--database", default=SALES_DATABASE_PATH)
+    parser.add_argument(
+        "--rebuild", action="store_true", help="copy the whole CSV file again"
+    )
+    args = parser.parse_args()
+
+    connection = connect_sales_database(args.database)
+    try:
+        if args.rebuild:
+            # Forgets how much of the CSV file was copied, so all of it is.
+            with connection:
+                connection.execute("DELETE FROM csv_sync")
+        sale_count = sync_sales_database(connection, args.sales_data)
+        total_count = connection.execute("SELECT COUNT(*) FROM sales").fetchone()[0]
+    finally:
+        connection.close()
+
+    print(
+        "Copied "
+        + str(sale_count)
+        + " sales to "
+        + args.database
+        + ", which now holds "
+        + str(total_count)
+        + " sales."
+    )
+
+
+# Prevents the code from executing when the script is imported as a module.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Growth rates of the monthly sales of each beer over trailing windows of months,
+such as the last 6, 12, or 24 months of the sales data. The ratio of each
+month's sales to the previous month's sales is kept for every month, along with
+a running sum and count of the ratios in each window. Adding a month or a sale
+only changes a couple of ratios, so every window is updated with a few
+additions and subtractions, and the growth rates of any window are read without
+going over the months again.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy
+import pandas
+
+# Windows (months) whose growth rates are kept up to date from the start.
+GROWTH_WINDOWS = [6, 12, 24]
+# Window (months) of the growth rates shown and used for predictions.
+DEFAULT_GROWTH_WINDOW = 12
+
+
+def get_ratio(previous_sales: numpy.ndarray, sales: numpy.ndarray) -> numpy.ndarray:
+    """Calculates the ratio of each beer's sales to its previous month's sales.
+
+    Args:
+        previous_sales (numpy.ndarray): Sales of each beer in the previous
+                                        month.
+        sales (numpy.ndarray): Sales of each beer in the month.
+
+    Returns:
+        ratio (numpy.ndarray): Growth ratio of each beer, which is not finite
+                               if the previous month had no sales.
+    """
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        return sales / previous_sales
+
+
+class RollingGrowthRates:
+    """Month-over-month growth ratios of each beer, with running sums of the
+    ratios in trailing windows of months."""
+
+    def __init__(
+        self,
+        monthly_sales: pandas.core.frame.DataFrame,
+        windows: Sequence[int] = GROWTH_WINDOWS,
+    ):
+        """Calculates the growth ratios from the monthly sales of each beer.
+
+        Args:
+            monthly_sales (pandas.core.frame.DataFrame): Sales volume of each
+                                                         beer (columns) in each
+                                                         month (rows).
+            windows (Sequence[int]): Windows (months) to keep up to date.
+        """
+        self.beers = list(monthly_sales.columns)
+        self.first_month: Optional[pandas.Period] = (
+            monthly_sales.index[0] if len(monthly_sales) else None
+        )
+        self.sales: List[numpy.ndarray] = list(monthly_sales.to_numpy(dtype="float64"))
+        self.ratios: List[numpy.ndarray] = []
+        self.ratio_sums: Dict[int, numpy.ndarray] = {}
+        self.ratio_counts: Dict[int, numpy.ndarray] = {}
+        self.recalculate(windows)
+
+    @property
+    def last_month(self) -> Optional[pandas.Period]:
+        """Gets the last month of the sales.
+
+        Returns:
+            last_month (Optional[pandas.Period]): Last month with a row of
+                                                  sales, or None if there are
+                                                  no sales.
+        """
+        if self.first_month is None:
+            return None
+
+        return self.first_month + (len(self.sales) - 1)
+
+    def recalculate(self, windows: Sequence[int]):
+        """Calculates every growth ratio and the running sums of the windows.
+
+        Args:
+            windows (Sequence[int]): Windows (months) to keep up to date.
+        """
+        self.ratios = [
+            get_ratio(previous_sales, sales)
+            for previous_sales, sales in zip(self.sales, self.sales[1:])
+        ]
+        self.ratio_sums = {}
+        self.ratio_counts = {}
+        for window in windows:
+            self.add_window(window)
+
+    def add_window(self, window: int):
+        """Starts keeping the growth rates of a window up to date.
+
+        Args:
+            window (int): Number of months in the window, which has one growth
+                          ratio fewer than it has months.
+        """
+        if window < 2:
+            raise ValueError("A growth window must have at least 2 months.")
+        if window in self.ratio_sums:
+            return
+
+        self.ratio_sums[window] = numpy.zeros(len(self.beers))
+        self.ratio_counts[window] = numpy.zeros(len(self.beers), dtype="int64")
+        for ratio in self.ratios[-(window - 1) :]:
+            self.add_to_window(window, ratio, 1)
+
+    def add_to_window(self, window: int, ratio: numpy.ndarray, sign: int):
+        """Adds a growth ratio to the running sums of a window, or removes it.
+
+        Args:
+            window (int): Number of months in the window.
+            ratio (numpy.ndarray): Growth ratio of each beer.
+            sign (int): 1 to add the ratio, or -1 to remove it.
+        """
+        # Ignores months which followed a month without sales.
+        finite = numpy.isfinite(ratio)
+        self.ratio_sums[window] += sign * numpy.where(finite, ratio, 0)
+        self.ratio_counts[window] += sign * finite
+        # Resets the sums of beers left without ratios, so the rounding errors of
+        # adding and removing ratios do not remain.
+        self.ratio_sums[window][self.ratio_counts[window] == 0] = 0
+
+    def append_month(self, sales: numpy.ndarray):
+        """Adds a month after the last month, moving every window on by a month.
+
+        Args:
+            sales (numpy.ndarray): Sales of each beer in the new month.
+        """
+        if self.sales:
+            ratio = get_ratio(self.sales[-1], sales)
+            self.ratios.append(ratio)
+            for window in self.ratio_sums:
+                self.add_to_window(window, ratio, 1)
+                # Removes the ratio which is now before the start of the window.
+                if len(self.ratios) >= window:
+                    self.add_to_window(window, self.ratios[-window], -1)
+        self.sales.append(sales)
+
+    def set_ratio(self, position: int, ratio: numpy.ndarray):
+        """Replaces a growth ratio in the windows which include it.
+
+        Args:
+            position (int): Position of the ratio.
+            ratio (numpy.ndarray): New growth ratio of each beer.
+        """
+        for window in self.ratio_sums:
+            if position >= len(self.ratios) - (window - 1):
+                self.add_to_window(window, self.ratios[position], -1)
+                self.add_to_window(window, ratio, 1)
+        self.ratios[position] = ratio
+
+    def add_month_sales(self, month: pandas.Period, sales: pandas.Series):
+        """Adds sales to a month, adding the month if it is new.
+
+        Only the growth ratios to and from the month change, so the windows are
+        updated without going over the other months.
+
+        Args:
+            month (pandas.Period): Month of the sales.
+            sales (pandas.Series): Sales volume of each beer to add.
+        """
+        sales = sales.reindex(self.beers, fill_value=0).to_numpy(dtype="float64")
+        if self.first_month is None:
+            self.first_month = month
+        position = month.ordinal - self.first_month.ordinal
+
+        if position < 0:
+            # Recalculates the growth ratios, as adding months before the first
+            # month moves every month along.
+            self.sales = [numpy.zeros(len(self.beers))] * -position + self.sales
+            self.first_month = month
+            self.recalculate(list(self.ratio_sums))
+            position = 0
+
+        # Adds the months up to the month of the sales.
+        while position >= len(self.sales):
+            self.append_month(numpy.zeros(len(self.beers)))
+
+        self.sales[position] = self.sales[position] + sales
+        for ratio_position in [position - 1, position]:
+            if 0 <= ratio_position < len(self.ratios):
+                self.set_ratio(
+                    ratio_position,
+                    get_ratio(
+                        self.sales[ratio_position], self.sales[ratio_position + 1]
+                    ),
+                )
+
+    def add_sale(self, month: pandas.Period, beer: str, quantity: int):
+        """Adds a sale of a beer to a month.
+
+        Args:
+            month (pandas.Period): Month of the sale.
+            beer (str): Beer recipe of the sale.
+            quantity (int): Quantity ordered in the sale.
+        """
+        if beer in self.beers:
+            self.add_month_sales(month, pandas.Series({beer: quantity}))
+
+    def get_growth_rates(self, window: int = DEFAULT_GROWTH_WINDOW) -> pandas.Series:
+        """Gets the mean month-over-month growth rate of each beer in a window.
+
+        Args:
+            window (int): Number of months in the window, ending with the last
+                          month of the sales.
+
+        Returns:
+            growth_rates (pandas.Series): Mean ratio of each month's sales to
+                                          the previous month's sales for each
+                                          beer, which is NaN for a beer without
+                                          any ratios in the window.
+        """
+        self.add_window(window)
+        ratio_counts = self.ratio_counts[window]
+        growth_rates = numpy.full(len(self.beers), numpy.nan)
+        numpy.divide(
+            self.ratio_sums[window],
+            ratio_counts,
+            out=growth_rates,
+            where=ratio_counts > 0,
+        )
+
+        return pandas.Series(growth_rates, index=self.beers)
+
+    def get_growth_ratios(
+        self, window: int = DEFAULT_GROWTH_WINDOW
+    ) -> pandas.core.frame.DataFrame:
+        """Gets the month-over-month growth ratios of each beer in a window.
+
+        Args:
+            window (int): Number of months in the window, ending with the last
+                          month of the sales.
+
+        Returns:
+            growth_ratios (pandas.core.frame.DataFrame): Ratio of each month's
+                                                         sales to the previous
+                                                         month's sales for each
+                                                         beer.
+        """
+        ratios = self.ratios[-(window - 1) :] if window > 1 else []
+        if ratios:
+            months = pandas.period_range(
+                end=self.last_month, periods=len(ratios), freq="M"
+            )
+        else:
+            months = pandas.PeriodIndex([], freq="M")
+
+        return pandas.DataFrame(
+            numpy.array(ratios).reshape(len(ratios), len(self.beers)),
+            index=months,
+            columns=self.beers,
+        )
+
+    def compare_windows(
+        self, windows: Sequence[int] = GROWTH_WINDOWS
+    ) -> pandas.core.frame.DataFrame:
+        """Gets the mean growth rate of each beer in each of the windows.
+
+        Args:
+            windows (Sequence[int]): Windows (months) to compare.
+
+        Returns:
+            growth_rates (pandas.core.frame.DataFrame): Mean growth rate of each
+                                                        beer (rows) in each
+                                                        window (columns).
+        """
+        return pandas.DataFrame(
+            {window: self.get_growth_rates(window) for window in windows}
+        )
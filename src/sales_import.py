@@ -0,0 +1,225 @@
+"""
+Imports a batch of sales into the sales data CSV file from a CSV or JSON file,
+such as an export from the order system. Every row of the batch is validated at
+once, and the rows which are accepted are appended to the sales data in a
+single write, while each rejected row is reported with the reason it was
+rejected. Sales which have already been uploaded are rejected too.
+"""
+
+import csv
+import io
+import json
+import os
+import re
+from typing import List, Optional, Tuple
+
+import pandas
+
+from src.recipes import BEERS
+from src.sale_keys import SaleKeyIndex
+from src.sales_cache import SALES_COLUMNS, SALES_DATA_PATH
+
+INTEGER_COLUMNS = ["Invoice Number", "Gyle Number", "Quantity ordered"]
+# Formats of dates in imported files: the format of the sales data, or ISO.
+DATE_FORMATS = ["%d-%b-%y", "%Y-%m-%d"]
+# Largest value which fits in the integer columns of the sales data.
+MAX_INTEGER = 2**31 - 1
+# Pattern of the whole numbers accepted in the integer columns.
+INTEGER_PATTERN = r"\d{1,10}"
+
+
+def is_positive_integer(value: str) -> bool:
+    """Checks whether the text of a number is a valid positive whole number.
+
+    Args:
+        value (str): Text of the number.
+
+    Returns:
+        is_positive_integer (bool): Whether it is a whole number between 1 and
+                                    the largest value of the integer columns.
+    """
+    return (
+        re.fullmatch(INTEGER_PATTERN, value) is not None
+        and 0 < int(value) <= MAX_INTEGER
+    )
+
+
+def read_sales_batch(batch_path: str) -> pandas.core.frame.DataFrame:
+    """Reads a batch of sales from a CSV file, or a JSON list of sales.
+
+    Every value is read as text, so that it can be validated.
+
+    Args:
+        batch_path (str): Path of the CSV or JSON file.
+
+    Returns:
+        batch (pandas.core.frame.DataFrame): Sales in the batch, with the
+                                             columns of the sales data.
+    """
+    if batch_path.lower().endswith(".json"):
+        with open(batch_path, "r") as batch_file:
+            batch = pandas.DataFrame(json.load(batch_file), dtype=object)
+        # Converts numbers in the JSON file to text, keeping missing values.
+        batch = batch.astype(object).where(batch.notna(), "").astype(str)
+    else:
+        batch = pandas.read_csv(batch_path, dtype=str, keep_default_na=False)
+
+    return batch.reindex(columns=SALES_COLUMNS, fill_value="")
+
+
+def parse_dates(dates: pandas.Series) -> pandas.Series:
+    """Parses dates in any of the accepted formats.
+
+    Args:
+        dates (pandas.Series): Dates as text.
+
+    Returns:
+        parsed_dates (pandas.Series): Parsed dates, which are missing for
+                                      dates in none of the formats.
+    """
+    parsed_dates = pandas.Series(pandas.NaT, index=dates.index)
+    for date_format in DATE_FORMATS:
+        unparsed = parsed_dates.isna()
+        parsed_dates[unparsed] = pandas.to_datetime(
+            dates[unparsed], format=date_format, errors="coerce"
+        )
+
+    return parsed_dates
+
+
+def validate_sales(
+    batch: pandas.core.frame.DataFrame,
+    sale_key_index: Optional[SaleKeyIndex] = None,
+) -> Tuple[pandas.core.frame.DataFrame, List[Tuple[int, str]]]:
+    """Validates every sale in a batch.
+
+    Args:
+        batch (pandas.core.frame.DataFrame): Sales in the batch as text.
+        sale_key_index (Optional[SaleKeyIndex]): Index of the sales already
+                                                 uploaded, to reject them.
+
+    Returns:
+        accepted_sales (pandas.core.frame.DataFrame): Valid sales, indexed by
+                                                      date.
+        rejections (List[Tuple[int, str]]): Row number and reason of each
+                                            rejected sale, where the first sale
+                                            is row 1.
+    """
+    batch = batch.apply(lambda column: column.str.strip())
+    reasons = pandas.Series("", index=batch.index)
+
+    def reject(invalid: pandas.Series, reason: str):
+        # Keeps the first reason each sale was rejected for.
+        reasons[invalid & (reasons == "")] = reason
+
+    for column in SALES_COLUMNS:
+        reject(batch[column] == "", "missing " + column)
+
+    customers = batch["Customer"]
+    reject(
+        customers.str.contains(r"[\r\n]") | (customers.str.len() > 40),
+        "invalid Customer",
+    )
+
+    dates = parse_dates(batch["Date Required"])
+    reject(dates.isna(), "invalid Date Required")
+
+    reject(~batch["Recipe"].isin(BEERS), "unknown Recipe")
+
+    integers = {}
+    for column in INTEGER_COLUMNS:
+        is_integer = batch[column].str.fullmatch(INTEGER_PATTERN)
+        integers[column] = pandas.to_numeric(
+            batch[column].where(is_integer, "0"), errors="coerce"
+        )
+        reject(
+            ~is_integer | (integers[column] <= 0) | (integers[column] > MAX_INTEGER),
+            column + " is not a positive whole number",
+        )
+
+    if sale_key_index is not None:
+        # Only checks sales which are otherwise valid, as only they have keys.
+        valid = reasons == ""
+        duplicates = pandas.Series(False, index=batch.index)
+        duplicates[valid] = sale_key_index.find_duplicates(
+            pandas.DataFrame(
+                {
+                    "Invoice Number": integers["Invoice Number"][valid],
+                    "Gyle Number": integers["Gyle Number"][valid],
+                    "Recipe": batch["Recipe"][valid],
+                }
+            )
+        )
+        reject(duplicates, "already uploaded")
+
+    accepted = reasons == ""
+    accepted_sales = pandas.DataFrame(
+        {
+            "Invoice Number": integers["Invoice Number"][accepted],
+            "Customer": customers[accepted],
+            "Date Required": dates[accepted],
+            "Recipe": batch["Recipe"][accepted],
+            "Gyle Number": integers["Gyle Number"][accepted],
+            "Quantity ordered": integers["Quantity ordered"][accepted],
+        }
+    ).astype({column: "int64" for column in INTEGER_COLUMNS})
+
+    rejected = reasons[~accepted]
+    rejections = list(zip((rejected.index + 1).tolist(), rejected.tolist()))
+
+    return accepted_sales.set_index("Date Required"), rejections
+
+
+def append_sales(sales: pandas.core.frame.DataFrame, csv_path: str = SALES_DATA_PATH):
+    """Appends sales to the sales data CSV file in a single write.
+
+    Args:
+        sales (pandas.core.frame.DataFrame): Sales to append, indexed by date.
+        csv_path (str): Path of the sales data CSV file.
+    """
+    if sales.empty:
+        return
+
+    rows = sales.reset_index()[SALES_COLUMNS]
+    rows["Date Required"] = rows["Date Required"].dt.strftime("%d-%b-%y")
+
+    # Quotes customer names which contain commas, so the file stays valid.
+    text = io.StringIO()
+    csv.writer(text, lineterminator="\n").writerows(rows.itertuples(index=False))
+
+    with open(csv_path, "a", newline="") as sales_file:
+        sales_file.write(text.getvalue())
+        # Makes sure the sales are on disk before they are reported as imported.
+        sales_file.flush()
+        os.fsync(sales_file.fileno())
+
+
+def import_sales_file(
+    batch_path: str,
+    csv_path: str = SALES_DATA_PATH,
+    sale_key_index: Optional[SaleKeyIndex] = None,
+) -> Tuple[pandas.core.frame.DataFrame, List[Tuple[int, str]]]:
+    """Imports the valid sales in a CSV or JSON file into the sales data.
+
+    Args:
+        batch_path (str): Path of the CSV or JSON file to import.
+        csv_path (str): Path of the sales data CSV file.
+        sale_key_index (Optional[SaleKeyIndex]): Index of the sales already
+                                                 uploaded, which the imported
+                                                 sales are added to.
+
+    Returns:
+        imported_sales (pandas.core.frame.DataFrame): Sales which were
+                                                      imported, indexed by
+                                                      date.
+        rejections (List[Tuple[int, str]]): Row number and reason of each
+                                            sale which was not imported.
+    """
+    imported_sales, rejections = validate_sales(
+        read_sales_batch(batch_path), sale_key_index
+    )
+    append_sales(imported_sales, csv_path)
+    if sale_key_index is not None:
+        sale_key_index.add_sales(imported_sales)
+
+    return imported_sales, rejections
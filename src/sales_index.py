@@ -0,0 +1,295 @@
+"""
+An index of the sales of each beer for fast date range queries. For each recipe
+it keeps the sorted days with sales and the cumulative quantity ordered, so the
+total sales between any two dates is found by two binary searches and one
+subtraction, rather than by checking every sale. The sales are summed by day as
+they are read, so the index grows with the number of days, not of sales. This
+also makes trailing windows, such as the last 90 days, and comparisons between
+periods fast.
+"""
+
+import bisect
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Tuple, Union
+
+import numpy
+import pandas
+
+# Number of uploaded sales held separately before they are merged into the index.
+MERGE_THRESHOLD = 1024
+
+DateLike = Union[date, datetime, pandas.Timestamp, str]
+
+
+def to_day(day: DateLike) -> numpy.datetime64:
+    """Converts a date to a NumPy day.
+
+    Args:
+        day (DateLike): A date, datetime, timestamp, or ISO date string.
+
+    Returns:
+        day (numpy.datetime64): The date with a precision of days.
+    """
+    return numpy.datetime64(pandas.Timestamp(day).date(), "D")
+
+
+class SalesRangeIndex:
+    """Sorted sale dates and cumulative quantities of each recipe."""
+
+    def __init__(self, recipe_sales: Dict[str, Tuple[numpy.ndarray, numpy.ndarray]]):
+        """Builds the index from the sales of each recipe.
+
+        Args:
+            recipe_sales (Dict[str, Tuple[numpy.ndarray, numpy.ndarray]]): Dates
+                and quantities of the sales of each recipe, in any order.
+        """
+        self.dates = {}
+        self.cumulative_quantities = {}
+        for recipe, (dates, quantities) in recipe_sales.items():
+            order = numpy.argsort(dates, kind="stable")
+            self.dates[recipe] = dates[order].astype("datetime64[D]")
+            # Starts with zero so the total up to any position is a subtraction.
+            self.cumulative_quantities[recipe] = numpy.concatenate(
+                [[0], numpy.cumsum(quantities[order], dtype="int64")]
+            )
+
+        # Sales uploaded since the index was built, kept sorted by date.
+        self.new_sales: Dict[str, List[Tuple[numpy.datetime64, int]]] = {}
+        self.new_sale_count = 0
+
+    @classmethod
+    def from_data_frame(
+        cls, data_frame: pandas.core.frame.DataFrame
+    ) -> "SalesRangeIndex":
+        """Builds the index from the sales data.
+
+        Args:
+            data_frame (pandas.core.frame.DataFrame): Sales data of beers,
+                                                      indexed by date.
+
+        Returns:
+            range_index (SalesRangeIndex): Index of the sales data.
+        """
+        builder = SalesRangeIndexBuilder()
+        builder.add_chunk(data_frame)
+
+        return builder.build()
+
+    @property
+    def recipes(self) -> List[str]:
+        """Gets the recipes in the index.
+
+        Returns:
+            recipes (List[str]): Every recipe with at least one sale.
+        """
+        return list(dict.fromkeys(list(self.dates) + list(self.new_sales)))
+
+    @property
+    def last_date(self) -> numpy.datetime64:
+        """Gets the date of the last sale in the index.
+
+        Returns:
+            last_date (numpy.datetime64): Latest date of any sale.
+        """
+        last_dates = [dates[-1] for dates in self.dates.values() if len(dates)]
+        last_dates += [sales[-1][0] for sales in self.new_sales.values() if sales]
+
+        return max(last_dates)
+
+    def add_sale(self, sale_date: DateLike, recipe: str, quantity: int):
+        """Adds an uploaded sale to the index.
+
+        The sale is kept in a small sorted list until enough sales have been
+        uploaded, and then they are all merged into the index at once.
+
+        Args:
+            sale_date (DateLike): Date the sale is required.
+            recipe (str): Beer recipe of the sale.
+            quantity (int): Quantity ordered in the sale.
+        """
+        bisect.insort(
+            self.new_sales.setdefault(recipe, []), (to_day(sale_date), quantity)
+        )
+        self.new_sale_count += 1
+
+        if self.new_sale_count >= MERGE_THRESHOLD:
+            self.merge_new_sales()
+
+    def merge_new_sales(self):
+        """Merges the uploaded sales into the sorted arrays of the index."""
+        for recipe, new_sales in self.new_sales.items():
+            new_dates = numpy.array([sale[0] for sale in new_sales], "datetime64[D]")
+            new_quantities = numpy.array([sale[1] for sale in new_sales], "int64")
+            dates = self.dates.get(recipe, numpy.array([], "datetime64[D]"))
+            quantities = numpy.diff(
+                self.cumulative_quantities.get(recipe, numpy.zeros(1, "int64"))
+            )
+
+            # Inserts the new sales after existing sales on the same date.
+            positions = numpy.searchsorted(dates, new_dates, side="right")
+            self.dates[recipe] = numpy.insert(dates, positions, new_dates)
+            self.cumulative_quantities[recipe] = numpy.concatenate(
+                [[0], numpy.cumsum(numpy.insert(quantities, positions, new_quantities))]
+            )
+
+        self.new_sales = {}
+        self.new_sale_count = 0
+
+    def get_total(self, recipe: str, start: DateLike, end: DateLike) -> int:
+        """Gets the total quantity of a recipe ordered between two dates.
+
+        Args:
+            recipe (str): Beer recipe to total.
+            start (DateLike): First date of the range.
+            end (DateLike): Last date of the range, which is included.
+
+        Returns:
+            total (int): Total quantity ordered in the range.
+        """
+        start_day = to_day(start)
+        end_day = to_day(end)
+        total = 0
+
+        if recipe in self.dates:
+            dates = self.dates[recipe]
+            cumulative_quantities = self.cumulative_quantities[recipe]
+            first = numpy.searchsorted(dates, start_day, side="left")
+            last = numpy.searchsorted(dates, end_day, side="right")
+            total += int(cumulative_quantities[last] - cumulative_quantities[first])
+
+        # Adds the uploaded sales which have not been merged yet.
+        new_sales = self.new_sales.get(recipe, [])
+        first = bisect.bisect_left(new_sales, (start_day,))
+        for sale_date, quantity in new_sales[first:]:
+            if sale_date > end_day:
+                break
+            total += quantity
+
+        return total
+
+    def get_totals(self, start: DateLike, end: DateLike) -> Dict[str, int]:
+        """Gets the total quantity of each recipe ordered between two dates.
+
+        Args:
+            start (DateLike): First date of the range.
+            end (DateLike): Last date of the range, which is included.
+
+        Returns:
+            totals (Dict[str, int]): Total quantity ordered of each recipe.
+        """
+        return {recipe: self.get_total(recipe, start, end) for recipe in self.recipes}
+
+    def get_trailing_totals(self, end: DateLike, days: int) -> Dict[str, int]:
+        """Gets the total quantity of each recipe ordered in a trailing window.
+
+        Args:
+            end (DateLike): Last date of the window, which is included.
+            days (int): Number of days in the window, such as 90.
+
+        Returns:
+            totals (Dict[str, int]): Total quantity ordered of each recipe.
+        """
+        start = pandas.Timestamp(end) - timedelta(days=days - 1)
+
+        return self.get_totals(start, end)
+
+    def compare_periods(
+        self,
+        start: DateLike,
+        end: DateLike,
+        previous_start: DateLike,
+        previous_end: DateLike,
+    ) -> pandas.core.frame.DataFrame:
+        """Compares the total quantity of each recipe ordered in two periods.
+
+        Args:
+            start (DateLike): First date of the period.
+            end (DateLike): Last date of the period, which is included.
+            previous_start (DateLike): First date of the period compared to.
+            previous_end (DateLike): Last date of the period compared to.
+
+        Returns:
+            comparison (pandas.core.frame.DataFrame): Totals of each recipe in
+                                                      both periods, and the
+                                                      change between them (%).
+        """
+        current = pandas.Series(self.get_totals(start, end), dtype="int64")
+        previous = pandas.Series(
+            self.get_totals(previous_start, previous_end), dtype="int64"
+        )
+        change = ((current - previous) / previous.replace(0, numpy.nan) * 100).round(3)
+
+        return pandas.DataFrame(
+            {"total": current, "previous_total": previous, "change_pct": change}
+        ).rename_axis("recipe")
+
+
+class SalesRangeIndexBuilder:
+    """Sums the sales of each recipe by day, chunk by chunk, to build a
+    SalesRangeIndex without holding the whole sales data in memory."""
+
+    def __init__(self):
+        self.recipe_dates: Dict[str, numpy.ndarray] = {}
+        self.recipe_quantities: Dict[str, numpy.ndarray] = {}
+
+    def add_chunk(self, chunk: pandas.core.frame.DataFrame):
+        """Adds the sales in a chunk of the sales data.
+
+        The chunk is summed by day and recipe, and added to the daily totals of
+        the chunks before it, so only one total is kept per day and recipe.
+
+        Args:
+            chunk (pandas.core.frame.DataFrame): Chunk of sales data, indexed
+                                                 by date.
+        """
+        dates = chunk.index.to_numpy(dtype="datetime64[D]")
+        quantities = chunk["Quantity ordered"].to_numpy(dtype="int64")
+        recipes = pandas.Categorical(chunk["Recipe"])
+
+        for code, recipe in enumerate(recipes.categories):
+            in_recipe = recipes.codes == code
+            recipe_dates = dates[in_recipe]
+            recipe_quantities = quantities[in_recipe]
+            if str(recipe) in self.recipe_dates:
+                recipe_dates = numpy.concatenate(
+                    [self.recipe_dates[str(recipe)], recipe_dates]
+                )
+                recipe_quantities = numpy.concatenate(
+                    [self.recipe_quantities[str(recipe)], recipe_quantities]
+                )
+
+            # Sums the sales on each day, including days in earlier chunks.
+            days, positions = numpy.unique(recipe_dates, return_inverse=True)
+            daily_quantities = numpy.zeros(len(days), dtype="int64")
+            numpy.add.at(daily_quantities, positions, recipe_quantities)
+            self.recipe_dates[str(recipe)] = days
+            self.recipe_quantities[str(recipe)] = daily_quantities
+
+    def add_chunks(
+        self, chunks: Iterable[pandas.core.frame.DataFrame]
+    ) -> Iterable[pandas.core.frame.DataFrame]:
+        """Adds the sales in each chunk as it passes through a pipeline.
+
+        Args:
+            chunks (Iterable[pandas.core.frame.DataFrame]): Chunks of sales
+                                                            data.
+
+        Yields:
+            chunk (pandas.core.frame.DataFrame): Each chunk, unchanged.
+        """
+        for chunk in chunks:
+            self.add_chunk(chunk)
+            yield chunk
+
+    def build(self) -> SalesRangeIndex:
+        """Builds the index from the sales that were added.
+
+        Returns:
+            range_index (SalesRangeIndex): Index of the sales.
+        """
+        return SalesRangeIndex(
+            {
+                recipe: (self.recipe_dates[recipe], self.recipe_quantities[recipe])
+                for recipe in self.recipe_dates
+            }
+        )
@@ -0,0 +1,154 @@
+"""
+A check that the date range index of the sales gives the same totals as adding
+up every sale in the range. Random sales are indexed in chunks whose days
+overlap, then random ranges are queried while more sales are uploaded, so the
+daily totals, the uploaded sales kept aside, and their merging are all checked.
+It fails if any total differs from the brute-force scan, or if the index holds
+more than one total per day and recipe.
+
+Run with: python -m src.sales_index_check [--sales 20000] [--queries 2000]
+"""
+
+import argparse
+import sys
+
+import numpy
+import pandas
+
+from src.recipes import BEERS
+from src.sales_index import MERGE_THRESHOLD, SalesRangeIndexBuilder
+
+FIRST_DAY = numpy.datetime64("2018-01-01")
+DAYS = 3 * 365
+
+
+def generate_sales(rng: numpy.random.Generator, count: int) -> pandas.DataFrame:
+    """Generates random sales of the beers, in no particular order.
+
+    Args:
+        rng (numpy.random.Generator): Random number generator.
+        count (int): Number of sales.
+
+    Returns:
+        sales (pandas.DataFrame): Recipe and quantity of each sale, indexed by
+                                  date.
+    """
+    return pandas.DataFrame(
+        {
+            "Recipe": numpy.array(BEERS, dtype=object)[
+                rng.integers(len(BEERS), size=count)
+            ],
+            "Quantity ordered": rng.integers(1, 500, size=count),
+        },
+        index=pandas.DatetimeIndex(
+            FIRST_DAY + rng.integers(DAYS, size=count), name="Date Required"
+        ),
+    )
+
+
+def get_brute_force_total(
+    sales: pandas.DataFrame, recipe: str, start: numpy.datetime64, end: numpy.datetime64
+) -> int:
+    """Adds up the quantity of every sale of a recipe between two dates.
+
+    Args:
+        sales (pandas.DataFrame): Sales, indexed by date.
+        recipe (str): Beer recipe to total.
+        start (numpy.datetime64): First day of the range.
+        end (numpy.datetime64): Last day of the range, which is included.
+
+    Returns:
+        total (int): Total quantity ordered in the range.
+    """
+    days = sales.index.to_numpy(dtype="datetime64[D]")
+    in_range = (sales["Recipe"].to_numpy() == recipe) & (days >= start) & (days <= end)
+
+    return int(sales["Quantity ordered"].to_numpy()[in_range].sum())
+
+
+def check_range_index(sale_count: int, query_count: int, seed: int) -> int:
+    """Compares the totals of the range index with a brute-force scan.
+
+    Args:
+        sale_count (int): Number of sales to index.
+        query_count (int): Number of random ranges to query.
+        seed (int): Seed of the random sales and ranges.
+
+    Returns:
+        mismatches (int): Number of totals which differed from the scan.
+    """
+    rng = numpy.random.default_rng(seed)
+    sales = generate_sales(rng, sale_count)
+
+    # Indexes the sales in chunks which share days with each other.
+    builder = SalesRangeIndexBuilder()
+    for chunk in numpy.array_split(numpy.arange(sale_count), 10):
+        builder.add_chunk(sales.iloc[chunk])
+    range_index = builder.build()
+
+    mismatches = 0
+    daily_totals = sales.groupby([sales.index, "Recipe"]).size()
+    index_totals = sum(len(dates) for dates in range_index.dates.values())
+    if index_totals != len(daily_totals):
+        print(
+            "The index holds "
+            + str(index_totals)
+            + " totals for "
+            + str(len(daily_totals))
+            + " days and recipes with sales."
+        )
+        mismatches += 1
+
+    # Uploads enough sales between the queries to merge them more than once.
+    uploads = generate_sales(rng, 3 * MERGE_THRESHOLD)
+    uploads_per_query = max(1, len(uploads) // query_count)
+    for query in range(query_count):
+        upload = uploads.iloc[
+            query * uploads_per_query : (query + 1) * uploads_per_query
+        ]
+        for sale_date, recipe, quantity in zip(
+            upload.index, upload["Recipe"], upload["Quantity ordered"]
+        ):
+            range_index.add_sale(sale_date, recipe, int(quantity))
+        sales = pandas.concat([sales, upload])
+
+        start, end = numpy.sort(FIRST_DAY + rng.integers(-30, DAYS + 30, size=2))
+        recipe = BEERS[rng.integers(len(BEERS))]
+        expected = get_brute_force_total(sales, recipe, start, end)
+        total = range_index.get_total(recipe, start, end)
+        if total != expected:
+            print(
+                recipe
+                + " from "
+                + str(start)
+                + " to "
+                + str(end)
+                + ": "
+                + str(total)
+                + " from the index, "
+                + str(expected)
+                + " from the scan."
+            )
+            mismatches += 1
+
+    return mismatches
+
+
+def main() -> None:
+    """Runs the check, and exits with an error if any total was wrong."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mismatches = check_range_index(args.sales, args.queries, args.seed)
+    if mismatches:
+        print(str(mismatches) + " totals differed from the brute-force scan.")
+        sys.exit(1)
+    print("Every total matched the brute-force scan.")
+
+
+# Prevents the code from executing when the script is imported as a module.
+if __name__ == "__main__":
+    main()
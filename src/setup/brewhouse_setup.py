@@ -187,7 +187,7 @@ class Ui_mwindow_brewhouse(object):
         self.lbl_red_helles_ratio.setText(_translate("mwindow_brewhouse", "Organic Red Helles: "))
         self.lbl_pilsner_ratio.setText(_translate("mwindow_brewhouse", "Organic Pilsner: "))
         self.lbl_dunkel_ratio.setText(_translate("mwindow_brewhouse", "Organic Dunkel:"))
-        self.lbl_growth.setText(_translate("mwindow_brewhouse", "Average Monthly Growth Percentages (November 2018 to October 2019)"))
+        self.lbl_growth.setText(_translate("mwindow_brewhouse", "Average Monthly Growth Percentages"))
         self.lbl_red_helles_growth.setText(_translate("mwindow_brewhouse", "Organic Red Helles: "))
         self.lbl_pilsner_growth.setText(_translate("mwindow_brewhouse", "Organic Pilsner: "))
         self.lbl_dunkel_growth.setText(_translate("mwindow_brewhouse", "Organic Dunkel: "))
@@ -49,7 +49,10 @@ class Ui_dialog_inv_management(object):
         btn_add_order (QPushButton): Enables user to add the inputted
                                      customer order.
         btn_dispatch_order (QPushButton): Enables user to dispatch the inputted
-                                          customer order.
+                                          customer orders.
+        btn_dispatch_recipe_orders (QPushButton): Enables user to dispatch
+                                                  every order of the selected
+                                                  beer.
         hori_line_add_order (Line): Separates the sections for adding an order
                                     and dispatching an order.
         hori_line_dispatch_order (Line): Separates the sections for dispatching
@@ -69,6 +72,8 @@ class Ui_dialog_inv_management(object):
                                       orders list.
         lbl_dispatch_order (QLabel): Displays subheader for dispatching a
                                      customer order.
+        lbl_dispatch_recipe (QLabel): Labels the beer whose orders are all
+                                      dispatched.
         lbl_dunkel_inv (QLabel): Displays current volume of Dunkel in
                                  inventory.
         lbl_inv (QLabel): Displays subheader for current inventory levels.
@@ -292,7 +297,6 @@ class Ui_dialog_inv_management(object):
             self.lbl_dispatch_order_id, 0, QtCore.Qt.AlignLeft)
         self.line_edit_dispatch_order_id = QtWidgets.QLineEdit(
             self.verticalLayoutWidget)
-        self.line_edit_dispatch_order_id.setMaxLength(13)
         self.line_edit_dispatch_order_id.setObjectName(
             "line_edit_dispatch_order_id")
         self.hori_layout_dispatch_order.addWidget(
@@ -308,6 +312,34 @@ class Ui_dialog_inv_management(object):
         self.btn_dispatch_order.setObjectName("btn_dispatch_order")
         self.vert_layout_inv_management.addWidget(
             self.btn_dispatch_order, 0, QtCore.Qt.AlignLeft)
+        self.hori_layout_dispatch_recipe = QtWidgets.QHBoxLayout()
+        self.hori_layout_dispatch_recipe.setObjectName(
+            "hori_layout_dispatch_recipe")
+        self.lbl_dispatch_recipe = QtWidgets.QLabel(self.verticalLayoutWidget)
+        self.lbl_dispatch_recipe.setObjectName("lbl_dispatch_recipe")
+        self.hori_layout_dispatch_recipe.addWidget(
+            self.lbl_dispatch_recipe, 0, QtCore.Qt.AlignLeft)
+        self.combo_box_dispatch_recipe = QtWidgets.QComboBox(
+            self.verticalLayoutWidget)
+        self.combo_box_dispatch_recipe.setObjectName(
+            "combo_box_dispatch_recipe")
+        self.combo_box_dispatch_recipe.addItem("")
+        self.combo_box_dispatch_recipe.addItem("")
+        self.combo_box_dispatch_recipe.addItem("")
+        self.hori_layout_dispatch_recipe.addWidget(
+            self.combo_box_dispatch_recipe, 0, QtCore.Qt.AlignLeft)
+        spacerItem2 = QtWidgets.QSpacerItem(
+            40, 20, QtWidgets.QSizePolicy.Expanding,
+            QtWidgets.QSizePolicy.Minimum)
+        self.hori_layout_dispatch_recipe.addItem(spacerItem2)
+        self.vert_layout_inv_management.addLayout(
+            self.hori_layout_dispatch_recipe)
+        self.btn_dispatch_recipe_orders = QtWidgets.QPushButton(
+            self.verticalLayoutWidget)
+        self.btn_dispatch_recipe_orders.setObjectName(
+            "btn_dispatch_recipe_orders")
+        self.vert_layout_inv_management.addWidget(
+            self.btn_dispatch_recipe_orders, 0, QtCore.Qt.AlignLeft)
         self.hori_line_dispatch_order = QtWidgets.QFrame(
             self.verticalLayoutWidget)
         self.hori_line_dispatch_order.setFrameShape(QtWidgets.QFrame.HLine)
@@ -318,10 +350,10 @@ class Ui_dialog_inv_management(object):
         self.lbl_order_message = QtWidgets.QLabel(self.verticalLayoutWidget)
         self.lbl_order_message.setObjectName("lbl_order_message")
         self.vert_layout_inv_management.addWidget(self.lbl_order_message)
-        spacerItem2 = QtWidgets.QSpacerItem(
+        spacerItem3 = QtWidgets.QSpacerItem(
             20, 40, QtWidgets.QSizePolicy.Minimum,
             QtWidgets.QSizePolicy.Expanding)
-        self.vert_layout_inv_management.addItem(spacerItem2)
+        self.vert_layout_inv_management.addItem(spacerItem3)
         self.scroll_area.setWidget(self.scroll_area_widget_contents)
         self.gridLayout.addWidget(self.scroll_area, 0, 0, 1, 1)
 
@@ -379,9 +411,21 @@ class Ui_dialog_inv_management(object):
         self.lbl_dispatch_order.setText(_translate(
             "dialog_inv_management", "Dispatch Customer Order"))
         self.lbl_dispatch_order_id.setText(
-            _translate("dialog_inv_management", "Order ID:"))
+            _translate("dialog_inv_management", "Order ID(s):"))
+        self.line_edit_dispatch_order_id.setPlaceholderText(_translate(
+            "dialog_inv_management", "Separate IDs with commas"))
         self.btn_dispatch_order.setText(_translate(
             "dialog_inv_management", "Dispatch Order"))
+        self.lbl_dispatch_recipe.setText(_translate(
+            "dialog_inv_management", "Beer Recipe:"))
+        self.combo_box_dispatch_recipe.setItemText(
+            0, _translate("dialog_inv_management", "Organic Red Helles"))
+        self.combo_box_dispatch_recipe.setItemText(
+            1, _translate("dialog_inv_management", "Organic Pilsner"))
+        self.combo_box_dispatch_recipe.setItemText(
+            2, _translate("dialog_inv_management", "Organic Dunkel"))
+        self.btn_dispatch_recipe_orders.setText(_translate(
+            "dialog_inv_management", "Dispatch All Orders of Recipe"))
         self.lbl_order_message.setText(
             _translate("dialog_inv_management", " "))
 
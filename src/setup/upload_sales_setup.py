@@ -49,6 +49,8 @@ class Ui_dialog_upload_sales(object):
                                           user to enter quantity ordered.
         btn_upload_sale (QPushButton): Enables user to upload the sale they've
                                        input.
+        btn_import_sales (QPushButton): Enables user to import a file of
+                                        sales.
         hori_line_sale (Line): Separates the upload sale button and
                                confirmation message section.
         hori_line_upload_sales (Line): Separates the dialog header label and
@@ -177,6 +179,11 @@ class Ui_dialog_upload_sales(object):
         self.btn_upload_sale.setObjectName("btn_upload_sale")
         self.vert_layout_upload_sales.addWidget(
             self.btn_upload_sale, 0, QtCore.Qt.AlignLeft)
+        self.btn_import_sales = QtWidgets.QPushButton(
+            self.verticalLayoutWidget)
+        self.btn_import_sales.setObjectName("btn_import_sales")
+        self.vert_layout_upload_sales.addWidget(
+            self.btn_import_sales, 0, QtCore.Qt.AlignLeft)
         self.hori_line_sale = QtWidgets.QFrame(self.verticalLayoutWidget)
         self.hori_line_sale.setFrameShape(QtWidgets.QFrame.HLine)
         self.hori_line_sale.setFrameShadow(QtWidgets.QFrame.Sunken)
@@ -224,6 +231,8 @@ class Ui_dialog_upload_sales(object):
             "dialog_upload_sales", "Gyle Number:"))
         self.btn_upload_sale.setText(_translate(
             "dialog_upload_sales", "Upload New Sale"))
+        self.btn_import_sales.setText(_translate(
+            "dialog_upload_sales", "Import Sales From File"))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+"""
+A check that the main window module of Barnaby's Brewhouse still starts quickly.
+It imports src.app with `python -X importtime`, and fails if the import takes
+longer than the time budget, or if any module which should only be loaded after
+the window is shown (such as pandas or the dialogs) is imported at startup.
+
+Run with: python -m src.startup_check [--budget-ms 300]
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Dict
+
+STARTUP_MODULE = "src.app"
+# Modules which must not be imported before the main window is shown.
+DEFERRED_MODULES = [
+    "pandas",
+    "numpy",
+    "src.inv_management",
+    "src.process_monitoring",
+    "src.upload_sales",
+    "src.inventory",
+    "src.order_book",
+    "src.recipes",
+    "src.sales_analysis",
+    "src.sales_cache",
+    "src.sales_growth",
+    "src.sale_keys",
+    "src.sales_import",
+    "src.sales_database",
+    "sqlite3",
+]
+
+
+def measure_import_times(module: str) -> Dict[str, int]:
+    """Measures how long each module takes to import when importing a module.
+
+    Args:
+        module (str): Name of the module to import.
+
+    Returns:
+        import_times (Dict[str, int]): Cumulative import time (microseconds)
+                                       of every module that was imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + module],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Parses lines such as 'import time:   546 |    784 |   src.setup'.
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            import_times[fields[2].strip()] = int(fields[1])
+
+    return import_times
+
+
+def main() -> None:
+    """Checks the startup import time against the budget, and exits with an
+    error if the check fails."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=300)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    # Keeps the fastest run, as slower runs are caused by other programs.
+    runs = [measure_import_times(STARTUP_MODULE) for _ in range(args.runs)]
+    import_times = min(runs, key=lambda times: times[STARTUP_MODULE])
+    startup_ms = import_times[STARTUP_MODULE] / 1000
+
+    print("Import time of " + STARTUP_MODULE + ": " + str(startup_ms) + " ms")
+    print("Slowest modules:")
+    slowest = sorted(import_times.items(), key=lambda item: item[1], reverse=True)
+    for module, time in slowest[:10]:
+        print("  " + module + ": " + str(time / 1000) + " ms")
+
+    failures = []
+    if startup_ms > args.budget_ms:
+        failures.append(
+            "Startup took "
+            + str(startup_ms)
+            + " ms, over the budget of "
+            + str(args.budget_ms)
+            + " ms."
+        )
+    for module in DEFERRED_MODULES:
+        if module in import_times:
+            failures.append(module + " is imported at startup, but should be deferred.")
+
+    if failures:
+        print("\n".join(failures))
+        sys.exit(1)
+
+    print("Startup is within the budget.")
+
+
+# Prevents the code from executing when the script is imported as a module.
+if __name__ == "__main__":
+    main()
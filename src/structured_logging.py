@@ -0,0 +1,138 @@
+"""
+Logging of the program to a file without blocking the user interface. Log
+records are put on a queue by whichever thread logs them, and a background
+thread writes them to the log file, so writing to the disk never delays a
+click. The log file is written as JSON lines, with the operation, recipe,
+volume, and duration of each record where they are known, so it can be
+searched and analysed. Once the log file reaches its maximum size it is
+compressed and a new one is started, and only the most recent compressed files
+are kept, so the logs never grow without limit.
+"""
+
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+from datetime import datetime
+
+LOG_PATH = "resources/logs.jsonl"
+# Size (bytes) at which the log file is compressed and a new one started.
+LOG_MAX_BYTES = 5 * 1024 * 1024
+# Number of compressed log files kept.
+LOG_BACKUP_COUNT = 10
+# Extra fields of log records which are written to the log file.
+STRUCTURED_FIELDS = ["operation", "recipe", "volume", "duration_ms"]
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each log record as a line of JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Formats a log record as a JSON object on one line.
+
+        Args:
+            record (logging.LogRecord): Log record to format.
+
+        Returns:
+            line (str): Time, level, logger, and message of the record, and
+                        any of the structured fields it has.
+        """
+        line = {
+            "time": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            if hasattr(record, field):
+                line[field] = getattr(record, field)
+        if record.exc_info:
+            line["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(line, ensure_ascii=False, default=str)
+
+
+def get_compressed_name(name: str) -> str:
+    """Names a rotated log file as a compressed file.
+
+    Args:
+        name (str): Default name of the rotated log file.
+
+    Returns:
+        compressed_name (str): Name of the compressed log file.
+    """
+    return name + ".gz"
+
+
+def compress_log(source: str, destination: str):
+    """Compresses a full log file, and removes the uncompressed file.
+
+    Args:
+        source (str): Path of the full log file.
+        destination (str): Path of the compressed log file.
+    """
+    with open(source, "rb") as source_file:
+        with gzip.open(destination, "wb") as destination_file:
+            shutil.copyfileobj(source_file, destination_file)
+    os.remove(source)
+
+
+def create_log_handler(
+    log_path: str = LOG_PATH,
+    max_bytes: int = LOG_MAX_BYTES,
+    backup_count: int = LOG_BACKUP_COUNT,
+) -> logging.Handler:
+    """Creates the handler which writes and rotates the log file.
+
+    Args:
+        log_path (str): Path of the log file.
+        max_bytes (int): Size (bytes) at which the log file is rotated.
+        backup_count (int): Number of compressed log files kept.
+
+    Returns:
+        handler (logging.Handler): Handler writing JSON lines to the log file.
+    """
+    handler = logging.handlers.RotatingFileHandler(
+        log_path,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding="utf-8",
+        delay=True,
+    )
+    handler.namer = get_compressed_name
+    handler.rotator = compress_log
+    handler.setFormatter(JsonLinesFormatter())
+
+    return handler
+
+
+def start_queued_logging(
+    log_path: str = LOG_PATH, level: int = logging.DEBUG
+) -> logging.handlers.QueueListener:
+    """Sends every log record through a queue to a thread writing the log file.
+
+    Args:
+        log_path (str): Path of the log file.
+        level (int): Lowest level of the records which are logged.
+
+    Returns:
+        listener (logging.handlers.QueueListener): Thread writing the log
+                                                   file, which must be stopped
+                                                   to write the last records.
+    """
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, create_log_handler(log_path), respect_handler_level=True
+    )
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+
+    return listener
@@ -0,0 +1,418 @@
+"""
+Generates synthetic data for Barnaby's Brewhouse at any scale, for benchmarking
+and testing the program with far more data than the real sales data. The sales
+data CSV file has the same columns as the real one, with invoices of a few
+sales each, customers who order with very different frequencies, a share of
+sales for each beer which changes with the seasons, and sales which grow from
+month to month and peak in the summer. The tanks, ongoing processes, customer
+orders, and inventory JSON files are generated alongside it, so a generated
+directory can be used in place of the resources directory.
+
+Run with: python -m src.synthetic_data --rows 1000000 --output-dir <directory>
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import numpy
+import pandas
+
+from src.production_plan import COMPLETION_FORMAT
+from src.recipes import BEERS, INVENTORY_KEYS
+from src.sales_cache import SALES_COLUMNS
+
+FIRST_MONTH = pandas.Period("2018-11", freq="M")
+# Number of rows generated and written to the CSV file at a time.
+WRITE_CHUNK_SIZE = 1000000
+# Share of the sales of each beer, and how much it changes with the seasons.
+BEER_SHARES = [0.27, 0.52, 0.21]
+BEER_SEASONALITY = [0.1, 0.2, -0.3]
+# Growth in the sales each month, and how much the sales peak in the summer.
+MONTHLY_GROWTH = 0.02
+SEASONALITY = 0.3
+# Mean number of sales in each invoice.
+SALES_PER_INVOICE = 1.9
+FIRST_INVOICE = 201
+FIRST_GYLE = 87
+CUSTOMER_ADJECTIVES = [
+    "Jaded",
+    "Green",
+    "Golden",
+    "Old",
+    "Red",
+    "Royal",
+    "Crooked",
+    "Hidden",
+    "Rolling",
+    "Merry",
+]
+CUSTOMER_NOUNS = [
+    "Palates",
+    "Table",
+    "Kings Arms",
+    "Farm Shop",
+    "Dairy",
+    "Cafe",
+    "Inn",
+    "Larder",
+    "Deli",
+    "Tavern",
+]
+CUSTOMER_TOWNS = [
+    "Totnes",
+    "Staverton",
+    "Exeter",
+    "Dartington",
+    "Ashburton",
+    "Newton Abbot",
+    "Buckfastleigh",
+    "Paignton",
+    "Torquay",
+    "Plymouth",
+]
+PROCESSES = ["Hot Brew", "Fermentation", "Conditioning", "Bottling"]
+TANK_CAPABILITIES = ["Fermenter/Conditioner", "Fermenter", "Conditioner"]
+TANK_VOLUMES = [600, 800, 1000, 1200]
+
+
+def get_customer_names(customer_count: int) -> List[str]:
+    """Makes up the names of the customers.
+
+    Args:
+        customer_count (int): Number of customers.
+
+    Returns:
+        customer_names (List[str]): Unique name of each customer.
+    """
+    names = [
+        adjective + " " + noun + " - " + town
+        for town in CUSTOMER_TOWNS
+        for adjective in CUSTOMER_ADJECTIVES
+        for noun in CUSTOMER_NOUNS
+    ]
+    if customer_count <= len(names):
+        return names[:customer_count]
+
+    # Numbers the names once every combination of words has been used.
+    return [
+        names[position % len(names)] + " " + str(position // len(names) + 1)
+        for position in range(customer_count)
+    ]
+
+
+def get_month_weights(month_count: int) -> numpy.ndarray:
+    """Calculates the share of the sales in each month.
+
+    Args:
+        month_count (int): Number of months of sales.
+
+    Returns:
+        month_weights (numpy.ndarray): Share of the sales in each month.
+    """
+    months = pandas.period_range(FIRST_MONTH, periods=month_count, freq="M")
+    # Peaks in July, and grows by the same percentage every month.
+    season = numpy.cos(2 * numpy.pi * (months.month.to_numpy() - 7) / 12)
+    weights = (1 + SEASONALITY * season) * (1 + MONTHLY_GROWTH) ** numpy.arange(
+        month_count
+    )
+
+    return weights / weights.sum()
+
+
+def get_beer_shares(month_count: int) -> numpy.ndarray:
+    """Calculates the share of the sales of each beer in each month.
+
+    Args:
+        month_count (int): Number of months of sales.
+
+    Returns:
+        beer_shares (numpy.ndarray): Share of each beer (columns) in each month
+                                     (rows).
+    """
+    months = pandas.period_range(FIRST_MONTH, periods=month_count, freq="M")
+    season = numpy.cos(2 * numpy.pi * (months.month.to_numpy() - 7) / 12)
+    shares = numpy.array(BEER_SHARES) * (
+        1 + numpy.outer(season, numpy.array(BEER_SEASONALITY))
+    )
+
+    return shares / shares.sum(axis=1, keepdims=True)
+
+
+def generate_sales(
+    csv_path: str,
+    rows: int,
+    month_count: int = 36,
+    customer_count: Optional[int] = None,
+    seed: int = 0,
+):
+    """Generates a sales data CSV file, sorted by date.
+
+    Args:
+        csv_path (str): Path of the sales data CSV file to write.
+        rows (int): Number of sales.
+        month_count (int): Number of months of sales, from November 2018.
+        customer_count (Optional[int]): Number of customers, or None for one
+                                        for every 100 sales.
+        seed (int): Seed of the random numbers.
+    """
+    rng = numpy.random.default_rng(seed)
+    if customer_count is None:
+        customer_count = max(64, rows // 100)
+    customer_names = numpy.array(get_customer_names(customer_count), dtype=object)
+    # A few customers order far more often than the rest.
+    customer_weights = 1 / numpy.arange(1, customer_count + 1) ** 0.8
+    customer_weights /= customer_weights.sum()
+
+    # Picks the day of every sale, sorted so the file is in date order.
+    month_starts = pandas.period_range(
+        FIRST_MONTH, periods=month_count + 1, freq="M"
+    ).start_time
+    first_day = month_starts[0]
+    start_days = ((month_starts - first_day).days).to_numpy()
+    months = rng.choice(month_count, size=rows, p=get_month_weights(month_count))
+    month_lengths = numpy.diff(start_days)
+    days = start_days[months] + (rng.random(rows) * month_lengths[months]).astype(
+        "int32"
+    )
+    days.sort()
+    day_names = pandas.date_range(first_day, periods=start_days[-1]).strftime(
+        "%d-%b-%y"
+    )
+    day_names = day_names.to_numpy(dtype=object)
+    day_months = numpy.repeat(numpy.arange(month_count), month_lengths)
+    beer_shares = numpy.cumsum(get_beer_shares(month_count), axis=1)
+
+    invoice = FIRST_INVOICE - 1
+    with open(csv_path, "w", newline="") as sales_file:
+        for start in range(0, rows, WRITE_CHUNK_SIZE):
+            chunk_days = days[start : start + WRITE_CHUNK_SIZE]
+            chunk_months = day_months[chunk_days]
+            size = len(chunk_days)
+
+            # Starts a new invoice on a new day, or at random otherwise.
+            new_invoice = rng.random(size) < 1 / SALES_PER_INVOICE
+            new_invoice[0] = True
+            new_invoice[1:] |= chunk_days[1:] != chunk_days[:-1]
+            invoices = invoice + numpy.cumsum(new_invoice)
+            invoice = int(invoices[-1])
+            # Gives every sale in an invoice the customer of its first sale.
+            first_sales = numpy.maximum.accumulate(
+                numpy.where(new_invoice, numpy.arange(size), 0)
+            )
+            customers = rng.choice(customer_count, size=size, p=customer_weights)
+            customers = customers[first_sales]
+
+            recipes = (
+                rng.random(size)[:, numpy.newaxis] > beer_shares[chunk_months]
+            ).sum(axis=1)
+            recipes = numpy.minimum(recipes, len(BEERS) - 1)
+            # Brews about one gyle of each beer a month.
+            gyles = FIRST_GYLE + chunk_months * len(BEERS) + recipes
+            quantities = numpy.clip(
+                numpy.round(rng.lognormal(numpy.log(24), 0.6, size)), 7, 600
+            ).astype("int32")
+
+            chunk = pandas.DataFrame(
+                {
+                    "Invoice Number": invoices,
+                    "Customer": customer_names[customers],
+                    "Date Required": day_names[chunk_days],
+                    "Recipe": numpy.array(BEERS, dtype=object)[recipes],
+                    "Gyle Number": gyles,
+                    "Quantity ordered": quantities,
+                },
+                columns=SALES_COLUMNS,
+            )
+            chunk.to_csv(sales_file, header=start == 0, index=False)
+
+
+def generate_tanks(tank_count: int, seed: int = 0) -> List[dict]:
+    """Generates the empty tanks of the brewhouse.
+
+    Args:
+        tank_count (int): Number of tanks.
+        seed (int): Seed of the random numbers.
+
+    Returns:
+        tank_list (List[dict]): Name, volume (L), and capability of each tank.
+    """
+    rng = numpy.random.default_rng(seed)
+
+    return [
+        {
+            "tank": "Tank " + str(position + 1),
+            "volume": int(rng.choice(TANK_VOLUMES)),
+            "capability": TANK_CAPABILITIES[position % len(TANK_CAPABILITIES)],
+        }
+        for position in range(tank_count)
+    ]
+
+
+def generate_processes(
+    tank_list: List[dict], process_count: int, start: datetime, seed: int = 0
+) -> List[dict]:
+    """Generates ongoing processes in the tanks.
+
+    Args:
+        tank_list (List[dict]): Name, volume (L), and capability of each tank.
+        process_count (int): Number of ongoing processes.
+        start (datetime): Time the processes are ongoing at.
+        seed (int): Seed of the random numbers.
+
+    Returns:
+        process_list (List[dict]): Process, recipe, tank, volume (L), and
+                                   completion time of each process.
+    """
+    rng = numpy.random.default_rng(seed)
+    process_list = []
+
+    for _ in range(process_count):
+        process = PROCESSES[rng.integers(len(PROCESSES))]
+        tank = tank_list[rng.integers(len(tank_list))]
+        completion = start + timedelta(minutes=int(rng.integers(1, 6 * 7 * 24 * 60)))
+        process_list.append(
+            {
+                "process": process,
+                "recipe": BEERS[rng.integers(len(BEERS))],
+                "tank": "N/A" if process == "Hot Brew" else tank["tank"],
+                "volume": int(rng.integers(1, tank["volume"] // 50 + 1)) * 50,
+                "completion": completion.strftime(COMPLETION_FORMAT),
+            }
+        )
+
+    return process_list
+
+
+def generate_orders(order_count: int, seed: int = 0) -> List[dict]:
+    """Generates customer orders waiting to be dispatched.
+
+    Args:
+        order_count (int): Number of orders.
+        seed (int): Seed of the random numbers.
+
+    Returns:
+        order_list (List[dict]): ID, beer recipe, and volume (L) of each order.
+    """
+    rng = numpy.random.default_rng(seed)
+    width = len(str(order_count))
+
+    return [
+        {
+            "order_id": "ORD" + str(position + 1).zfill(width),
+            "order_recipe": BEERS[rng.integers(len(BEERS))],
+            "order_volume": int(rng.integers(1, 100)) * 5,
+        }
+        for position in range(order_count)
+    ]
+
+
+def write_json(json_path: str, data: list):
+    """Writes a list to a JSON file, in the layout of the resources directory.
+
+    Args:
+        json_path (str): Path of the JSON file.
+        data (list): List to write.
+    """
+    with open(json_path, "w") as json_file:
+        json.dump(data, json_file, ensure_ascii=False, indent=4)
+
+
+def generate_resources(
+    output_dir: str,
+    rows: int,
+    month_count: int = 36,
+    customer_count: Optional[int] = None,
+    tank_count: int = 100,
+    process_count: int = 1000,
+    order_count: int = 10000,
+    start: datetime = datetime(2018, 11, 1),
+    seed: int = 0,
+):
+    """Generates every data file of the brewhouse in a resources directory.
+
+    Args:
+        output_dir (str): Directory to create the resources directory in.
+        rows (int): Number of sales.
+        month_count (int): Number of months of sales, from November 2018.
+        customer_count (Optional[int]): Number of customers, or None for one
+                                        for every 100 sales.
+        tank_count (int): Number of tanks.
+        process_count (int): Number of ongoing processes.
+        order_count (int): Number of customer orders.
+        start (datetime): Time the ongoing processes are ongoing at.
+        seed (int): Seed of the random numbers.
+    """
+    resources_dir = os.path.join(output_dir, "resources")
+    os.makedirs(resources_dir, exist_ok=True)
+
+    generate_sales(
+        os.path.join(resources_dir, "sales_data.csv"),
+        rows,
+        month_count,
+        customer_count,
+        seed,
+    )
+
+    tank_list = generate_tanks(tank_count, seed)
+    rng = numpy.random.default_rng(seed)
+    # Leaves the first tank empty, and some of every other tank in use.
+    available_tanks = [dict(tank) for tank in tank_list]
+    for tank in available_tanks[1:]:
+        tank["volume"] = int(rng.integers(0, 4)) * tank["volume"] // 4
+    write_json(os.path.join(resources_dir, "tanks_original.json"), tank_list)
+    write_json(os.path.join(resources_dir, "tanks.json"), available_tanks)
+    write_json(
+        os.path.join(resources_dir, "ongoing_processes.json"),
+        generate_processes(tank_list, process_count, start, seed),
+    )
+    write_json(
+        os.path.join(resources_dir, "customer_orders.json"),
+        generate_orders(order_count, seed),
+    )
+    write_json(
+        os.path.join(resources_dir, "inventory.json"),
+        [
+            {"recipe": INVENTORY_KEYS[beer], "volume": int(rng.integers(0, 5000))}
+            for beer in BEERS
+        ],
+    )
+
+
+def main() -> None:
+    """Generates the data files of the brewhouse at the given scale."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--customers", type=int)
+    parser.add_argument("--tanks", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate_resources(
+        args.output_dir,
+        args.rows,
+        args.months,
+        args.customers,
+        args.tanks,
+        args.processes,
+        args.orders,
+        seed=args.seed,
+    )
+    print(
+        "Generated "
+        + str(args.rows)
+        + " sales in "
+        + os.path.join(args.output_dir, "resources")
+        + "."
+    )
+
+
+# Prevents the code from executing when the script is imported as a module.
+if __name__ == "__main__":
+    main()
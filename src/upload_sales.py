@@ -1,23 +1,50 @@
 """
 A system which provides the user with a form they can fill to upload a new sale
-to the sales data CSV file.
+to the sales data CSV file, or to import a file of many sales at once.
 """
 
+import csv
+import logging
 from datetime import datetime
+from typing import Optional
 
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtGui import QIntValidator
-from PyQt5.QtWidgets import QDialog
+from PyQt5.QtWidgets import QDialog, QFileDialog
 
+from src.instrumentation import timed
+from src.sale_keys import SaleKeyIndex
+from src.sales_import import import_sales_file, is_positive_integer
 from src.setup.upload_sales_setup import Ui_dialog_upload_sales
 
+# Number of rejected sales listed in the dialog after an import.
+SHOWN_REJECTIONS = 10
+
 
 class UploadSalesDialog(QDialog, Ui_dialog_upload_sales):
     """Contains the dialog window for uploading new sales data."""
 
-    def __init__(self):
+    # Emits the date, recipe, and quantity of each sale that is uploaded.
+    sale_uploaded = pyqtSignal(object, str, int)
+    # Emits the sales imported from a file, indexed by date.
+    sales_imported = pyqtSignal(object)
+
+    def __init__(self, sale_key_index: Optional[SaleKeyIndex] = None):
+        """Creates the dialog.
+
+        Args:
+            sale_key_index (Optional[SaleKeyIndex]): Index of the sales already
+                                                     uploaded, or None to load
+                                                     it.
+        """
         super().__init__()
         self.setupUi(self)
 
+        # Rejects sales which have already been uploaded.
+        if sale_key_index is None:
+            sale_key_index = SaleKeyIndex.load()
+        self.sale_key_index = sale_key_index
+
         # Restricts inputs to only numbers.
         self.only_int = QIntValidator()
         self.line_edit_sale_invoice.setValidator(self.only_int)
@@ -25,8 +52,12 @@ class UploadSalesDialog(QDialog, Ui_dialog_upload_sales):
         self.line_edit_sale_quantity.setValidator(self.only_int)
 
         # Connects the 'Upload New Sale' button to add the inputted sale.
-        self.btn_upload_sale.clicked.connect(self.upload_sale)
+        self.btn_upload_sale.clicked.connect(lambda: self.upload_sale())
+        # Connects the 'Import Sales From File' button to import a file.
+        self.btn_import_sales.clicked.connect(lambda: self.import_sales())
+        self.lbl_upload_successful.setWordWrap(True)
 
+    @timed
     def upload_sale(self):
         """Uploads the new sale to the sales data CSV file."""
         # Gets the inputs for the new sale.
@@ -39,24 +70,53 @@ class UploadSalesDialog(QDialog, Ui_dialog_upload_sales):
 
         # Validates against null inputs.
         if invoice != "" and customer != "" and gyle != "" and quantity != "":
+            # Validates the numbers the same way as sales imported from a file.
+            for field, value in [
+                ("invoice number", invoice),
+                ("gyle number", gyle),
+                ("quantity", quantity),
+            ]:
+                if not is_positive_integer(value):
+                    self.lbl_upload_successful.setText(
+                        "This is not a valid sale. The "
+                        + field
+                        + " must be a positive whole number."
+                    )
+                    return
+
+            # Validates against sales which have already been uploaded.
+            sale_key = (int(invoice), int(gyle), recipe)
+            if sale_key in self.sale_key_index:
+                self.lbl_upload_successful.setText(
+                    "This sale has already been uploaded with the same invoice "
+                    "number, gyle number, and beer recipe."
+                )
+                return
+
             # Writes new sales data to the CSV file.
-            with open("resources/sales_data.csv", "a") as sales_file:
-                date = datetime.strptime(date, "%d/%m/%Y").strftime("%d-%b-%y")
-                sale = (
-                    invoice
-                    + ","
-                    + customer
-                    + ","
-                    + date
-                    + ","
-                    + recipe
-                    + ","
-                    + gyle
-                    + ","
-                    + quantity
-                    + "\n"
+            sale_date = datetime.strptime(date, "%d/%m/%Y")
+            with open("resources/sales_data.csv", "a", newline="") as sales_file:
+                date = sale_date.strftime("%d-%b-%y")
+                # Quotes a customer name containing a comma, so the file stays
+                # valid.
+                csv.writer(sales_file, lineterminator="\n").writerow(
+                    [invoice, customer, date, recipe, gyle, quantity]
                 )
-                sales_file.write(sale)
+            self.sale_key_index.add(sale_key)
+            logging.info(
+                "Uploaded sale of %s of %s on invoice %s.",
+                quantity,
+                recipe,
+                invoice,
+                extra={
+                    "operation": "upload_sale",
+                    "recipe": recipe,
+                    "volume": int(quantity),
+                },
+            )
+
+            # Notifies listeners so they can update their sales statistics.
+            self.sale_uploaded.emit(sale_date, recipe, int(quantity))
 
             # Notifies the user that their upload was successful.
             self.lbl_upload_successful.setText("Sale uploaded successfully!")
@@ -66,3 +126,40 @@ class UploadSalesDialog(QDialog, Ui_dialog_upload_sales):
                 "This is not a valid sale. Please fill all input fields to "
                 "upload your sale."
             )
+
+    @timed
+    def import_sales(self):
+        """Imports the valid sales in a CSV or JSON file chosen by the user."""
+        batch_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Sales", "", "Sales Files (*.csv *.json)"
+        )
+        if batch_path == "":
+            return
+
+        try:
+            imported_sales, rejections = import_sales_file(
+                batch_path, sale_key_index=self.sale_key_index
+            )
+        except (OSError, ValueError) as error:
+            logging.exception("Unable to import sales from %s.", batch_path)
+            self.lbl_upload_successful.setText(
+                "Unable to import sales from this file: " + str(error)
+            )
+            return
+
+        # Notifies listeners so they can update their sales statistics.
+        if not imported_sales.empty:
+            self.sales_imported.emit(imported_sales)
+
+        # Notifies the user how many sales were imported, and which were not.
+        message = "Imported " + str(len(imported_sales)) + " sales."
+        if rejections:
+            logging.info(
+                "Rejected %d sales from %s: %s", len(rejections), batch_path, rejections
+            )
+            message += " " + str(len(rejections)) + " rows were rejected:"
+            for row, reason in rejections[:SHOWN_REJECTIONS]:
+                message += "\nRow " + str(row) + ": " + reason
+            if len(rejections) > SHOWN_REJECTIONS:
+                message += "\n..."
+        self.lbl_upload_successful.setText(message)